@@ -3,10 +3,13 @@ Streamlit 기반 콘텐츠 제작 에이전트 데모 앱
 """
 import streamlit as st
 import os
+import json
 import tempfile
-import zipfile
-import io
-from PIL import Image as PILImage
+from typing import Optional
+
+from content_creator.deadline import CONTENT_REQUEST_TIMEOUT_SECONDS, Deadline
+from content_creator.export import EXPORT_FORMATS, export_hash, export_loader, file_loader
+from content_creator.jobs import get_job_manager
 
 # 환경 변수로 모드 선택 (Streamlit Cloud에서는 secrets 사용)
 USE_ADK_SERVER = os.getenv("USE_ADK_SERVER", "false").lower() == "true"
@@ -14,14 +17,29 @@ ADK_SERVER_URL = os.getenv("ADK_SERVER_URL", "")
 
 if USE_ADK_SERVER and ADK_SERVER_URL:
     # Cloud Run ADK 서버 사용
-    from content_creator.adk_client import create_content_via_adk as create_content
     from content_creator.adk_client import ADK_SERVER_URL as SERVER_URL
+    from content_creator.adk_client import get_adk_timings
+    from content_creator.jobs import run_remote_content_job as run_content_job
     MODE = "cloud"
 else:
     # 로컬 직접 호출 (개발용)
-    from content_creator.agent import root_agent, create_content
+    from content_creator.agent import regenerate_section, root_agent
+    from content_creator.jobs import refresh_local_images
+    from content_creator.jobs import run_local_content_job as run_content_job
+    from content_creator.ledger import request_scope
     MODE = "local"
 
+
+def get_preview_path(img_path: str, previews: Optional[dict] = None) -> str:
+    """미리보기 렌디션(<파일명>.preview.webp)이 있으면 그 경로를, 없으면 원본 경로를 반환합니다."""
+    # Cloud 모드는 artifact 버전별로 내려받으므로 결과에 담긴 매핑을 우선 사용
+    if previews and previews.get(img_path):
+        return previews[img_path]
+    stem, _ = os.path.splitext(img_path)
+    preview_path = f"{stem}.preview.webp"
+    return preview_path if os.path.exists(preview_path) else img_path
+
+
 # 페이지 설정
 st.set_page_config(
     page_title="콘텐츠 제작 에이전트",
@@ -33,6 +51,19 @@ st.set_page_config(
 # 세션 상태 초기화
 if "result" not in st.session_state:
     st.session_state.result = None
+    st.session_state.result_key = None
+if "job_id" not in st.session_state:
+    st.session_state.job_id = None
+    st.session_state.job_notice = None
+
+
+def set_result(result: dict) -> None:
+    """
+    결과와 결과 키(콘텐츠 해시)를 함께 저장합니다.
+    캐시된 렌더링은 결과 키 기준으로 갱신됩니다.
+    """
+    st.session_state.result = result
+    st.session_state.result_key = export_hash(result) if result else None
 
 # 사이드바
 with st.sidebar:
@@ -66,6 +97,14 @@ with st.sidebar:
     st.markdown("### ⚙️ 에이전트 정보")
     if MODE == "cloud":
         st.info(f"🔗 모드: Cloud Run\n\n서버: {SERVER_URL}")
+        timings = get_adk_timings()
+        if timings:
+            last = timings[-1]
+            st.caption(
+                f"최근 요청 {last['path']}: 연결 {last['connect'] * 1000:.0f}ms"
+                f"{' (재사용)' if last['reused_connection'] else ''}"
+                f" · 대기 {last['wait']:.1f}s · 수신 {last['read'] * 1000:.0f}ms"
+            )
     else:
         st.info(f"💻 모드: 로컬\n\n에이전트: {root_agent.name}\n모델: {root_agent.model}")
 
@@ -91,6 +130,15 @@ with col2:
         options=["카드뉴스", "뉴스레터", "인포그래픽"],
         help="원하는 콘텐츠 형식을 선택하세요"
     )
+    request_timeout = st.number_input(
+        "⏱️ 최대 생성 시간 (초)",
+        min_value=0,
+        value=int(CONTENT_REQUEST_TIMEOUT_SECONDS),
+        step=30,
+        key="request_timeout",
+        help="이 시간 안에 끝나도록 텍스트/이미지 생성이 남은 시간만 사용합니다. "
+             "시간이 부족한 이미지는 플레이스홀더로 대체됩니다. 0이면 제한이 없습니다."
+    )
 
 st.markdown("---")
 
@@ -111,42 +159,324 @@ if uploaded_files:
 
 st.markdown("---")
 
+# 단계별 진행률 구간 (참고자료 → 텍스트 → 이미지)
+STAGE_PROGRESS = {
+    "queued": (0.0, 0.0),
+    "ingestion": (0.0, 0.1),
+    "text": (0.1, 0.4),
+    "server": (0.1, 0.9),
+    "images": (0.4, 1.0),
+    "done": (1.0, 1.0),
+}
+
+
+def get_adk_session_id() -> str:
+    """
+    ADK 세션 ID (Streamlit 세션마다 1개).
+    백그라운드 작업에서는 세션 상태에 접근할 수 없으므로 미리 구합니다.
+    """
+    if "adk_session_id" not in st.session_state:
+        import uuid
+        st.session_state["adk_session_id"] = f"s_{uuid.uuid4().hex[:8]}"
+    return st.session_state["adk_session_id"]
+
+
+@st.fragment(run_every=1.0)
+def render_job_progress() -> None:
+    """실행 중인 작업의 진행 상황을 1초마다 갱신합니다. 끝나면 앱 전체를 다시 실행합니다."""
+    job = get_job_manager().get(st.session_state.job_id)
+    if job is None:
+        st.session_state.job_id = None
+        st.rerun()
+
+    snapshot = job.snapshot()
+    if job.finished:
+        st.session_state.job_id = None
+        if snapshot["status"] == "success":
+            set_result(job.result)
+            st.session_state.job_notice = ("success", "✅ 콘텐츠가 성공적으로 생성되었습니다!")
+        elif snapshot["status"] == "cancelled":
+            st.session_state.job_notice = ("warning", "⏹ 콘텐츠 생성이 취소되었습니다.")
+        else:
+            st.session_state.job_notice = ("error", f"❌ 오류가 발생했습니다: {snapshot['error']}")
+        st.rerun()
+
+    start, end = STAGE_PROGRESS.get(snapshot["stage"], (0.0, 1.0))
+    fraction = start
+    text = f"{snapshot['stage_label']} 중..."
+    if snapshot["total"]:
+        fraction += (end - start) * snapshot["done"] / snapshot["total"]
+        if snapshot["stage"] in ("ingestion", "images"):
+            text = f"{snapshot['stage_label']} 중... ({snapshot['done']}/{snapshot['total']})"
+    st.progress(min(fraction, 1.0), text=f"{text} · {snapshot['elapsed']:.0f}초 경과")
+
+    # Cloud 모드: 스트리밍으로 받은 중간 결과 미리보기
+    partial = snapshot.get("partial") or {}
+    if partial.get("tool_calls"):
+        steps = [
+            f"{call['name']}{' ✓' if call['status'] == 'done' else '…'}"
+            for call in partial["tool_calls"]
+        ]
+        st.caption(" → ".join(steps))
+    if partial.get("formatted_content"):
+        st.text_area(
+            "생성 중인 콘텐츠",
+            value=partial["formatted_content"],
+            height=300,
+            disabled=True
+        )
+
+    if job.cancel_requested:
+        st.caption("취소하는 중입니다...")
+    elif st.button("⏹ 생성 취소", key="cancel_job"):
+        # 진행 중인 텍스트/이미지 요청까지 취소됨
+        job.cancel()
+
+
 # 생성 버튼
-if st.button("🚀 콘텐츠 생성", type="primary", use_container_width=True):
+running = st.session_state.job_id is not None
+if st.button("🚀 콘텐츠 생성", type="primary", use_container_width=True, disabled=running):
     if not topic:
         st.error("❌ 콘텐츠 주제를 입력해주세요.")
     else:
-        with st.spinner("콘텐츠를 생성하는 중입니다..."):
-            # 파일 저장
-            file_paths = []
-            if uploaded_files:
-                temp_dir = tempfile.mkdtemp()
-                for uploaded_file in uploaded_files:
-                    file_path = os.path.join(temp_dir, uploaded_file.name)
-                    with open(file_path, "wb") as f:
-                        f.write(uploaded_file.getbuffer())
-                    file_paths.append(file_path)
-            
-            # 콘텐츠 생성
+        # 파일 저장
+        file_paths = []
+        if uploaded_files:
+            temp_dir = tempfile.mkdtemp()
+            for uploaded_file in uploaded_files:
+                file_path = os.path.join(temp_dir, uploaded_file.name)
+                with open(file_path, "wb") as f:
+                    f.write(uploaded_file.getbuffer())
+                file_paths.append(file_path)
+
+        # 백그라운드 작업으로 제출 (세션을 막지 않음)
+        # 마감 시간은 버튼을 누른 시점부터 계산해 모든 하위 호출에 전달
+        extra = {"session_id": get_adk_session_id()} if MODE == "cloud" else {}
+        job = get_job_manager().submit(
+            run_content_job,
+            topic,
+            content_format,
+            reference_files=file_paths if file_paths else None,
+            deadline=Deadline.after(request_timeout) if request_timeout else None,
+            **extra
+        )
+        st.session_state.job_id = job.id
+        st.session_state.job_notice = None
+        st.rerun()
+
+if st.session_state.job_id:
+    render_job_progress()
+elif st.session_state.job_notice:
+    level, message = st.session_state.job_notice
+    getattr(st, level)(message)
+
+# 결과 표시
+# 위젯을 조작할 때마다 앱 전체가 다시 실행되므로,
+# 결과 영역은 캐시된 데이터와 fragment 로 분리합니다.
+# fragment 안의 위젯은 해당 fragment 만 다시 실행합니다.
+@st.cache_data(max_entries=256, show_spinner=False)
+def load_thumbnail(preview_path: str, fingerprint: str) -> bytes:
+    """미리보기 이미지 바이트를 읽습니다 (파일 크기/수정 시각이 같으면 캐시 사용)."""
+    with open(preview_path, "rb") as f:
+        return f.read()
+
+
+def image_fingerprint(path: str) -> str:
+    """파일 내용을 읽지 않고 (크기, 수정 시각)으로 이미지 식별자를 만듭니다."""
+    stat = os.stat(path)
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
+def show_thumbnail(img_path: str, caption: str) -> None:
+    """미리보기 렌디션을 캐시된 바이트로 표시합니다."""
+    preview_path = get_preview_path(img_path, st.session_state.result.get("previews"))
+    st.image(
+        load_thumbnail(preview_path, image_fingerprint(preview_path)),
+        caption=caption,
+        use_container_width=True
+    )
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def serialize_raw_content(result_key: str, _raw_content: dict) -> str:
+    """원본 데이터 JSON 문자열 (결과 키 기준으로 1번만 직렬화)."""
+    return json.dumps(_raw_content, ensure_ascii=False, indent=2)
+
+
+@st.fragment
+def render_images_tab() -> None:
+    result = st.session_state.result
+    result_format = result.get("format", "")
+    generated_images = result.get("images", [])
+
+    if result_format == "카드뉴스":
+        st.markdown("### 🎴 생성된 카드뉴스")
+        cols = st.columns(min(2, len(generated_images)))
+        for idx, img_path in enumerate(generated_images):
+            with cols[idx % 2]:
+                try:
+                    show_thumbnail(img_path, f"카드 {idx + 1}")
+
+                    # 버튼을 누를 때만 파일을 읽음
+                    st.download_button(
+                        label=f"📥 카드 {idx + 1} 다운로드",
+                        data=file_loader(img_path),
+                        file_name=f"card_{idx + 1:02d}.png",
+                        mime="image/png",
+                        key=f"download_card_{idx}"
+                    )
+                except Exception as e:
+                    st.error(f"이미지 로드 오류: {e}")
+
+    elif result_format == "인포그래픽":
+        st.markdown("### 📊 생성된 인포그래픽")
+        try:
+            show_thumbnail(generated_images[0], "인포그래픽")
+
+            st.download_button(
+                label="📥 인포그래픽 다운로드",
+                data=file_loader(generated_images[0]),
+                file_name="infographic.png",
+                mime="image/png",
+                use_container_width=True
+            )
+        except Exception as e:
+            st.error(f"이미지 로드 오류: {e}")
+
+    elif result_format == "뉴스레터":
+        st.markdown("### 📰 뉴스레터 이미지")
+        for idx, img_path in enumerate(generated_images):
             try:
-                # ADK 에이전트를 통해 콘텐츠 생성
-                result = create_content(
-                    topic=topic,
-                    content_format=content_format,
-                    reference_files=file_paths if file_paths else None
+                caption = "헤더 이미지" if idx == 0 else f"섹션 이미지 {idx}"
+                show_thumbnail(img_path, caption)
+
+                st.download_button(
+                    label=f"📥 {caption} 다운로드",
+                    data=file_loader(img_path),
+                    file_name=f"newsletter_{idx + 1}.png",
+                    mime="image/png",
+                    key=f"download_newsletter_{idx}"
                 )
-                st.session_state.result = result
-                st.success("✅ 콘텐츠가 성공적으로 생성되었습니다!")
             except Exception as e:
-                st.error(f"❌ 오류가 발생했습니다: {str(e)}")
-                st.exception(e)
+                st.error(f"이미지 로드 오류: {e}")
+
+
+@st.fragment
+def render_formatted_tab() -> None:
+    result = st.session_state.result
+    st.text_area(
+        "생성된 콘텐츠",
+        value=result.get("formatted_content", ""),
+        height=500,
+        label_visibility="collapsed"
+    )
+
+    # 섹션 단위 재생성 (로컬 모드에서만 지원)
+    sections = result.get("raw_content", {}).get("sections", [])
+    if MODE == "local" and sections:
+        st.markdown("#### 🔁 섹션 다시 생성")
+        section_index = st.selectbox(
+            "다시 생성할 섹션",
+            options=list(range(len(sections))),
+            format_func=lambda idx: f"{idx + 1}. {sections[idx].get('title', '')}",
+            key="regenerate_section_index"
+        )
+        instruction = st.text_input(
+            "수정 요청 (선택사항)",
+            placeholder="예: 더 구체적인 사례를 넣어주세요",
+            key="regenerate_section_instruction"
+        )
+        if st.button("이 섹션만 다시 생성", key="regenerate_section_button"):
+            # fragment 안에서는 위젯 값을 session_state 로 읽음
+            # (사용자가 정한 최대 생성 시간, 0 이면 제한 없음)
+            timeout = st.session_state.get("request_timeout", CONTENT_REQUEST_TIMEOUT_SECONDS)
+            deadline = Deadline.after(timeout) if timeout else None
+            # 재생성 비용도 원래 작업과 같은 요청 ID 로 기록하고 요청 예산을 적용
+            with request_scope(result.get("request_id"), content_format=result.get("format")):
+                with st.spinner("섹션을 다시 생성하는 중입니다..."):
+                    regenerated = regenerate_section(
+                        result, section_index, instruction or None, deadline=deadline
+                    )
+                if regenerated.get("status") == "success" and regenerated.get("affected_artifacts"):
+                    # 바뀐 섹션에 딸린 이미지만 다시 생성 (나머지 이미지는 파일 그대로 재사용)
+                    with st.spinner("바뀐 섹션의 이미지를 다시 생성하는 중입니다..."):
+                        refresh_local_images(regenerated, deadline=deadline)
+            if regenerated.get("status") == "success":
+                set_result(regenerated)
+                # 결과가 바뀌었으므로 fragment 가 아닌 앱 전체를 다시 실행
+                st.rerun()
+            else:
+                st.error(f"❌ {regenerated.get('message', '섹션 재생성에 실패했습니다.')}")
+
+
+@st.fragment
+def render_download_tab() -> None:
+    result = st.session_state.result
+    result_format = result.get("format", "")
+    file_stem = f"content_{result_format}_{result.get('topic', '')[:20]}"
+
+    st.markdown("### 📥 콘텐츠 다운로드")
+
+    # 텍스트 파일로 다운로드
+    formatted_content = result.get("formatted_content", "")
+    if formatted_content:
+        st.download_button(
+            label="📄 텍스트 파일로 다운로드",
+            data=formatted_content,
+            file_name=f"{file_stem}.txt",
+            mime="text/plain",
+            use_container_width=True
+        )
+
+    # JSON 파일로 다운로드
+    st.download_button(
+        label="📋 JSON 파일로 다운로드",
+        data=serialize_raw_content(st.session_state.result_key, result.get("raw_content", {})),
+        file_name=f"{file_stem}.json",
+        mime="application/json",
+        use_container_width=True
+    )
+
+    # 문서/묶음 내보내기 (버튼을 누를 때만 만들고, 같은 콘텐츠면 캐시된 파일 재사용)
+    export_buttons = [
+        ("docx", "📝 Word(DOCX) 문서로 다운로드"),
+        ("html", "🌐 HTML 파일로 다운로드"),
+    ]
+    if result.get("images"):
+        export_buttons.append(("zip", "📦 콘텐츠 + 모든 이미지 ZIP 다운로드"))
+    for kind, label in export_buttons:
+        extension, mime = EXPORT_FORMATS[kind]
+        st.download_button(
+            label=label,
+            data=export_loader(result, kind),
+            file_name=f"{file_stem}.{extension}",
+            mime=mime,
+            use_container_width=True,
+            key=f"export_{kind}"
+        )
+
 
-# 결과 표시
 if st.session_state.result:
     st.markdown("---")
     st.subheader("📝 생성된 콘텐츠")
     
-    result_format = st.session_state.result.get("format", "")
+    # 로컬 모드 작업은 모델/이미지 호출 비용 합계를 함께 반환
+    cost = st.session_state.result.get("cost")
+    if cost and cost.get("cost_usd"):
+        st.caption(
+            f"💰 예상 비용 ${cost['cost_usd']:.4f}"
+            f" · 토큰 {cost['prompt_tokens']:,} / {cost['completion_tokens']:,}"
+            f" · 이미지 {cost['images']}장"
+        )
+
+    # 구조화 생성이 일부 항목을 끝내 채우지 못했으면 알림 (섹션 재생성으로 보완 가능)
+    generation = st.session_state.result.get("generation") or {}
+    if generation.get("status") == "fallback":
+        st.warning("⚠️ 본문 생성에 실패해 기본 구조만 표시합니다. 다시 생성해 주세요.")
+    elif generation.get("status") == "partial":
+        unresolved = ", ".join(generation.get("unresolved", []))
+        st.warning(f"⚠️ 일부 항목을 생성하지 못했습니다: {unresolved}")
+
     generated_images = st.session_state.result.get("images", [])
     
     # 이미지가 있으면 이미지 탭 추가
@@ -161,124 +491,25 @@ if st.session_state.result:
     # 이미지 탭
     if generated_images:
         with tabs[tab_idx]:
-            if result_format == "카드뉴스":
-                st.markdown("### 🎴 생성된 카드뉴스")
-                cols = st.columns(min(2, len(generated_images)))
-                for idx, img_path in enumerate(generated_images):
-                    with cols[idx % 2]:
-                        try:
-                            img = PILImage.open(img_path)
-                            st.image(img, caption=f"카드 {idx + 1}", use_container_width=True)
-                            
-                            with open(img_path, "rb") as f:
-                                st.download_button(
-                                    label=f"📥 카드 {idx + 1} 다운로드",
-                                    data=f.read(),
-                                    file_name=f"card_{idx + 1:02d}.png",
-                                    mime="image/png",
-                                    key=f"download_card_{idx}"
-                                )
-                        except Exception as e:
-                            st.error(f"이미지 로드 오류: {e}")
-            
-            elif result_format == "인포그래픽":
-                st.markdown("### 📊 생성된 인포그래픽")
-                try:
-                    img = PILImage.open(generated_images[0])
-                    st.image(img, caption="인포그래픽", use_container_width=True)
-                    
-                    with open(generated_images[0], "rb") as f:
-                        st.download_button(
-                            label="📥 인포그래픽 다운로드",
-                            data=f.read(),
-                            file_name="infographic.png",
-                            mime="image/png",
-                            use_container_width=True
-                        )
-                except Exception as e:
-                    st.error(f"이미지 로드 오류: {e}")
-            
-            elif result_format == "뉴스레터":
-                st.markdown("### 📰 뉴스레터 이미지")
-                for idx, img_path in enumerate(generated_images):
-                    try:
-                        img = PILImage.open(img_path)
-                        caption = "헤더 이미지" if idx == 0 else f"섹션 이미지 {idx}"
-                        st.image(img, caption=caption, use_container_width=True)
-                        
-                        with open(img_path, "rb") as f:
-                            file_name = f"newsletter_{idx + 1}.png"
-                            st.download_button(
-                                label=f"📥 {caption} 다운로드",
-                                data=f.read(),
-                                file_name=file_name,
-                                mime="image/png",
-                                key=f"download_newsletter_{idx}"
-                            )
-                    except Exception as e:
-                        st.error(f"이미지 로드 오류: {e}")
-        
+            render_images_tab()
         tab_idx += 1
     
     # 포맷팅된 콘텐츠 탭
     with tabs[tab_idx]:
-        formatted_content = st.session_state.result.get("formatted_content", "")
-        st.text_area(
-            "생성된 콘텐츠",
-            value=formatted_content,
-            height=500,
-            label_visibility="collapsed"
-        )
-    
+        render_formatted_tab()
     tab_idx += 1
     
     # 원본 데이터 탭
     with tabs[tab_idx]:
-        raw_content = st.session_state.result.get("raw_content", {})
-        st.json(raw_content)
-    
+        st.json(serialize_raw_content(
+            st.session_state.result_key,
+            st.session_state.result.get("raw_content", {})
+        ))
     tab_idx += 1
     
     # 다운로드 탭
     with tabs[tab_idx]:
-        st.markdown("### 📥 콘텐츠 다운로드")
-        
-        # 텍스트 파일로 다운로드
-        formatted_content = st.session_state.result.get("formatted_content", "")
-        if formatted_content:
-            st.download_button(
-                label="📄 텍스트 파일로 다운로드",
-                data=formatted_content,
-                file_name=f"content_{result_format}_{topic[:20]}.txt",
-                mime="text/plain",
-                use_container_width=True
-            )
-        
-        # JSON 파일로 다운로드
-        import json
-        json_content = json.dumps(st.session_state.result.get("raw_content", {}), ensure_ascii=False, indent=2)
-        st.download_button(
-            label="📋 JSON 파일로 다운로드",
-            data=json_content,
-            file_name=f"content_{result_format}_{topic[:20]}.json",
-            mime="application/json",
-            use_container_width=True
-        )
-        
-        # 이미지 ZIP 다운로드 (이미지가 있는 경우)
-        if generated_images:
-            zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-                for img_path in generated_images:
-                    zip_file.write(img_path, os.path.basename(img_path))
-            
-            st.download_button(
-                label="📦 모든 이미지 ZIP 다운로드",
-                data=zip_buffer.getvalue(),
-                file_name=f"images_{result_format}_{topic[:20]}.zip",
-                mime="application/zip",
-                use_container_width=True
-            )
+        render_download_tab()
 
 # 푸터
 st.markdown("---")
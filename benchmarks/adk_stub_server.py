@@ -0,0 +1,237 @@
+"""
+로컬 ADK API Server 대역 (부하 테스트용)
+실제 모델을 호출하지 않고, ADK 서버와 같은 경로/응답 형식으로 지연과 오류만 흉내 냅니다.
+
+지원 경로:
+    POST /apps/{app}/users/{user}/sessions/{session}       세션 생성 (중복이면 409)
+    POST /run                                              이벤트 리스트 반환
+    POST /run_sse                                          같은 이벤트를 SSE 로 전송
+    GET  /apps/{app}/users/{user}/sessions/{session}/artifacts/{name}/versions/{version}
+
+실행:
+    python benchmarks/adk_stub_server.py --port 8765 --latency 0.5 --error-rate 0.05
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import sys
+from typing import Any, Dict, List
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from content_creator.content_store import CONTENT_ARTIFACT_NAME, CONTENT_STATE_KEY, content_hash
+
+# 1x1 JPEG (artifact 응답용)
+_TINY_JPEG = base64.b64decode(
+    "/9j/4AAQSkZJRgABAQAAAQABAAD/2wBDAAgGBgcGBQgHBwcJCQgKDBQNDAsLDBkSEw8UHRofHh0aHBwgJC4nICIsIxwcKDcpLDAxNDQ0Hyc5PTgyPC4zNDL/"
+    "wAALCAABAAEBAREA/8QAFAABAAAAAAAAAAAAAAAAAAAACf/EABQQAQAAAAAAAAAAAAAAAAAAAAD/2gAIAQEAAD8AKp//2Q=="
+)
+
+
+def parse_message(message: str) -> Dict[str, str]:
+    """요청 메시지에서 주제와 형식을 꺼냅니다."""
+    lines = dict(line.split(": ", 1) for line in message.splitlines() if ": " in line)
+    return {
+        "topic": lines.get("콘텐츠 주제", "주제"),
+        "format": lines.get("콘텐츠 형식", "카드뉴스"),
+    }
+
+
+def make_raw_content(topic: str, card_count: int = 3) -> Dict[str, Any]:
+    """카드 card_count 장짜리 raw_content 를 만듭니다."""
+    return {
+        "title": topic,
+        "introduction": f"{topic} 소개",
+        "sections": [
+            {"title": f"{topic} {i + 1}", "content": "본문 " * 20, "key_points": []}
+            for i in range(card_count)
+        ],
+        "key_points": [],
+        "conclusion": "결론",
+    }
+
+
+def make_events(message: str, session_id: str, card_count: int = 3) -> List[Dict[str, Any]]:
+    """
+    실제 content_creator_agent 실행과 같은 모양의 이벤트를 만듭니다.
+    콘텐츠 본문은 content.json artifact 로, state 에는 핸들만 담습니다.
+    """
+    request = parse_message(message)
+    topic, content_format = request["topic"], request["format"]
+    raw_content = make_raw_content(topic, card_count)
+    filenames = [f"card_{i + 1:02d}.jpeg" for i in range(card_count)]
+    return [
+        {
+            "author": "content_creator_agent",
+            "content": {
+                "role": "model",
+                "parts": [{"functionCall": {"name": "card_news_agent", "args": {}}}],
+            },
+        },
+        {
+            "author": "content_creator_agent",
+            "content": {
+                "role": "user",
+                "parts": [
+                    {"functionResponse": {"name": "card_news_agent", "response": {"result": "ok"}}}
+                ],
+            },
+            "actions": {
+                "stateDelta": {
+                    CONTENT_STATE_KEY: {
+                        "artifact": CONTENT_ARTIFACT_NAME,
+                        "version": 0,
+                        "content_hash": content_hash(raw_content),
+                        "topic": topic,
+                        "format": content_format,
+                        "title": raw_content["title"],
+                        "section_count": card_count,
+                    }
+                },
+                "artifactDelta": {CONTENT_ARTIFACT_NAME: 0, **{name: 0 for name in filenames}},
+            },
+        },
+        {
+            "author": "content_creator_agent",
+            "content": {
+                "role": "model",
+                "parts": [{"text": f"{topic} 카드뉴스를 만들었습니다. ({session_id})"}],
+            },
+        },
+    ]
+
+
+def create_app(latency: float = 0.5, jitter: float = 0.2, error_rate: float = 0.0) -> FastAPI:
+    """
+    대역 서버 앱을 만듭니다.
+
+    Args:
+        latency: /run 평균 지연 (초)
+        jitter: 지연 편차 (초)
+        error_rate: 503 을 돌려줄 확률 (재시도 테스트용)
+    """
+    app = FastAPI()
+    sessions = set()
+    session_content: Dict[Any, Dict[str, Any]] = {}
+    stats = {
+        "run": 0,
+        "session": 0,
+        "artifact": 0,
+        "errors": 0,
+        "in_flight": 0,
+        "peak_in_flight": 0,
+    }
+
+    def maybe_fail():
+        if error_rate and random.random() < error_rate:
+            stats["errors"] += 1
+            return JSONResponse({"detail": "overloaded"}, status_code=503)
+        return None
+
+    async def wait():
+        await asyncio.sleep(max(0.0, random.gauss(latency, jitter)))
+
+    @app.post("/apps/{app_name}/users/{user_id}/sessions/{session_id}")
+    async def create_session(app_name: str, user_id: str, session_id: str):
+        stats["session"] += 1
+        failure = maybe_fail()
+        if failure:
+            return failure
+        key = (app_name, user_id, session_id)
+        if key in sessions:
+            return JSONResponse({"detail": "Session already exists"}, status_code=409)
+        sessions.add(key)
+        return {"id": session_id, "appName": app_name, "userId": user_id, "state": {}}
+
+    async def start_run(request: Request):
+        body = await request.json()
+        key = (body["appName"], body["userId"], body["sessionId"])
+        if key not in sessions:
+            return None, JSONResponse({"detail": "Session not found"}, status_code=404)
+        message = "".join(part.get("text", "") for part in body["newMessage"]["parts"])
+        request_info = parse_message(message)
+        session_content[key] = {
+            **request_info,
+            "raw_content": make_raw_content(request_info["topic"]),
+        }
+        return make_events(message, body["sessionId"]), None
+
+    @app.post("/run")
+    async def run(request: Request):
+        stats["run"] += 1
+        failure = maybe_fail()
+        if failure:
+            return failure
+        events, error = await start_run(request)
+        if error:
+            return error
+        stats["in_flight"] += 1
+        stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+        try:
+            await wait()
+        finally:
+            stats["in_flight"] -= 1
+        return events
+
+    @app.post("/run_sse")
+    async def run_sse(request: Request):
+        stats["run"] += 1
+        events, error = await start_run(request)
+        if error:
+            return error
+
+        async def stream():
+            for event in events:
+                await asyncio.sleep(latency / len(events))
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    @app.get("/apps/{app_name}/users/{user_id}/sessions/{session_id}/artifacts/{name}/versions/{version}")
+    async def load_artifact(app_name: str, user_id: str, session_id: str, name: str, version: int):
+        stats["artifact"] += 1
+        failure = maybe_fail()
+        if failure:
+            return failure
+        if name == CONTENT_ARTIFACT_NAME:
+            content = session_content.get((app_name, user_id, session_id)) or {}
+            data = base64.urlsafe_b64encode(
+                json.dumps(content, ensure_ascii=False).encode("utf-8")
+            ).decode("ascii")
+            return {"inlineData": {"mimeType": "application/json", "data": data}}
+        data = base64.urlsafe_b64encode(_TINY_JPEG).decode("ascii")
+        return {"inlineData": {"mimeType": "image/jpeg", "data": data}}
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="로컬 ADK 서버 대역")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    uvicorn.run(
+        create_app(args.latency, args.jitter, args.error_rate),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
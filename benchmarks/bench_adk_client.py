@@ -0,0 +1,98 @@
+"""
+비동기 ADK 클라이언트 부하 테스트
+로컬 ADK 서버 대역(adk_stub_server)을 띄우고 AsyncAdkClient 로 많은 요청을 동시에 보내
+처리량과 지연 분포, 재시도/마감 시간 초과 건수를 측정합니다.
+
+실행:
+    python benchmarks/bench_adk_client.py --requests 500 --concurrency 64 --error-rate 0.05
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+import uvicorn
+from adk_stub_server import create_app
+
+from content_creator.adk_async_client import AsyncAdkClient
+
+
+def start_stub_server(latency: float, jitter: float, error_rate: float) -> str:
+    """대역 서버를 백그라운드 스레드에서 띄우고 주소를 반환합니다."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    config = uvicorn.Config(
+        create_app(latency, jitter, error_rate),
+        host="127.0.0.1",
+        port=port,
+        log_level="warning",
+        limit_concurrency=10000,
+        backlog=4096,
+    )
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+async def run_benchmark(
+    base_url: str, request_count: int, concurrency: int, timeout: float
+) -> None:
+    latencies = []
+
+    async with AsyncAdkClient(
+        base_url, max_concurrency=concurrency, max_connections=concurrency
+    ) as client:
+        async def one(i: int):
+            started = time.perf_counter()
+            request = {"topic": f"주제 {i}", "content_format": "카드뉴스"}
+            result = (await client.run_many([request], timeout=timeout))[0]
+            latencies.append(time.perf_counter() - started)
+            return result
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one(i) for i in range(request_count)))
+        elapsed = time.perf_counter() - started
+
+    async with httpx.AsyncClient(base_url=base_url) as http:
+        stats = (await http.get("/stats")).json()
+
+    ok = sum(1 for result in results if result["status"] == "success")
+    deadline = sum(1 for result in results if result.get("error_type") == "deadline")
+    latencies.sort()
+    print(f"요청 {request_count}건 / 동시 {concurrency} / 마감 {timeout:.0f}s")
+    print(f"  성공 {ok}  마감 초과 {deadline}  기타 실패 {request_count - ok - deadline}")
+    print(f"  총 {elapsed:.2f}s, 처리량 {request_count / elapsed:.1f} req/s")
+    print(
+        f"  지연 p50 {statistics.median(latencies):.3f}s"
+        f"  p95 {latencies[int(len(latencies) * 0.95) - 1]:.3f}s"
+        f"  max {latencies[-1]:.3f}s"
+    )
+    print(f"  서버: {stats}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AsyncAdkClient 부하 테스트")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    base_url = start_stub_server(args.latency, args.jitter, args.error_rate)
+    asyncio.run(run_benchmark(base_url, args.requests, args.concurrency, args.timeout))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+콘텐츠 렌더링 벤치마크
+섹션 수를 늘려 가며 render_content 의 소요 시간을 측정합니다.
+섹션당 시간이 거의 일정하면 선형 시간입니다.
+
+실행:
+    python benchmarks/bench_formatting.py
+"""
+import time
+
+from content_creator.formatting import OUTPUT_FORMATS, render_content
+
+SECTION_COUNTS = (125, 250, 500, 1000)
+REPEAT = 5
+
+
+def make_document(section_count: int) -> dict:
+    """벤치마크용 raw_content 를 만듭니다 (한글 본문 포함)."""
+    return {
+        "title": "인공지능 시장 전망 보고서",
+        "introduction": "올해 인공지능 시장의 주요 흐름을 정리했습니다.",
+        "key_points": [f"핵심 포인트 {i}" for i in range(5)],
+        "conclusion": "앞으로의 변화를 계속 지켜봐 주세요.",
+        "statistics": [{"label": f"지표 {i}", "value": f"{i * 10}%"} for i in range(10)],
+        "visual_elements": [{"type": "막대 그래프", "description": "연도별 시장 규모"}],
+        "sections": [
+            {
+                "title": f"섹션 {i}: 생성형 AI 도입 현황",
+                "content": "기업의 생성형 AI 도입이 빠르게 늘고 있습니다. " * 8,
+                "key_points": [],
+            }
+            for i in range(section_count)
+        ],
+    }
+
+
+def main() -> None:
+    print(f"{'형식':<8}{'출력':<10}{'섹션':>6}{'총 시간(ms)':>14}{'섹션당(µs)':>14}")
+    for content_format in ("카드뉴스", "뉴스레터", "인포그래픽"):
+        for output in OUTPUT_FORMATS:
+            for section_count in SECTION_COUNTS:
+                document = make_document(section_count)
+                best = float("inf")
+                for _ in range(REPEAT):
+                    started = time.perf_counter()
+                    render_content(document, content_format, output)
+                    best = min(best, time.perf_counter() - started)
+                print(
+                    f"{content_format:<8}{output:<10}{section_count:>6}"
+                    f"{best * 1000:>14.2f}{best / section_count * 1e6:>14.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+세션 서비스 동시 쓰기 측정
+여러 워커 프로세스가 같은 SQLite 파일에 동시에 세션을 만들고 이벤트를 기록할 때의 처리량을
+ADK 기본 SqliteSessionService(sqlite:///) 와 SqliteWalSessionService(sqlite-wal:///) 로 비교하고,
+마지막에 다른 프로세스에서 모든 세션/이벤트/state 를 다시 읽어 유실이 없는지 확인합니다.
+
+실행:
+    python benchmarks/bench_session_service.py [워커 수] [워커당 세션 수] [세션당 이벤트 수]
+"""
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+APP_NAME = "content_creator"
+
+
+def make_event(index: int, final: bool):
+    """도구 호출 이벤트 여러 개 뒤에 최종 응답 1개로 끝나는 한 턴을 흉내 냅니다."""
+    from google.adk.events.event import Event
+    from google.adk.events.event_actions import EventActions
+    from google.genai import types
+
+    if final:
+        part = types.Part(text="완료되었습니다.")
+    else:
+        part = types.Part(
+            function_call=types.FunctionCall(name="generate_images", args={"index": index})
+        )
+    return Event(
+        author="card_news_agent",
+        invocation_id="bench",
+        content=types.Content(role="model", parts=[part]),
+        actions=EventActions(state_delta={"step": index, "user:last_step": index}),
+    )
+
+
+def make_service(kind: str, db_path: str):
+    if kind == "adk-sqlite":
+        from google.adk.sessions.sqlite_session_service import SqliteSessionService
+
+        return SqliteSessionService(db_path=db_path)
+    from content_creator.session_service import SqliteWalSessionService
+
+    return SqliteWalSessionService(db_path=db_path)
+
+
+def writer(kind: str, db_path: str, worker: int, sessions: int, events: int) -> None:
+    async def main() -> None:
+        service = make_service(kind, db_path)
+        for _ in range(sessions):
+            session = await service.create_session(app_name=APP_NAME, user_id=f"user-{worker}")
+            for index in range(events):
+                await service.append_event(session, make_event(index, final=index == events - 1))
+        await service.flush()
+
+    asyncio.run(main())
+
+
+async def verify(kind: str, db_path: str, workers: int, sessions: int, events: int) -> None:
+    service = make_service(kind, db_path)
+    listed = await service.list_sessions(app_name=APP_NAME)
+    assert len(listed.sessions) == workers * sessions, f"세션 수 불일치: {len(listed.sessions)}"
+    for item in listed.sessions:
+        session = await service.get_session(
+            app_name=APP_NAME, user_id=item.user_id, session_id=item.id
+        )
+        assert len(session.events) == events, f"이벤트 수 불일치: {len(session.events)}"
+        assert session.state["step"] == events - 1
+        assert session.state["user:last_step"] == events - 1
+
+
+def run(kind: str, workers: int, sessions: int, events: int) -> None:
+    db_path = os.path.join(tempfile.mkdtemp(prefix="bench_sessions_"), "sessions.db")
+    # 스키마를 먼저 만들어 두고 측정 (첫 연결의 스키마 생성 경합 제외)
+    asyncio.run(make_service(kind, db_path).list_sessions(app_name=APP_NAME))
+
+    processes = [
+        multiprocessing.Process(target=writer, args=(kind, db_path, worker, sessions, events))
+        for worker in range(workers)
+    ]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start
+
+    failed = sum(1 for process in processes if process.exitcode != 0)
+    total_events = workers * sessions * events
+    if failed:
+        print(f"{kind:<12}{elapsed:>10.2f}s  실패한 워커 {failed}/{workers}")
+        return
+    asyncio.run(verify(kind, db_path, workers, sessions, events))
+    print(f"{kind:<12}{elapsed:>10.2f}s{total_events / elapsed:>14.0f} events/s  (읽기 검증 통과)")
+
+
+def main() -> None:
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    sessions = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    events = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    print(f"워커 {workers}개 × 세션 {sessions}개 × 이벤트 {events}개 (동시 쓰기)")
+    for kind in ("adk-sqlite", "sqlite-wal"):
+        run(kind, workers, sessions, events)
+
+
+if __name__ == "__main__":
+    main()
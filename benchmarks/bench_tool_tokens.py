@@ -0,0 +1,186 @@
+"""
+도구 결과 토큰 측정
+서브 에이전트 도구가 LLM 에게 돌려주는 결과(다음 gpt-4o-mini 턴의 입력)의 토큰 수를
+전체 결과를 그대로 돌려주던 방식(before)과 핸들 + 요약만 돌려주는 방식(after)으로 비교합니다.
+
+ADK LiteLlm 과 같은 방식(json.dumps, ensure_ascii=False)으로 직렬화하고,
+tiktoken(o200k_base, gpt-4o 계열)이 있으면 그것으로, 없으면 UTF-8 바이트 수 / 4 로 셉니다.
+
+실행:
+    python benchmarks/bench_tool_tokens.py
+"""
+import asyncio
+import json
+import os
+import sys
+from typing import Any, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from content_creator import agent as content_agent
+from content_creator.formatting import render_content
+from content_creator.subagents.card_news.agent import create_card_news, revise_section
+from content_creator.subagents.image_builder.postprocess import preview_filename
+from content_creator.subagents.image_builder.tools import summarize_image_result
+from content_creator.subagents.infographic.agent import create_infographic
+from content_creator.subagents.newsletter.agent import create_newsletter
+
+try:
+    import tiktoken
+
+    _ENCODING = tiktoken.get_encoding("o200k_base")
+except Exception:
+    _ENCODING = None
+
+CARD_COUNTS = (5, 10)
+
+
+def count_tokens(payload: Any) -> int:
+    """도구 응답이 LLM 입력으로 들어갈 때의 토큰 수."""
+    text = json.dumps(payload, ensure_ascii=False)
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return len(text.encode("utf-8")) // 4
+
+
+class MeasureContext:
+    """state / artifact 만 흉내 내는 도구 컨텍스트."""
+
+    def __init__(self):
+        self.state: Dict[str, Any] = {}
+        self.artifacts: Dict[str, Any] = {}
+
+    async def save_artifact(self, filename: str, artifact: Any, **kwargs: Any) -> int:
+        self.artifacts[filename] = artifact
+        return 0
+
+    async def load_artifact(self, filename: str, version: int = None) -> Any:
+        return self.artifacts.get(filename)
+
+
+def make_result(content_format: str, section_count: int) -> Dict[str, Any]:
+    """LLM 이 생성한 것과 비슷한 길이의 create_content_base 결과를 만듭니다."""
+    raw_content = {
+        "title": "2026년 소비 트렌드 한눈에 보기",
+        "summary": "올해 소비 시장을 이끄는 핵심 흐름을 정리했습니다.",
+        "introduction": "고물가와 기술 변화 속에서 소비자의 선택 기준이 달라지고 있습니다. " * 3,
+        "sections": [
+            {
+                "title": f"트렌드 {i + 1}: 가치 소비와 경험 중심 지출의 확대",
+                "content": (
+                    "소비자들은 가격보다 자신에게 의미 있는 경험과 "
+                    "가치를 주는 상품을 찾고 있습니다. "
+                )
+                * 4,
+                "key_points": ["경험 중심 지출 증가", "브랜드 가치 중시", "구독형 서비스 확산"],
+            }
+            for i in range(section_count)
+        ],
+        "key_points": [f"핵심 포인트 {i + 1}: 소비자는 더 신중해지고 있습니다" for i in range(5)],
+        "conclusion": "변화하는 소비자의 기준을 이해하는 것이 앞으로의 경쟁력입니다. " * 2,
+    }
+    if content_format == "인포그래픽":
+        raw_content["statistics"] = [
+            {"label": f"지표 {i}", "value": f"{i * 7}%", "description": "전년 대비"}
+            for i in range(8)
+        ]
+        raw_content["visual_elements"] = [
+            {"type": "막대 그래프", "description": "연도별 시장 규모 비교"}
+        ]
+    return {
+        "topic": "2026년 소비 트렌드",
+        "format": content_format,
+        "raw_content": raw_content,
+        "formatted_content": render_content(raw_content, content_format),
+        "status": "success",
+    }
+
+
+def make_image_result(section_count: int) -> Dict[str, Any]:
+    """카드뉴스 이미지 생성의 전체 결과 (run_image_generation 반환 형식)."""
+    generated = []
+    for idx in range(1, section_count + 1):
+        filename = f"card_{idx:02d}.jpeg"
+        generated.append({
+            "card_number": idx,
+            "title": f"트렌드 {idx}: 가치 소비와 경험 중심 지출의 확대",
+            "filename": filename,
+            "preview_filename": preview_filename(filename),
+            "cache_key": "3f0a9c" * 10 + f"{idx:04d}",
+            "cached": False,
+            "cache_hit": False,
+            "quality": "medium",
+        })
+    return {
+        "status": "complete",
+        "total_images": len(generated),
+        "generated_images": generated,
+        "errors": None,
+        "placeholders": None,
+    }
+
+
+async def measure_text_tool(tool, content_format: str, section_count: int):
+    result = make_result(content_format, section_count)
+
+    async def create_content_result(*args, **kwargs):
+        return dict(result)
+
+    content_agent.create_content_result = create_content_result
+
+    # before: 전체 결과 + 다음 단계 힌트
+    before = {
+        **result,
+        "next_step": "이제 image_builder_agent를 호출하여 이미지를 생성하세요",
+        "requires_image_generation": True,
+        "message": "텍스트 콘텐츠 생성 완료. 다음 단계: image_builder_agent 호출 필수",
+    }
+    context = MeasureContext()
+    after = await tool(context, topic=result["topic"])
+    return before, after, context
+
+
+async def main() -> None:
+    print(f"토큰 계산: {'tiktoken o200k_base' if _ENCODING else 'UTF-8 바이트 / 4 (근사)'}")
+    print(f"{'도구 → 에이전트':<44}{'섹션':>6}{'before':>10}{'after':>10}{'감소':>8}")
+
+    def report(hop: str, section_count: int, before: Any, after: Any) -> None:
+        b, a = count_tokens(before), count_tokens(after)
+        print(f"{hop:<44}{section_count:>6}{b:>10}{a:>10}{1 - a / b:>8.0%}")
+
+    tools = (
+        ("create_card_news → card_news_agent", create_card_news, "카드뉴스"),
+        ("create_newsletter → newsletter_agent", create_newsletter, "뉴스레터"),
+        ("create_infographic → infographic_agent", create_infographic, "인포그래픽"),
+    )
+    original = content_agent.create_content_result
+    original_regenerate = content_agent.regenerate_section
+    try:
+        for section_count in CARD_COUNTS:
+            for hop, tool, content_format in tools:
+                before, after, _ = await measure_text_tool(tool, content_format, section_count)
+                report(hop, section_count, before, after)
+
+            # revise_section: 섹션 1개만 바뀌어도 예전에는 전체 결과를 다시 돌려줌
+            _, _, context = await measure_text_tool(create_card_news, "카드뉴스", section_count)
+            full = make_result("카드뉴스", section_count)
+            regenerated = {**full, "regenerated_section": 0, "affected_artifacts": ["card_01.jpeg"]}
+            content_agent.regenerate_section = lambda *args, **kwargs: dict(regenerated)
+            after = await revise_section(context, 0)
+            before = {
+                **regenerated,
+                "next_step": "이제 image_builder_agent를 호출하세요",
+                "requires_image_generation": True,
+            }
+            report("revise_section → card_news_agent", section_count, before, after)
+
+            image_result = make_image_result(section_count)
+            after = {**summarize_image_result(image_result), "result_artifact": "image_result.json"}
+            report("generate_images → image_builder_agent", section_count, image_result, after)
+    finally:
+        content_agent.create_content_result = original
+        content_agent.regenerate_section = original_regenerate
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
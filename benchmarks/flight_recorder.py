@@ -0,0 +1,201 @@
+"""
+에이전트 실행 기록/재생
+record 는 root_agent 를 실제 모델로 한 번 실행하며 LiteLlm 턴, 구조화 생성,
+이미지 생성 요청/응답과 도구 호출 시간을 번들 하나에 기록합니다.
+replay 는 같은 실행을 네트워크 없이 기록된 응답으로 다시 돌리며
+(--speed 1 은 원래 지연, 0 은 지연 없음 = 순수 오케스트레이션 시간),
+기록과 도구 순서/최종 응답이 다르거나 기록에 없는 호출이 생기면
+종료 코드 1 로 끝납니다 (회귀 테스트용).
+
+실행:
+    python benchmarks/flight_recorder.py record run.jsonl.gz --topic "AI" --format 카드뉴스
+    python benchmarks/flight_recorder.py replay run.jsonl.gz [--speed 0] [--repeat 5]
+    python benchmarks/flight_recorder.py show run.jsonl.gz
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+APP_NAME = "content_creator"
+USER_ID = "flight"
+
+
+def isolate_environment(replay: bool) -> None:
+    """
+    캐시 적중으로 호출 수가 달라지지 않도록 이미지 캐시를 비우고,
+    재생은 비용 장부에 남기지 않습니다.
+    """
+    os.environ["IMAGE_CACHE_DIR"] = tempfile.mkdtemp(prefix="flight_images_")
+    if replay:
+        os.environ["CONTENT_LEDGER_DB"] = ""
+        # 재생은 API 를 호출하지 않지만 클라이언트 생성에 키가 필요함
+        os.environ.setdefault("OPENAI_API_KEY", "flight-replay")
+
+
+async def run_agent(root_agent, message: str, plugin) -> str:
+    """root_agent 를 메모리 세션으로 한 번 실행하고 최종 응답 텍스트를 반환합니다."""
+    from google.adk.apps import App
+    from google.adk.runners import InMemoryRunner
+    from google.genai import types
+
+    runner = InMemoryRunner(app=App(name=APP_NAME, root_agent=root_agent, plugins=[plugin]))
+    session = await runner.session_service.create_session(app_name=APP_NAME, user_id=USER_ID)
+    final = ""
+    async for event in runner.run_async(
+        user_id=USER_ID,
+        session_id=session.id,
+        new_message=types.Content(role="user", parts=[types.Part(text=message)]),
+    ):
+        if event.is_final_response() and event.content and event.content.parts:
+            final = "".join(part.text or "" for part in event.content.parts)
+    await runner.close()
+    return final
+
+
+def tool_sequence(entries) -> list:
+    return [
+        entry["stream"]
+        for entry in sorted(entries, key=lambda e: e["start"])
+        if entry["stream"].startswith("tool:")
+    ]
+
+
+def print_streams(recorded, replayed=None) -> None:
+    from content_creator.flight_recorder import timeline_summary
+
+    before = timeline_summary(recorded)
+    after = timeline_summary(replayed) if replayed is not None else {}
+    header = f"{'stream':<36}{'count':>7}{'recorded s':>12}"
+    print(header + (f"{'replay n':>10}{'replay s':>10}" if replayed is not None else ""))
+    for stream in sorted(set(before) | set(after)):
+        left = before.get(stream, {"count": 0, "seconds": 0.0})
+        line = f"{stream[:35]:<36}{left['count']:>7}{left['seconds']:>12.2f}"
+        if replayed is not None:
+            right = after.get(stream, {"count": 0, "seconds": 0.0})
+            line += f"{right['count']:>10}{right['seconds']:>10.2f}"
+        print(line)
+
+
+def record(args) -> int:
+    isolate_environment(replay=False)
+    from content_creator.adk_client import build_content_message
+    from content_creator.agent import root_agent
+    from content_creator.flight_recorder import (
+        RECORD,
+        FlightRecorder,
+        FlightRecorderPlugin,
+        flight_recording,
+    )
+
+    message = build_content_message(args.topic, args.format, None)
+    recorder = FlightRecorder(RECORD, args.bundle)
+    recorder.meta = {"message": message, "topic": args.topic, "format": args.format}
+    with flight_recording(recorder):
+        started = time.perf_counter()
+        final = asyncio.run(run_agent(root_agent, message, FlightRecorderPlugin(recorder)))
+        recorder.meta["wall_seconds"] = round(time.perf_counter() - started, 3)
+        recorder.meta["final_response"] = final
+    print(
+        f"기록 완료: {args.bundle} "
+        f"({len(recorder.entries)}건, {recorder.meta['wall_seconds']:.2f}s)"
+    )
+    print_streams(recorder.entries)
+    return 0
+
+
+def replay(args) -> int:
+    isolate_environment(replay=True)
+    from content_creator.agent import root_agent
+    from content_creator.flight_recorder import (
+        REPLAY,
+        FlightRecorder,
+        FlightRecorderPlugin,
+        ReplayMismatchError,
+        flight_recording,
+    )
+
+    walls = []
+    failed = False
+    for attempt in range(args.repeat):
+        recorder = FlightRecorder(REPLAY, args.bundle, speed=args.speed)
+        meta = recorder.recorded_meta
+        with flight_recording(recorder):
+            started = time.perf_counter()
+            try:
+                final = asyncio.run(
+                    run_agent(root_agent, meta["message"], FlightRecorderPlugin(recorder))
+                )
+            except ReplayMismatchError as e:
+                print(f"재생 실패: {e}")
+                return 1
+            walls.append(time.perf_counter() - started)
+
+        if attempt > 0:
+            continue
+        print_streams(recorder.recorded, recorder.entries)
+        same_tools = tool_sequence(recorder.recorded) == tool_sequence(recorder.entries)
+        same_final = final == meta.get("final_response")
+        print(
+            f"도구 순서 {'일치' if same_tools else '다름'}, "
+            f"최종 응답 {'일치' if same_final else '다름'}, "
+            f"해시 불일치 {recorder.mismatches}건, 쓰이지 않은 기록 {recorder.unused()}건"
+        )
+        failed = not same_tools or not same_final or recorder.unused() > 0
+
+    print(
+        f"기록 {meta.get('wall_seconds', 0):.2f}s → 재생(speed={args.speed:g}) "
+        f"p50 {statistics.median(walls):.3f}s, 최소 {min(walls):.3f}s ({len(walls)}회)"
+    )
+    return 1 if failed else 0
+
+
+def show(args) -> int:
+    from content_creator.flight_recorder import REPLAY, FlightRecorder
+
+    recorder = FlightRecorder(REPLAY, args.bundle)
+    meta = recorder.recorded_meta
+    print(
+        f"{meta.get('format', '')} / {meta.get('topic', '')} ({meta.get('wall_seconds', 0):.2f}s)"
+    )
+    for entry in sorted(recorder.recorded, key=lambda e: e["start"]):
+        status = "error" if "error" in entry else ""
+        print(f"+{entry['start']:>8.2f}s {entry['duration']:>8.2f}s  {entry['stream']:<40}{status}")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="에이전트 실행 기록/재생")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="실제 모델로 실행하며 기록")
+    record_parser.add_argument("bundle")
+    record_parser.add_argument("--topic", required=True)
+    record_parser.add_argument(
+        "--format", default="카드뉴스", choices=["카드뉴스", "뉴스레터", "인포그래픽"]
+    )
+    record_parser.set_defaults(handler=record)
+
+    replay_parser = commands.add_parser("replay", help="기록된 응답으로 오프라인 재생")
+    replay_parser.add_argument("bundle")
+    replay_parser.add_argument(
+        "--speed", type=float, default=1.0, help="기록된 지연 배율 (0 이면 지연 없음)"
+    )
+    replay_parser.add_argument("--repeat", type=int, default=1)
+    replay_parser.set_defaults(handler=replay)
+
+    show_parser = commands.add_parser("show", help="번들의 호출 타임라인 출력")
+    show_parser.add_argument("bundle")
+    show_parser.set_defaults(handler=show)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+비용 장부 조회
+CONTENT_LEDGER_DB 에 기록된 모델/이미지 호출 비용을 요청/사용자/형식/모델별 합계로 보여줍니다.
+--request 로 요청 ID 를 지정하면 그 요청의 호출별 기록을 출력합니다.
+
+실행:
+    python benchmarks/ledger_report.py [--by request|user|format|model] [--hours 24]
+        [--db ledger.db]
+    python benchmarks/ledger_report.py --request <요청 ID>
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from content_creator.ledger import CONTENT_LEDGER_DB, CostLedger
+
+
+def print_summary(ledger: CostLedger, group_by: str, since: float, limit: int) -> None:
+    rows = ledger.summary(group_by, since=since, limit=limit)
+    print(
+        f"{group_by:<26}{'reqs':>6}{'llm':>6}{'in tok':>10}{'out tok':>10}"
+        f"{'cached':>9}{'images':>8}{'USD':>11}"
+    )
+    for row in rows:
+        print(
+            f"{str(row['key'] or '-')[:25]:<26}{row['requests']:>6}{row['llm_calls']:>6}"
+            f"{row['prompt_tokens']:>10}{row['completion_tokens']:>10}{row['cached_tokens']:>9}"
+            f"{row['images']:>8}{row['cost_usd']:>11.4f}"
+        )
+    print(f"{'합계':<26}{'':>6}{'':>6}{'':>10}{'':>10}{'':>9}{sum(r['images'] for r in rows):>8}"
+          f"{sum(r['cost_usd'] for r in rows):>11.4f}")
+
+
+def print_request(ledger: CostLedger, request_id: str) -> None:
+    report = ledger.request_report(request_id)
+    if not report["entries"]:
+        print(f"요청을 찾을 수 없습니다: {request_id}")
+        return
+    for entry in report["entries"]:
+        stamp = datetime.fromtimestamp(entry["ts"]).strftime("%H:%M:%S")
+        tokens = f"{entry['prompt_tokens']}/{entry['completion_tokens']}"
+        print(
+            f"{stamp}  {entry['kind']:<6}{entry['model']:<14}{entry['stage'][:24]:<25}"
+            f"{tokens:>13}{entry['images']:>4}{entry['cost_usd']:>11.5f}"
+        )
+    print(
+        f"합계: LLM {report['llm_calls']}회, "
+        f"토큰 {report['prompt_tokens']}/{report['completion_tokens']} "
+        f"(캐시 {report['cached_tokens']}), "
+        f"이미지 {report['images']}장, ${report['cost_usd']:.4f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="비용 장부 조회")
+    parser.add_argument("--db", default=CONTENT_LEDGER_DB)
+    parser.add_argument("--by", default="request", choices=["request", "user", "format", "model"])
+    parser.add_argument("--hours", type=float, default=0, help="최근 N시간만 (0 이면 전체)")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--request", help="호출별 기록을 볼 요청 ID")
+    args = parser.parse_args()
+
+    ledger = CostLedger(db_path=args.db)
+    if args.request:
+        print_request(ledger, args.request)
+    else:
+        print_summary(
+            ledger, args.by, time.time() - args.hours * 3600 if args.hours else 0.0, args.limit
+        )
+
+
+if __name__ == "__main__":
+    main()
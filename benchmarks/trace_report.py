@@ -0,0 +1,100 @@
+"""
+트레이스 요약
+CONTENT_TRACE_EXPORTER=jsonl 로 기록한 span 파일을 읽어 단계(span 이름)별 호출 수, 소요 시간,
+토큰 수, 이미지 수/캐시 적중 수를 표로 보여줍니다. 요청 하나가 어디서 시간을 썼는지 볼 때는
+--trace 로 trace_id 접두사를 지정하면 span 트리를 출력합니다.
+
+실행:
+    python benchmarks/trace_report.py [traces.jsonl] [--trace <trace_id 접두사>]
+"""
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from content_creator.tracing import CONTENT_TRACE_FILE
+
+
+def load_spans(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def _stage_name(name: str) -> str:
+    # ADK span 이름의 에이전트/도구 이름은 남기고, 이미지 모델 이름은 묶음
+    return name.split(" ")[0] if name.startswith("images.generate") else name
+
+
+def print_summary(spans: List[Dict[str, Any]]) -> None:
+    stages: Dict[str, Dict[str, Any]] = defaultdict(
+        lambda: {"durations": [], "input": 0, "output": 0, "images": 0, "hits": 0}
+    )
+    for span in spans:
+        stage = stages[_stage_name(span["name"])]
+        attributes = span.get("attributes") or {}
+        stage["durations"].append(span["duration_ms"])
+        stage["input"] += int(attributes.get("gen_ai.usage.input_tokens") or 0)
+        stage["output"] += int(attributes.get("gen_ai.usage.output_tokens") or 0)
+        stage["images"] += int(attributes.get("image.count") or 0)
+        stage["hits"] += int(attributes.get("image.cache_hits") or 0)
+        stage["hits"] += int(bool(attributes.get("image.cache_hit")))
+
+    print(
+        f"{'span':<40}{'count':>7}{'total s':>10}{'p50 ms':>10}{'p95 ms':>10}"
+        f"{'in tok':>9}{'out tok':>9}{'images':>8}{'hits':>6}"
+    )
+    for name, stage in sorted(stages.items(), key=lambda item: -sum(item[1]["durations"])):
+        durations = stage["durations"]
+        print(
+            f"{name[:39]:<40}{len(durations):>7}{sum(durations) / 1000:>10.2f}"
+            f"{percentile(durations, 0.5):>10.1f}{percentile(durations, 0.95):>10.1f}"
+            f"{stage['input']:>9}{stage['output']:>9}{stage['images']:>8}{stage['hits']:>6}"
+        )
+
+
+def print_tree(spans: List[Dict[str, Any]], trace_prefix: str) -> None:
+    selected = [span for span in spans if span["trace_id"].startswith(trace_prefix)]
+    if not selected:
+        print(f"trace 를 찾을 수 없습니다: {trace_prefix}")
+        return
+    children: Dict[Any, List[Dict[str, Any]]] = defaultdict(list)
+    ids = {span["span_id"] for span in selected}
+    for span in selected:
+        parent = span["parent_span_id"] if span["parent_span_id"] in ids else None
+        children[parent].append(span)
+    origin = min(span["start_time"] for span in selected)
+
+    def walk(parent, depth: int) -> None:
+        for span in sorted(children[parent], key=lambda s: s["start_time"]):
+            offset = (span["start_time"] - origin) * 1000
+            name = f"{'  ' * depth}{span['name']:<{max(10, 50 - 2 * depth)}}"
+            print(f"{name} +{offset:>9.1f}ms {span['duration_ms']:>10.1f}ms")
+            walk(span["span_id"], depth + 1)
+
+    walk(None, 0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="트레이스 JSONL 요약")
+    parser.add_argument("path", nargs="?", default=CONTENT_TRACE_FILE)
+    parser.add_argument("--trace", help="span 트리를 출력할 trace_id 접두사")
+    args = parser.parse_args()
+
+    spans = load_spans(args.path)
+    if args.trace:
+        print_tree(spans, args.trace)
+    else:
+        print_summary(spans)
+
+
+if __name__ == "__main__":
+    main()
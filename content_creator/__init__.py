@@ -1,9 +1,17 @@
 """
 콘텐츠 제작 에이전트 패키지
 """
-from .agent import root_agent, create_content
 
 __all__ = [
     'root_agent',
     'create_content',
 ]
+
+
+def __getattr__(name):
+    # 에이전트 정의는 처음 접근할 때 불러옴
+    # (adk_async_client 처럼 에이전트 없이 쓰는 모듈을 가볍게 import)
+    if name in __all__:
+        from . import agent
+        return getattr(agent, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,342 @@
+"""
+비동기 ADK API Server 클라이언트
+배치 작업이나 다른 서비스에서 Cloud Run ADK 서버로 수백 건의 생성 요청을 동시에 보낼 때 사용합니다.
+Streamlit 에 의존하지 않습니다.
+
+- httpx.AsyncClient 커넥션 풀 1개를 공유하고, 동시 요청 수는 세마포어로 제한합니다.
+- 요청마다 마감 시간(deadline)을 두고, 대기/재시도/응답 수신 모두 남은 시간 안에서만 진행합니다.
+- 멱등 요청(세션 생성, artifact 조회)은 일시적 오류에 대해 지수 백오프로 재시도합니다.
+  /run 처럼 멱등이 아닌 요청은 요청이 서버에 전달되지 않은 경우(연결 실패)에만 재시도합니다.
+
+사용 예:
+    async with AsyncAdkClient("https://...run.app") as client:
+        results = await client.run_many([
+            {"topic": "인공지능의 미래", "content_format": "카드뉴스"},
+            ...
+        ], timeout=300)
+"""
+import asyncio
+import os
+import random
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from .adk_events import ContentEventAccumulator, build_content_message
+from .deadline import REQUEST_DEADLINE_STATE_KEY, DeadlineExceededError
+
+# 동시 요청 수 / 커넥션 풀 크기
+ADK_ASYNC_MAX_CONCURRENCY = int(os.getenv("ADK_ASYNC_MAX_CONCURRENCY", "32"))
+ADK_ASYNC_MAX_CONNECTIONS = int(os.getenv("ADK_ASYNC_MAX_CONNECTIONS", "64"))
+
+# 재시도 횟수와 백오프 기준 시간 (초)
+ADK_ASYNC_MAX_RETRIES = int(os.getenv("ADK_ASYNC_MAX_RETRIES", "3"))
+ADK_ASYNC_BACKOFF_SECONDS = float(os.getenv("ADK_ASYNC_BACKOFF_SECONDS", "0.5"))
+
+# 연결 타임아웃과 기본 요청 마감 시간 (초)
+ADK_CONNECT_TIMEOUT = float(os.getenv("ADK_CONNECT_TIMEOUT", "10"))
+ADK_ASYNC_DEFAULT_TIMEOUT = float(os.getenv("ADK_ASYNC_DEFAULT_TIMEOUT", "300"))
+
+# 재시도할 HTTP 상태 코드 (과부하/일시적 게이트웨이 오류)
+RETRY_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class AdkClientError(Exception):
+    """ADK 서버 요청 실패."""
+
+
+class AdkDeadlineExceededError(AdkClientError, DeadlineExceededError):
+    """요청 마감 시간을 넘김."""
+
+
+class AsyncAdkClient:
+    """동시 요청 수 제한, 마감 시간, 재시도를 지원하는 비동기 ADK 클라이언트."""
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        app_name: str = "content_creator_agent",
+        max_concurrency: int = ADK_ASYNC_MAX_CONCURRENCY,
+        max_connections: int = ADK_ASYNC_MAX_CONNECTIONS,
+        max_retries: int = ADK_ASYNC_MAX_RETRIES,
+        backoff_seconds: float = ADK_ASYNC_BACKOFF_SECONDS,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        base_url = base_url or os.getenv("ADK_SERVER_URL", "")
+        if not base_url:
+            raise ValueError("ADK_SERVER_URL이 설정되지 않았습니다.")
+        self.app_name = app_name
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._known_sessions = set()
+        self._client = httpx.AsyncClient(
+            base_url=base_url.rstrip("/"),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=httpx.Timeout(ADK_ASYNC_DEFAULT_TIMEOUT, connect=ADK_CONNECT_TIMEOUT),
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> "AsyncAdkClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    # ------------------------------------------------------------------
+    # 공통 요청 처리
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def deadline_after(timeout: Optional[float]) -> float:
+        """지금부터 timeout 초 뒤의 마감 시각 (이벤트 루프 시간 기준)."""
+        return asyncio.get_running_loop().time() + (
+            timeout if timeout is not None else ADK_ASYNC_DEFAULT_TIMEOUT
+        )
+
+    @staticmethod
+    def _remaining(deadline: float) -> float:
+        remaining = deadline - asyncio.get_running_loop().time()
+        if remaining <= 0:
+            raise AdkDeadlineExceededError("요청 마감 시간을 넘겼습니다.")
+        return remaining
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        deadline: float,
+        idempotent: bool,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        동시 요청 수 제한과 마감 시간 안에서 요청을 보내고, 필요하면 재시도합니다.
+        세마포어 대기 시간도 마감 시간에 포함됩니다.
+        """
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self._remaining(deadline))
+        except asyncio.TimeoutError:
+            raise AdkDeadlineExceededError("동시 요청 대기 중 마감 시간을 넘겼습니다.") from None
+
+        try:
+            attempt = 0
+            while True:
+                remaining = self._remaining(deadline)
+                timeout = httpx.Timeout(remaining, connect=min(ADK_CONNECT_TIMEOUT, remaining))
+                try:
+                    # httpx 타임아웃은 구간별이므로 전체 응답도 남은 시간 안에 끝나도록 감쌈
+                    response = await asyncio.wait_for(
+                        self._client.request(method, path, timeout=timeout, **kwargs),
+                        remaining,
+                    )
+                except asyncio.TimeoutError:
+                    message = f"요청 마감 시간을 넘겼습니다: {method} {path}"
+                    raise AdkDeadlineExceededError(message) from None
+                except httpx.TimeoutException as e:
+                    if isinstance(e, httpx.ConnectTimeout) and attempt < self.max_retries:
+                        attempt += 1
+                        await self._backoff(attempt, deadline)
+                        continue
+                    if asyncio.get_running_loop().time() >= deadline:
+                        message = f"요청 마감 시간을 넘겼습니다: {method} {path}"
+                        raise AdkDeadlineExceededError(message) from e
+                    raise AdkClientError(f"ADK 서버 응답 시간 초과: {e}") from e
+                except httpx.TransportError as e:
+                    # 연결 실패는 요청이 전달되지 않았으므로 항상 재시도 가능
+                    retryable = idempotent or isinstance(e, httpx.ConnectError)
+                    if retryable and attempt < self.max_retries:
+                        attempt += 1
+                        await self._backoff(attempt, deadline)
+                        continue
+                    raise AdkClientError(f"ADK 서버 통신 오류: {e}") from e
+
+                if (
+                    idempotent
+                    and response.status_code in RETRY_STATUS_CODES
+                    and attempt < self.max_retries
+                ):
+                    attempt += 1
+                    await self._backoff(attempt, deadline, response.headers.get("Retry-After"))
+                    continue
+                return response
+        finally:
+            self._semaphore.release()
+
+    async def _backoff(
+        self, attempt: int, deadline: float, retry_after: Optional[str] = None
+    ) -> None:
+        """지수 백오프 + 지터로 기다립니다. 마감 시간을 넘길 만큼은 기다리지 않습니다."""
+        delay = self.backoff_seconds * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        if delay >= self._remaining(deadline):
+            raise AdkDeadlineExceededError("재시도 대기 중 마감 시간을 넘기게 됩니다.")
+        await asyncio.sleep(delay)
+
+    # ------------------------------------------------------------------
+    # ADK API
+    # ------------------------------------------------------------------
+
+    async def ensure_session(
+        self,
+        user_id: str,
+        session_id: str,
+        deadline: Optional[float] = None,
+        state: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """세션을 생성하거나 확인합니다 (확인된 세션은 다시 요청하지 않음)."""
+        key = (user_id, session_id)
+        if key in self._known_sessions:
+            return
+        response = await self._request(
+            "POST",
+            f"/apps/{self.app_name}/users/{user_id}/sessions/{session_id}",
+            deadline if deadline is not None else self.deadline_after(30),
+            idempotent=True,
+            json={"state": state or {}},
+        )
+        # 409(또는 일부 버전의 400 "already exists")는 이미 존재하는 세션
+        if response.status_code in (200, 201, 409) or (
+            response.status_code == 400 and "already exists" in response.text
+        ):
+            self._known_sessions.add(key)
+            return
+        raise AdkClientError(f"세션 생성 실패 ({response.status_code}): {response.text[:200]}")
+
+    async def run(
+        self,
+        message: str,
+        user_id: str = "u_demo",
+        session_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        /run 으로 에이전트를 실행하고 이벤트 목록을 반환합니다.
+
+        Args:
+            message: 사용자 메시지
+            user_id: 사용자 ID
+            session_id: 세션 ID (없으면 새로 만듦)
+            timeout: 세션 생성부터 응답 수신까지 전체 마감 시간 (초)
+
+        Returns:
+            ADK 이벤트 리스트
+        """
+        deadline = self.deadline_after(timeout)
+        session_id = session_id or f"s_{uuid.uuid4().hex[:12]}"
+        await self.ensure_session(user_id, session_id, deadline)
+
+        payload = {
+            "appName": self.app_name,
+            "userId": user_id,
+            "sessionId": session_id,
+            "newMessage": {"role": "user", "parts": [{"text": message}]},
+            # 서버 도구들도 같은 마감 시각(epoch 초) 안에서만 모델을 호출하도록 state 로 전달
+            "stateDelta": {REQUEST_DEADLINE_STATE_KEY: time.time() + self._remaining(deadline)},
+        }
+        response = await self._request("POST", "/run", deadline, idempotent=False, json=payload)
+        if response.status_code == 404:
+            # 서버 재시작 등으로 세션이 사라진 경우 다시 만들고 1번 재시도
+            self._known_sessions.discard((user_id, session_id))
+            await self.ensure_session(user_id, session_id, deadline)
+            response = await self._request("POST", "/run", deadline, idempotent=False, json=payload)
+        if response.status_code >= 400:
+            raise AdkClientError(
+                f"ADK 서버 실행 오류 ({response.status_code}): {response.text[:200]}"
+            )
+        return response.json()
+
+    async def run_content(
+        self,
+        topic: str,
+        content_format: str,
+        reference_files: Optional[List[str]] = None,
+        user_id: str = "u_demo",
+        session_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        콘텐츠 1건을 생성하고 create_content 결과 형식으로 반환합니다.
+        (artifact 는 이름과 버전만 담으며, 필요하면 load_artifact 로 받습니다.)
+        """
+        session_id = session_id or f"s_{uuid.uuid4().hex[:12]}"
+        events = await self.run(
+            build_content_message(topic, content_format, reference_files),
+            user_id=user_id,
+            session_id=session_id,
+            timeout=timeout,
+        )
+        accumulator = ContentEventAccumulator(topic, content_format)
+        for event in events:
+            accumulator.feed(event)
+        result = accumulator.snapshot(done=True)
+        result["session_id"] = session_id
+        return result
+
+    async def load_artifact(
+        self,
+        session_id: str,
+        name: str,
+        version: int,
+        user_id: str = "u_demo",
+        timeout: Optional[float] = 60,
+    ) -> Dict[str, Any]:
+        """artifact 한 버전을 조회합니다 (types.Part JSON)."""
+        response = await self._request(
+            "GET",
+            f"/apps/{self.app_name}/users/{user_id}/sessions/{session_id}/artifacts/{name}/versions/{int(version)}",
+            self.deadline_after(timeout),
+            idempotent=True,
+        )
+        if response.status_code >= 400:
+            raise AdkClientError(f"artifact 조회 실패 ({response.status_code}): {name}")
+        return response.json()
+
+    async def run_many(
+        self,
+        requests: List[Dict[str, Any]],
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        여러 콘텐츠 생성 요청을 동시에 실행합니다 (동시 요청 수는 max_concurrency 로 제한).
+
+        Args:
+            requests: run_content 인자 딕셔너리 리스트
+            timeout: 요청별 마감 시간 (각 요청에 timeout 이 없을 때 사용)
+
+        Returns:
+            요청 순서대로의 결과 리스트 (실패한 요청은 status="error")
+        """
+        async def run_one(request: Dict[str, Any]) -> Dict[str, Any]:
+            request = {"timeout": timeout, **request}
+            try:
+                return await self.run_content(**request)
+            except Exception as e:
+                # 요청 하나의 실패(응답 JSON 파싱 오류 등 포함)가
+                # 배치 전체를 중단시키지 않도록 결과로 바꿈
+                if isinstance(e, AdkDeadlineExceededError):
+                    error_type = "deadline"
+                elif isinstance(e, AdkClientError):
+                    error_type = "server"
+                else:
+                    error_type = "client"
+                return {
+                    "topic": request.get("topic"),
+                    "format": request.get("content_format"),
+                    "error": str(e) or type(e).__name__,
+                    "error_type": error_type,
+                    "status": "error",
+                }
+
+        return await asyncio.gather(*(run_one(request) for request in requests))
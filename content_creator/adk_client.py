@@ -3,9 +3,28 @@ ADK API Server 클라이언트
 Cloud Run에 배포된 ADK 서버와 통신
 """
 import os
+import re
+import json
+import base64
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from typing import Optional, Dict, Any
-import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from typing import Callable, Iterable, Iterator, Optional, Dict, Any, List
+
+from .adk_events import ContentEventAccumulator, build_content_message
+from .content_store import (
+    CONTENT_ARTIFACT_NAME,
+    IMAGE_RESULT_ARTIFACT_NAME,
+    content_from_payload,
+)
+from .deadline import Deadline, DeadlineExceededError, REQUEST_DEADLINE_STATE_KEY, resolve_timeout
 
 # 환경 변수에서 ADK 서버 URL 가져오기
 ADK_SERVER_URL = os.getenv(
@@ -13,14 +32,169 @@ ADK_SERVER_URL = os.getenv(
     ""  # Streamlit secrets에서 설정
 )
 
+# 커넥션 풀 크기와 (연결, 응답 대기) 타임아웃
+ADK_POOL_SIZE = int(os.getenv("ADK_POOL_SIZE", "8"))
+ADK_CONNECT_TIMEOUT = float(os.getenv("ADK_CONNECT_TIMEOUT", "10"))
+ADK_READ_TIMEOUT = float(os.getenv("ADK_READ_TIMEOUT", "120"))
+
+# 최근 요청의 구간별 소요 시간 기록 개수
+ADK_TIMING_HISTORY = 100
+
+# 서버 artifact(이미지) 로컬 캐시 디렉토리와 동시 다운로드 수
+ADK_ARTIFACT_CACHE_DIR = os.getenv(
+    "ADK_ARTIFACT_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "content_creator", "adk_artifacts"),
+)
+ADK_ARTIFACT_WORKERS = max(1, int(os.getenv("ADK_ARTIFACT_WORKERS", "4")))
+
+# 결과 이미지로 취급하는 artifact 확장자
+_IMAGE_EXTENSIONS = (".jpeg", ".jpg", ".png", ".webp")
+_PREVIEW_SUFFIX = ".preview.webp"
+
+
+# ---------------------------------------------------------------------------
+# keep-alive 세션과 구간별 타이밍
+# ---------------------------------------------------------------------------
+
+_timing_local = threading.local()
+_timings: deque = deque(maxlen=ADK_TIMING_HISTORY)
+_timings_lock = threading.Lock()
+
+
+def _record_connect(elapsed: float) -> None:
+    """현재 스레드에서 진행 중인 요청에 TCP/TLS 연결 시간을 더합니다."""
+    _timing_local.connect = getattr(_timing_local, "connect", 0.0) + elapsed
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _record_connect(time.perf_counter() - start)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _record_connect(time.perf_counter() - start)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    """새 연결을 맺을 때 걸린 시간(TCP + TLS)을 측정하는 어댑터."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+_ADK_SESSION: Optional[requests.Session] = None
+_ADK_SESSION_LOCK = threading.Lock()
+
+
+def get_adk_http_session() -> requests.Session:
+    """ADK 서버용 keep-alive 커넥션 풀 세션을 가져옵니다 (싱글턴)."""
+    global _ADK_SESSION
+    if _ADK_SESSION is None:
+        with _ADK_SESSION_LOCK:
+            if _ADK_SESSION is None:
+                session = requests.Session()
+                adapter = _TimedHTTPAdapter(
+                    pool_connections=ADK_POOL_SIZE, pool_maxsize=ADK_POOL_SIZE
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _ADK_SESSION = session
+    return _ADK_SESSION
+
+
+def _timed_request(
+    method: str, path: str, read_timeout: float = ADK_READ_TIMEOUT, **kwargs
+) -> requests.Response:
+    """
+    풀 세션으로 요청을 보내고 구간별 소요 시간을 기록합니다.
+    - connect: 새 TCP/TLS 연결에 걸린 시간 (연결을 재사용하면 0)
+    - wait: 요청 전송부터 응답 헤더 수신까지 (서버 처리 시간 포함)
+    - read: 응답 본문 수신 시간
+    """
+    _timing_local.connect = 0.0
+    start = time.perf_counter()
+    response = get_adk_http_session().request(
+        method,
+        f"{ADK_SERVER_URL}{path}",
+        timeout=(ADK_CONNECT_TIMEOUT, read_timeout),
+        **kwargs,
+    )
+    headers_at = start + response.elapsed.total_seconds()
+    if not kwargs.get("stream"):
+        response.content  # 본문까지 읽어서 read 구간 측정
+    end = time.perf_counter()
+    connect = _timing_local.connect
+
+    timing = {
+        "method": method,
+        "path": path,
+        "status": response.status_code,
+        "reused_connection": connect == 0.0,
+        "connect": connect,
+        "wait": max(0.0, headers_at - start - connect),
+        "read": max(0.0, end - headers_at),
+        "total": end - start,
+    }
+    with _timings_lock:
+        _timings.append(timing)
+    return response
 
-def ensure_session(user_id: str = "u_demo", session_id: str = "s_demo") -> tuple:
+
+def get_adk_timings() -> List[Dict[str, Any]]:
+    """최근 ADK 요청들의 구간별 소요 시간(초)을 오래된 순서로 반환합니다."""
+    with _timings_lock:
+        return list(_timings)
+
+
+# ---------------------------------------------------------------------------
+# 세션 관리
+# ---------------------------------------------------------------------------
+
+# 서버에 존재하는 것으로 확인된 (app_name, user_id, session_id)
+_known_sessions = set()
+_known_sessions_lock = threading.Lock()
+
+
+def forget_session(user_id: str, session_id: str, app_name: str = "content_creator_agent") -> None:
+    """세션 캐시에서 제거합니다 (서버 재시작 등으로 세션이 사라졌을 때)."""
+    with _known_sessions_lock:
+        _known_sessions.discard((app_name, user_id, session_id))
+
+
+def ensure_session(
+    user_id: str = "u_demo",
+    session_id: str = "s_demo",
+    app_name: str = "content_creator_agent"
+) -> tuple:
     """
     세션을 생성하거나 확인합니다.
+    이미 확인한 세션은 로컬에 기억해 두고 서버에 다시 요청하지 않습니다.
     
     Args:
         user_id: 사용자 ID
         session_id: 세션 ID
+        app_name: 앱 이름
         
     Returns:
         (status_code, response_text) 튜플
@@ -28,25 +202,83 @@ def ensure_session(user_id: str = "u_demo", session_id: str = "s_demo") -> tuple
     if not ADK_SERVER_URL:
         raise ValueError("ADK_SERVER_URL이 설정되지 않았습니다. Streamlit secrets를 확인하세요.")
     
+    key = (app_name, user_id, session_id)
+    with _known_sessions_lock:
+        if key in _known_sessions:
+            return 200, "OK"
+
     try:
-        r = requests.post(
-            f"{ADK_SERVER_URL}/apps/content_creator_agent/users/{user_id}/sessions/{session_id}",
+        r = _timed_request(
+            "POST",
+            f"/apps/{app_name}/users/{user_id}/sessions/{session_id}",
+            read_timeout=30,
             json={"state": {}},
-            timeout=30
         )
+        if r.status_code in [200, 201]:
+            # 새로 만든 세션(서버 재시작 후 같은 ID 로 다시 만든 경우 포함)은
+            # artifact 버전이 0 부터 다시 시작하므로
+            # 예전 실행에서 받아 둔 같은 (이름, 버전) 캐시 파일을 지움
+            clear_artifact_cache(session_id, user_id)
+            with _known_sessions_lock:
+                _known_sessions.add(key)
+            return r.status_code, "OK"
         # 409는 이미 존재하는 세션이므로 OK로 처리
-        if r.status_code in [200, 201, 409]:
+        if r.status_code == 409:
+            with _known_sessions_lock:
+                _known_sessions.add(key)
+            return r.status_code, "OK"
+        # 일부 서버 버전은 중복 생성 시 400 + "already exists" 를 반환
+        if r.status_code == 400 and "already exists" in r.text:
+            with _known_sessions_lock:
+                _known_sessions.add(key)
             return r.status_code, "OK"
         return r.status_code, r.text
     except requests.exceptions.RequestException as e:
         return 500, str(e)
 
 
+def _resolve_session_id(session_id: Optional[str]) -> str:
+    """세션 ID 가 없으면 Streamlit 세션마다 하나씩 만들어 사용합니다."""
+    if session_id is None:
+        # Streamlit 세션 ID 사용 (Streamlit 없이 쓰는 경우 session_id 를 직접 넘겨야 함)
+        import streamlit as st
+        if "adk_session_id" not in st.session_state:
+            import uuid
+            st.session_state["adk_session_id"] = f"s_{uuid.uuid4().hex[:8]}"
+        session_id = st.session_state["adk_session_id"]
+    return session_id
+
+
+def _run_payload(
+    message: str,
+    user_id: str,
+    session_id: str,
+    app_name: str,
+    deadline: Optional[Deadline] = None,
+) -> Dict[str, Any]:
+    """
+    /run, /run_sse 공통 요청 페이로드 (camelCase 버전).
+    요청 마감 시각은 stateDelta 로 세션 state 에 넣어 서버 도구들이 남은 시간을 알 수 있게 하며,
+    마감이 없는 요청은 이전 요청의 마감 시각이 남지 않도록 비웁니다.
+    """
+    return {
+        "appName": app_name,
+        "userId": user_id,
+        "sessionId": session_id,
+        "newMessage": {
+            "role": "user",
+            "parts": [{"text": message}]
+        },
+        "stateDelta": {REQUEST_DEADLINE_STATE_KEY: deadline.expires_at if deadline else None},
+    }
+
+
 def call_adk_agent(
     message: str,
     user_id: str = "u_demo",
     session_id: Optional[str] = None,
-    app_name: str = "content_creator_agent"
+    app_name: str = "content_creator_agent",
+    deadline: Optional[Deadline] = None,
 ) -> Dict[str, Any]:
     """
     ADK API Server에 요청을 보냅니다.
@@ -56,6 +288,7 @@ def call_adk_agent(
         user_id: 사용자 ID
         session_id: 세션 ID (없으면 Streamlit 세션 ID 사용)
         app_name: 앱 이름
+        deadline: 요청 마감 시간 (응답 대기는 남은 시간까지만)
         
     Returns:
         에이전트 응답
@@ -63,82 +296,399 @@ def call_adk_agent(
     if not ADK_SERVER_URL:
         raise ValueError("ADK_SERVER_URL이 설정되지 않았습니다. Streamlit secrets를 확인하세요.")
     
-    if session_id is None:
-        # Streamlit 세션 ID 사용
-        if "adk_session_id" not in st.session_state:
-            import uuid
-            st.session_state["adk_session_id"] = f"s_{uuid.uuid4().hex[:8]}"
-        session_id = st.session_state["adk_session_id"]
+    session_id = _resolve_session_id(session_id)
     
-    # 세션 확인/생성
-    ensure_session(user_id, session_id)
+    # 세션 확인/생성 (처음 한 번만 서버에 요청)
+    ensure_session(user_id, session_id, app_name)
     
-    # 요청 페이로드 (camelCase 버전)
-    payload = {
-        "appName": app_name,
-        "userId": user_id,
-        "sessionId": session_id,
-        "newMessage": {
-            "role": "user",
-            "parts": [{"text": message}]
-        }
-    }
+    payload = _run_payload(message, user_id, session_id, app_name, deadline)
     
     try:
-        r = requests.post(
-            f"{ADK_SERVER_URL}/run",
+        r = _timed_request(
+            "POST",
+            "/run",
+            read_timeout=resolve_timeout(deadline, ADK_READ_TIMEOUT, "ADK 실행"),
             json=payload,
-            timeout=120  # 에이전트 응답 대기 시간
         )
+        if r.status_code == 404:
+            # 캐시된 세션이 서버에서 사라진 경우 (재배포/재시작) 다시 만들고 1번 재시도
+            forget_session(user_id, session_id, app_name)
+            ensure_session(user_id, session_id, app_name)
+            r = _timed_request(
+                "POST",
+                "/run",
+                read_timeout=resolve_timeout(deadline, ADK_READ_TIMEOUT, "ADK 실행"),
+                json=payload,
+            )
         r.raise_for_status()
         return r.json()
     except requests.exceptions.RequestException as e:
         raise Exception(f"ADK 서버 통신 오류: {str(e)}")
 
 
+def stream_adk_events(
+    message: str,
+    user_id: str = "u_demo",
+    session_id: Optional[str] = None,
+    app_name: str = "content_creator_agent",
+    should_stop: Optional[Callable[[], bool]] = None,
+    deadline: Optional[Deadline] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    ADK 서버의 /run_sse 엔드포인트로 요청하고 이벤트를 도착하는 대로 하나씩 반환합니다.
+
+    Args:
+        message: 사용자 메시지
+        user_id: 사용자 ID
+        session_id: 세션 ID (없으면 Streamlit 세션 ID 사용)
+        app_name: 앱 이름
+        should_stop: True 를 반환하면 스트림을 닫고 중단 (연결이 끊기면 서버 실행도 중단됨)
+        deadline: 요청 마감 시간 (넘기면 스트림을 닫고 DeadlineExceededError 발생)
+
+    Yields:
+        ADK 이벤트 (dict)
+    """
+    if not ADK_SERVER_URL:
+        raise ValueError("ADK_SERVER_URL이 설정되지 않았습니다. Streamlit secrets를 확인하세요.")
+
+    session_id = _resolve_session_id(session_id)
+    ensure_session(user_id, session_id, app_name)
+
+    payload = _run_payload(message, user_id, session_id, app_name, deadline)
+    # 모델 출력도 토큰 단위(partial 이벤트)로 받음
+    payload["streaming"] = True
+    headers = {"Accept": "text/event-stream"}
+
+    try:
+        # 스트림에서는 이벤트 사이 대기 시간이 남은 시간을 넘지 않도록 read 타임아웃을 줄임
+        read_timeout = resolve_timeout(deadline, ADK_READ_TIMEOUT, "ADK 실행")
+        r = _timed_request(
+            "POST",
+            "/run_sse",
+            read_timeout=read_timeout,
+            json=payload,
+            headers=headers,
+            stream=True,
+        )
+        if r.status_code == 404:
+            r.close()
+            forget_session(user_id, session_id, app_name)
+            ensure_session(user_id, session_id, app_name)
+            read_timeout = resolve_timeout(deadline, ADK_READ_TIMEOUT, "ADK 실행")
+            r = _timed_request(
+                "POST",
+                "/run_sse",
+                read_timeout=read_timeout,
+                json=payload,
+                headers=headers,
+                stream=True,
+            )
+        r.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"ADK 서버 통신 오류: {str(e)}")
+
+    with r:
+        data_lines: List[str] = []
+        try:
+            for line in r.iter_lines(decode_unicode=False):
+                if should_stop and should_stop():
+                    return
+                if deadline is not None:
+                    deadline.check("ADK 실행")
+                line = line.decode("utf-8") if isinstance(line, bytes) else line
+                if line.startswith("data:"):
+                    data_lines.append(line[5:].lstrip(" "))
+                    continue
+                if line or not data_lines:
+                    # event:/id:/주석(:) 줄은 사용하지 않음
+                    continue
+                # 빈 줄 = 이벤트 1개 끝
+                event = json.loads("\n".join(data_lines))
+                data_lines = []
+                if isinstance(event, dict) and "error" in event and "content" not in event:
+                    raise Exception(f"ADK 서버 실행 오류: {event['error']}")
+                yield event
+        except requests.exceptions.RequestException as e:
+            if deadline is not None and deadline.expired:
+                raise DeadlineExceededError("요청 마감 시간을 넘겼습니다 (ADK 실행).") from e
+            raise Exception(f"ADK 서버 스트림 오류: {str(e)}")
+        if data_lines:
+            yield json.loads("\n".join(data_lines))
+
+
+# ---------------------------------------------------------------------------
+# artifact 다운로드
+# ---------------------------------------------------------------------------
+
+def _safe_segment(value: str) -> str:
+    """경로 구성 요소로 안전한 문자열로 바꿉니다 (".", ".." 는 캐시 디렉토리를 벗어나므로 거부)."""
+    segment = re.sub(r"[^0-9A-Za-z._-]", "_", str(value)) or "_"
+    if segment in (".", ".."):
+        raise ValueError(f"경로에 쓸 수 없는 이름입니다: {value!r}")
+    return segment
+
+
+def artifact_cache_path(session_id: str, name: str, version: int, user_id: str = "u_demo") -> str:
+    """(세션, 이름, 버전) 에 해당하는 로컬 캐시 경로를 반환합니다."""
+    return os.path.join(
+        ADK_ARTIFACT_CACHE_DIR,
+        _safe_segment(user_id),
+        _safe_segment(session_id),
+        f"v{int(version)}",
+        *[_safe_segment(part) for part in name.split("/")],
+    )
+
+
+def clear_artifact_cache(session_id: str, user_id: str = "u_demo") -> None:
+    """세션의 artifact 캐시를 지웁니다 (세션이 새로 만들어져 버전 번호가 다시 시작될 때)."""
+    path = os.path.join(ADK_ARTIFACT_CACHE_DIR, _safe_segment(user_id), _safe_segment(session_id))
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def _decode_inline_data(data: str) -> bytes:
+    """ADK 가 돌려준 base64 (URL-safe 포함) 문자열을 디코딩합니다."""
+    data = data.replace("-", "+").replace("_", "/")
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+
+def download_artifact(
+    session_id: str,
+    name: str,
+    version: int,
+    user_id: str = "u_demo",
+    app_name: str = "content_creator_agent",
+    deadline: Optional[Deadline] = None,
+) -> str:
+    """
+    artifact 한 버전을 내려받아 로컬 캐시에 저장하고 경로를 반환합니다.
+    같은 (세션, 이름, 버전) 은 이미 받은 파일을 그대로 사용합니다 (artifact 버전은 바뀌지 않음,
+    세션이 새로 만들어지면 ensure_session 이 그 세션의 캐시를 지움).
+    deadline 이 있으면 응답 대기는 남은 시간까지만 합니다.
+    """
+    path = artifact_cache_path(session_id, name, version, user_id)
+    if os.path.exists(path):
+        return path
+
+    r = _timed_request(
+        "GET",
+        f"/apps/{app_name}/users/{user_id}/sessions/{session_id}/artifacts/{name}/versions/{int(version)}",
+        read_timeout=resolve_timeout(deadline, 60, "artifact 다운로드"),
+    )
+    r.raise_for_status()
+    part = r.json() or {}
+    inline_data = part.get("inlineData") or part.get("inline_data") or {}
+    if "data" not in inline_data:
+        raise ValueError(f"artifact 에 바이너리 데이터가 없습니다: {name}")
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(_decode_inline_data(inline_data["data"]))
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_json_artifact(
+    session_id: str,
+    name: str,
+    version: int,
+    user_id: str = "u_demo",
+    app_name: str = "content_creator_agent",
+    deadline: Optional[Deadline] = None,
+) -> Any:
+    """JSON artifact(content.json, image_result.json 등)를 내려받아 파싱합니다."""
+    path = download_artifact(session_id, name, version, user_id, app_name, deadline)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def list_run_artifacts(
+    session_id: str,
+    invocation_ids: Iterable[str],
+    user_id: str = "u_demo",
+    app_name: str = "content_creator_agent",
+) -> Dict[str, int]:
+    """
+    이벤트에서 artifact 정보를 얻지 못했을 때, 서버에 저장된 세션 이벤트 중 이번 실행(invocation)의
+    artifactDelta 만 모아 이름별 최신 버전을 반환합니다 (같은 세션의 이전 실행 artifact 는 제외).
+    """
+    invocation_ids = set(invocation_ids)
+    session_path = f"/apps/{app_name}/users/{user_id}/sessions/{session_id}"
+    r = _timed_request("GET", session_path, read_timeout=30)
+    r.raise_for_status()
+    artifacts: Dict[str, int] = {}
+    for event in (r.json() or {}).get("events") or []:
+        if event.get("invocationId", event.get("invocation_id")) not in invocation_ids:
+            continue
+        actions = event.get("actions") or {}
+        delta = actions.get("artifactDelta") or actions.get("artifact_delta") or {}
+        for name, version in delta.items():
+            artifacts[name] = max(version, artifacts.get(name, -1))
+    return artifacts
+
+
+def fetch_result_images(
+    artifacts: Dict[str, int],
+    session_id: str,
+    user_id: str = "u_demo",
+    app_name: str = "content_creator_agent",
+    order: Optional[List[str]] = None,
+    deadline: Optional[Deadline] = None,
+) -> Dict[str, Any]:
+    """
+    이미지 artifact 와 미리보기 렌디션을 동시에 내려받습니다 (풀 세션 공유).
+
+    Args:
+        artifacts: {artifact 이름: 버전}
+        session_id: 세션 ID
+        user_id: 사용자 ID
+        app_name: 앱 이름
+        order: 결과 이미지 순서 (없으면 이름순)
+        deadline: 요청 마감 시간 (선택사항)
+
+    Returns:
+        {"images": 이미지 경로 리스트, "previews": {이미지 경로: 미리보기 경로}, "errors": [...]}
+    """
+    names = [name for name in artifacts if name.lower().endswith(_IMAGE_EXTENSIONS)]
+    image_names = [name for name in names if not name.endswith(_PREVIEW_SUFFIX)]
+    if order:
+        rank = {name: idx for idx, name in enumerate(order)}
+        image_names.sort(key=lambda name: (rank.get(name, len(rank)), name))
+    else:
+        image_names.sort()
+
+    def fetch(name: str) -> str:
+        return download_artifact(session_id, name, artifacts[name], user_id, app_name, deadline)
+
+    paths: Dict[str, str] = {}
+    errors = []
+    with ThreadPoolExecutor(
+        max_workers=ADK_ARTIFACT_WORKERS, thread_name_prefix="adk-artifact"
+    ) as pool:
+        futures = {name: pool.submit(fetch, name) for name in names}
+        for name, future in futures.items():
+            try:
+                paths[name] = future.result()
+            except Exception as e:
+                errors.append({"filename": name, "error": str(e)})
+
+    images = [paths[name] for name in image_names if name in paths]
+    previews = {}
+    for name in image_names:
+        preview_name = f"{os.path.splitext(name)[0]}{_PREVIEW_SUFFIX}"
+        if name in paths and preview_name in paths:
+            previews[paths[name]] = paths[preview_name]
+    return {"images": images, "previews": previews, "errors": errors}
+
+
+def stream_content_via_adk(
+    topic: str,
+    content_format: str,
+    reference_files: Optional[list] = None,
+    session_id: Optional[str] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+    deadline: Optional[Deadline] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    ADK 에이전트를 통해 콘텐츠를 생성하면서 이벤트마다 중간 결과를 반환합니다.
+    마지막으로 반환되는 결과는 partial=False 인 최종 결과입니다.
+
+    Args:
+        topic: 콘텐츠 주제
+        content_format: 콘텐츠 형식 (카드뉴스/뉴스레터/인포그래픽)
+        reference_files: 참고자료 파일 경로 리스트 (선택사항)
+        session_id: 세션 ID (없으면 Streamlit 세션 ID 사용, 백그라운드 스레드에서는 필수)
+        should_stop: True 를 반환하면 스트림을 중단
+        deadline: 요청 마감 시간 (서버 세션 state 로 전달되어 서버 도구들도 남은 시간만 사용)
+
+    Yields:
+        중간/최종 결과 (create_content 결과 형식)
+    """
+    session_id = _resolve_session_id(session_id)
+    accumulator = ContentEventAccumulator(topic, content_format)
+    message = build_content_message(topic, content_format, reference_files)
+    for event in stream_adk_events(
+        message, session_id=session_id, should_stop=should_stop, deadline=deadline
+    ):
+        accumulator.feed(event)
+        yield accumulator.snapshot()
+    if should_stop and should_stop():
+        return
+
+    # 생성된 이미지 artifact 를 동시에 내려받음
+    # (이벤트에 없으면 서버의 세션 이벤트에서 이번 실행 것만 조회)
+    artifacts = accumulator.artifacts
+    if not artifacts and accumulator.invocation_ids:
+        try:
+            artifacts = list_run_artifacts(session_id, accumulator.invocation_ids)
+        except Exception:
+            artifacts = {}
+
+    # state 와 도구 응답에는 핸들/요약만 있으므로 콘텐츠 본문과 이미지별 결과는 artifact 에서 읽음
+    if not accumulator.raw_content and CONTENT_ARTIFACT_NAME in artifacts:
+        handle = accumulator.content_handle or {}
+        version = handle.get("version", artifacts[CONTENT_ARTIFACT_NAME])
+        payload = load_json_artifact(session_id, CONTENT_ARTIFACT_NAME, version, deadline=deadline)
+        accumulator._apply_content(content_from_payload(payload))
+    if accumulator.image_result is None and IMAGE_RESULT_ARTIFACT_NAME in artifacts:
+        try:
+            accumulator.image_result = load_json_artifact(
+                session_id,
+                IMAGE_RESULT_ARTIFACT_NAME,
+                artifacts[IMAGE_RESULT_ARTIFACT_NAME],
+                deadline=deadline,
+            )
+        except Exception:
+            # 이미지 순서/플레이스홀더 정보가 없어도 이미지는 이름순으로 표시
+            pass
+
+    result = accumulator.snapshot(done=True)
+    result["session_id"] = session_id
+
+    if artifacts:
+        image_result = accumulator.image_result or {}
+        order = [
+            info.get("filename")
+            for info in image_result.get("generated_images", [])
+            if info.get("filename")
+        ]
+        fetched = fetch_result_images(artifacts, session_id, order=order, deadline=deadline)
+        result["images"] = fetched["images"]
+        result["previews"] = fetched["previews"]
+        result["artifacts"] = dict(artifacts)
+        if fetched["errors"]:
+            result["image_errors"] = fetched["errors"]
+    yield result
+
+
 def create_content_via_adk(
     topic: str,
     content_format: str,
-    reference_files: Optional[list] = None
+    reference_files: Optional[list] = None,
+    session_id: Optional[str] = None,
+    deadline: Optional[Deadline] = None,
 ) -> Dict[str, Any]:
     """
     ADK 에이전트를 통해 콘텐츠를 생성합니다.
+    /run_sse 스트림을 끝까지 받아 구조화된 결과를 재구성합니다.
     
     Args:
         topic: 콘텐츠 주제
         content_format: 콘텐츠 형식 (카드뉴스/뉴스레터/인포그래픽)
         reference_files: 참고자료 파일 경로 리스트 (선택사항)
+        session_id: 세션 ID (없으면 Streamlit 세션 ID 사용, 백그라운드 스레드에서는 필수)
+        deadline: 요청 마감 시간 (선택사항)
         
     Returns:
         생성된 콘텐츠
     """
-    # 메시지 구성
-    message_parts = [
-        f"콘텐츠 주제: {topic}",
-        f"콘텐츠 형식: {content_format}",
-        "",
-        "위 주제와 형식에 맞는 콘텐츠를 생성해주세요."
-    ]
-    
-    if reference_files:
-        file_info = "\n".join([f"- {f}" for f in reference_files])
-        message_parts.insert(2, f"참고자료 파일:\n{file_info}")
-    
-    message = "\n".join(message_parts)
-    
-    # ADK 에이전트 호출
     try:
-        response = call_adk_agent(message)
-        
-        # 응답 파싱 (ADK 응답 형식에 맞게 조정 필요)
-        # ADK 응답 구조에 따라 파싱 로직 추가 필요
-        return {
-            "topic": topic,
-            "format": content_format,
-            "raw_content": response,
-            "formatted_content": str(response),  # 임시: 실제 응답 구조에 맞게 수정 필요
-            "status": "success"
-        }
+        result = None
+        for result in stream_content_via_adk(
+            topic, content_format, reference_files, session_id, deadline=deadline
+        ):
+            pass
+        return result
     except Exception as e:
         return {
             "topic": topic,
@@ -146,4 +696,3 @@ def create_content_via_adk(
             "error": str(e),
             "status": "error"
         }
-
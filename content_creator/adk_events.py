@@ -0,0 +1,149 @@
+"""
+ADK 이벤트 스트림 해석
+동기 클라이언트(adk_client.py)와 비동기 클라이언트(adk_async_client.py)가 같이 쓰는
+요청 메시지 구성과 이벤트 누적기입니다.
+에이전트 정의(agent.py)나 HTTP 라이브러리에 의존하지 않습니다.
+"""
+from typing import Any, Dict, List, Optional, Set
+
+from .content_store import CONTENT_STATE_KEY
+
+
+def build_content_message(topic: str, content_format: str, reference_files: Optional[list]) -> str:
+    """콘텐츠 생성 요청 메시지를 구성합니다."""
+    message_parts = [
+        f"콘텐츠 주제: {topic}",
+        f"콘텐츠 형식: {content_format}",
+        "",
+        "위 주제와 형식에 맞는 콘텐츠를 생성해주세요."
+    ]
+
+    if reference_files:
+        file_info = "\n".join([f"- {f}" for f in reference_files])
+        message_parts.insert(2, f"참고자료 파일:\n{file_info}")
+
+    return "\n".join(message_parts)
+
+
+# 텍스트 생성 단계 도구 / 이미지 생성 단계 도구 (진행 단계 표시용)
+_TEXT_TOOLS = {"create_card_news", "create_newsletter", "create_infographic", "revise_section",
+               "card_news_agent", "newsletter_agent", "infographic_agent"}
+_IMAGE_TOOLS = {"image_builder_agent", "generate_images"}
+
+
+class ContentEventAccumulator:
+    """
+    ADK 이벤트 스트림을 순서대로 받아 콘텐츠 결과(raw_content / formatted_content)를 재구성합니다.
+
+    - state 변경(stateDelta)의 content_creator_output 을 가장 신뢰하는 결과로 사용합니다.
+      state 에 핸들만 있으면 본문은 스트림이 끝난 뒤 content.json artifact 에서 읽습니다.
+    - 도구 응답(functionResponse)에 raw_content 가 있으면 그것도 반영합니다.
+    - 구조화된 결과가 없으면 에이전트의 텍스트 응답을 formatted_content 로 사용합니다.
+    - 저장된 artifact 이름과 버전(artifactDelta)을 모아 둡니다.
+    """
+
+    def __init__(self, topic: str, content_format: str):
+        self.topic = topic
+        self.content_format = content_format
+        self.raw_content: Optional[Dict[str, Any]] = None
+        self.formatted_content = ""
+        self.agent_text: List[str] = []
+        self._partial_text = ""
+        self.tool_calls: List[Dict[str, Any]] = []
+        self.artifacts: Dict[str, int] = {}
+        self.image_result: Optional[Dict[str, Any]] = None
+        self.content_handle: Optional[Dict[str, Any]] = None
+        self.generation: Optional[Dict[str, Any]] = None
+        self.stage = "text"
+        self.events = 0
+        self.invocation_ids: Set[str] = set()
+
+    def _apply_content(self, content: Dict[str, Any]) -> None:
+        if not isinstance(content, dict) or not isinstance(content.get("raw_content"), dict):
+            return
+        self.raw_content = content["raw_content"]
+        self.formatted_content = content.get("formatted_content") or self.formatted_content
+        self.content_format = content.get("format") or self.content_format
+        if isinstance(content.get("generation"), dict):
+            self.generation = content["generation"]
+
+    def feed(self, event: Dict[str, Any]) -> None:
+        """이벤트 1개를 반영합니다."""
+        self.events += 1
+        invocation_id = event.get("invocationId") or event.get("invocation_id")
+        if invocation_id:
+            self.invocation_ids.add(invocation_id)
+        actions = event.get("actions") or {}
+
+        state_delta = actions.get("stateDelta") or actions.get("state_delta") or {}
+        if CONTENT_STATE_KEY in state_delta:
+            content = state_delta[CONTENT_STATE_KEY]
+            if isinstance(content, dict) and "raw_content" not in content:
+                self.content_handle = content
+                self.content_format = content.get("format") or self.content_format
+            else:
+                self._apply_content(content)
+
+        artifact_delta = actions.get("artifactDelta") or actions.get("artifact_delta") or {}
+        for name, version in artifact_delta.items():
+            self.artifacts[name] = version
+
+        parts = ((event.get("content") or {}).get("parts")) or []
+        for part in parts:
+            call = part.get("functionCall") or part.get("function_call")
+            if call:
+                name = call.get("name", "")
+                self.tool_calls.append({"name": name, "status": "running"})
+                if name in _IMAGE_TOOLS:
+                    self.stage = "images"
+                elif name in _TEXT_TOOLS:
+                    self.stage = "text"
+                continue
+
+            response = part.get("functionResponse") or part.get("function_response")
+            if response:
+                name = response.get("name", "")
+                for call in reversed(self.tool_calls):
+                    if call["name"] == name and call["status"] == "running":
+                        call["status"] = "done"
+                        break
+                payload = response.get("response") or {}
+                self._apply_content(payload)
+                # 콘텐츠 요약에는 부분 복구/실패 내역만 들어 있음
+                if isinstance(payload.get("generation"), dict):
+                    self.generation = payload["generation"]
+                if isinstance(payload.get("generated_images"), list):
+                    self.image_result = payload
+                continue
+
+            text = part.get("text")
+            if text and not part.get("thought"):
+                if event.get("partial"):
+                    # 토큰 단위 조각은 최종 이벤트가 오기 전까지 미리보기로만 사용
+                    self._partial_text += text
+                else:
+                    self._partial_text = ""
+                    self.agent_text.append(text)
+
+    def snapshot(self, done: bool = False) -> Dict[str, Any]:
+        """현재까지 재구성된 결과를 create_content 결과 형식으로 반환합니다."""
+        agent_message = "\n\n".join(
+            self.agent_text + ([self._partial_text] if self._partial_text else [])
+        )
+        snapshot = {
+            "topic": self.topic,
+            "format": self.content_format,
+            "raw_content": self.raw_content or {},
+            "formatted_content": self.formatted_content or agent_message,
+            "agent_message": agent_message,
+            "tool_calls": list(self.tool_calls),
+            "artifacts": dict(self.artifacts),
+            "image_result": self.image_result,
+            "images": [],
+            "stage": self.stage,
+            "partial": not done,
+            "status": "success" if done else "running",
+        }
+        if self.generation:
+            snapshot["generation"] = self.generation
+        return snapshot
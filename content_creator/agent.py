@@ -4,21 +4,44 @@ Google ADK를 사용한 멀티 에이전트 콘텐츠 제작 시스템
 """
 import os
 import json
+import asyncio
+import base64
+import hashlib
+import logging
 import tempfile
 import requests
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 from google.adk.agents.llm_agent import Agent
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 import pdfplumber
 import pandas as pd
 from PIL import Image
 
+from .deadline import Deadline, DeadlineExceededError, resolve_timeout
+from .flight_recorder import record_openai_client
+from .formatting import render_content
+from .ledger import (
+    BudgetExceededError,
+    get_cost_ledger,
+    model_budget_callbacks,
+    request_scope,
+    start_request_callback,
+)
+from .openai_clients import close_async_openai_client, get_async_openai_client
 from .prompt import get_agent_instruction
+from .tracing import record_error, record_usage, set_attributes, setup_tracing, start_span
+
+logger = logging.getLogger(__name__)
 
 # 환경 변수 로드 (.env 파일에서)
 load_dotenv()
 
+# CONTENT_TRACE_EXPORTER 가 설정되어 있으면 단계별 span 을 JSONL/콘솔로 내보냄
+setup_tracing()
+
 # API 키 확인 (OpenAI 전용)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
@@ -28,11 +51,33 @@ else:
     try:
         from openai import OpenAI
         # 싱글턴 클라이언트 생성 (모듈 로드 시 1번만)
-        OPENAI_CLIENT = OpenAI(api_key=OPENAI_API_KEY)
+        # flight_recording 블록 안에서는 호출을 기록/재생
+        OPENAI_CLIENT = record_openai_client(OpenAI(api_key=OPENAI_API_KEY))
     except ImportError:
         OPENAI_CLIENT = None
 
 
+# 이미지 다운로드용 HTTP 세션 (커넥션 풀 재사용)
+IMAGE_DOWNLOAD_POOL_SIZE = 8
+IMAGE_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+_HTTP_SESSION = None
+
+
+def get_http_session() -> requests.Session:
+    """keep-alive 커넥션 풀을 가진 공용 HTTP 세션을 가져옵니다."""
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=IMAGE_DOWNLOAD_POOL_SIZE,
+            pool_maxsize=IMAGE_DOWNLOAD_POOL_SIZE,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _HTTP_SESSION = session
+    return _HTTP_SESSION
+
+
 # Pydantic 모델 정의 (JSON 스키마 강제)
 class ContentSection(BaseModel):
     title: str
@@ -122,98 +167,42 @@ def process_csv(file_path: str) -> Dict[str, Any]:
 
 def process_file(file_path: str) -> Dict[str, Any]:
     """파일 확장자를 기반으로 적절한 처리 함수를 호출합니다."""
-    if not os.path.exists(file_path):
-        return {"error": f"파일을 찾을 수 없습니다: {file_path}", "status": "error"}
-    
     file_ext = os.path.splitext(file_path)[1].lower()
-    if file_ext == '.pdf':
-        return process_pdf(file_path)
-    elif file_ext in ['.png', '.jpg', '.jpeg', '.gif', '.bmp']:
-        return process_image(file_path)
-    elif file_ext in ['.xlsx', '.xls']:
-        return process_excel(file_path)
-    elif file_ext == '.csv':
-        return process_csv(file_path)
-    else:
-        return {"error": f"지원하지 않는 파일 형식입니다: {file_ext}", "status": "error"}
+    with start_span("process_file", file__extension=file_ext) as span:
+        if not os.path.exists(file_path):
+            result = {"error": f"파일을 찾을 수 없습니다: {file_path}", "status": "error"}
+        elif file_ext == '.pdf':
+            result = process_pdf(file_path)
+        elif file_ext in ['.png', '.jpg', '.jpeg', '.gif', '.bmp']:
+            result = process_image(file_path)
+        elif file_ext in ['.xlsx', '.xls']:
+            result = process_excel(file_path)
+        elif file_ext == '.csv':
+            result = process_csv(file_path)
+        else:
+            result = {"error": f"지원하지 않는 파일 형식입니다: {file_ext}", "status": "error"}
+        set_attributes(
+            span,
+            file__size=os.path.getsize(file_path) if os.path.exists(file_path) else None,
+            status=result.get("status"),
+        )
+        return result
 
 
-# 콘텐츠 포맷팅 함수들
+# 콘텐츠 포맷팅 함수들 (렌더링은 formatting 모듈의 컴파일된 템플릿이 담당)
 def format_card_news(content_data: Dict[str, Any]) -> str:
     """카드뉴스 형식으로 포맷팅합니다."""
-    title = content_data.get("title", "제목 없음")
-    sections = content_data.get("sections", [])
-    key_points = content_data.get("key_points", [])
-    
-    formatted = f"\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n📌 카드뉴스: {title}\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
-    
-    if key_points:
-        formatted += "🔑 핵심 포인트\n\n"
-        for i, point in enumerate(key_points[:5], 1):
-            formatted += f"{i}. {point}\n"
-        formatted += "\n"
-    
-    for i, section in enumerate(sections, 1):
-        section_title = section.get("title", f"섹션 {i}")
-        section_content = section.get("content", "")
-        formatted += f"\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n카드 {i}: {section_title}\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n\n{section_content}\n\n"
-    
-    formatted += "\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-    return formatted
+    return render_content(content_data, "카드뉴스")
 
 
 def format_newsletter(content_data: Dict[str, Any]) -> str:
     """뉴스레터 형식으로 포맷팅합니다."""
-    title = content_data.get("title", "뉴스레터 제목")
-    introduction = content_data.get("introduction", "")
-    sections = content_data.get("sections", [])
-    conclusion = content_data.get("conclusion", "")
-    
-    formatted = f"\n╔════════════════════════════════════════╗\n║          {title:^30}          ║\n╚════════════════════════════════════════╝\n\n"
-    
-    if introduction:
-        formatted += f"📬 인사말\n\n{introduction}\n\n"
-    
-    for section in sections:
-        section_title = section.get("title", "")
-        section_content = section.get("content", "")
-        formatted += f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n📰 {section_title}\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n\n{section_content}\n\n"
-    
-    if conclusion:
-        formatted += f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n💭 마무리\n\n{conclusion}\n\n"
-    
-    formatted += "\n" + "="*50 + "\n이 뉴스레터가 유용하셨나요? 피드백을 남겨주세요!\n"
-    return formatted
+    return render_content(content_data, "뉴스레터")
 
 
 def format_infographic(content_data: Dict[str, Any]) -> str:
     """인포그래픽 형식으로 포맷팅합니다."""
-    title = content_data.get("title", "인포그래픽 제목")
-    stats = content_data.get("statistics", [])
-    sections = content_data.get("sections", [])
-    visual_elements = content_data.get("visual_elements", [])
-    
-    formatted = f"\n┏━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━┓\n┃                                          ┃\n┃        📊 {title:^30}        ┃\n┃                                          ┃\n┗━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━┛\n\n"
-    
-    if stats:
-        formatted += "📈 주요 통계\n\n"
-        for stat in stats:
-            formatted += f"  • {stat.get('label', '')}: {stat.get('value', '')}\n"
-        formatted += "\n"
-    
-    if visual_elements:
-        formatted += "🎨 시각적 요소\n\n"
-        for element in visual_elements:
-            formatted += f"  [{element.get('type', '')}] {element.get('description', '')}\n"
-        formatted += "\n"
-    
-    for i, section in enumerate(sections, 1):
-        section_title = section.get("title", f"섹션 {i}")
-        section_content = section.get("content", "")
-        formatted += f"\n┌──────────────────────────────────────────┐\n│ {i}. {section_title:<35} │\n├──────────────────────────────────────────┤\n│                                          │\n│ {section_content[:200]:<40} │\n│                                          │\n└──────────────────────────────────────────┘\n\n"
-    
-    formatted += "\n" + "━"*50 + "\n💡 인포그래픽은 시각적 요소와 함께 보시면 더 효과적입니다.\n"
-    return formatted
+    return render_content(content_data, "인포그래픽")
 
 
 def process_reference_file(file_path: str) -> dict:
@@ -338,11 +327,121 @@ def format_content_output(content_data: dict, content_format: str) -> str:
         return format_newsletter(content_data)  # 기본값
 
 
+def _write_atomically(output_path: str, chunks, verify=None) -> str:
+    """
+    청크를 임시 파일에 쓰면서 SHA-256 을 계산하고, 완료되면 최종 경로로 교체합니다.
+    verify 가 주어지면 교체 직전에 호출하며, 예외가 나면 기존 파일은 그대로 둡니다.
+
+    Returns:
+        기록한 데이터의 SHA-256 hex digest
+    """
+    output_dir = os.path.dirname(output_path) or "."
+    os.makedirs(output_dir, exist_ok=True)
+
+    sha256 = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=output_dir, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                if chunk:
+                    sha256.update(chunk)
+                    f.write(chunk)
+        if verify is not None:
+            verify()
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return sha256.hexdigest()
+
+
+def download_image(image_url: str, output_path: str, timeout: float = 30) -> Dict[str, Any]:
+    """
+    이미지 URL 을 공용 세션으로 스트리밍 다운로드하여 저장합니다.
+    본문 전체를 메모리에 올리지 않고 청크 단위로 디스크에 기록하며,
+    Content-Length 와 Content-MD5 헤더가 있으면 받은 데이터와 대조합니다
+    (Content-Encoding 으로 압축된 응답은 헤더가 압축된 본문 기준이라 대조하지 않음).
+
+    Args:
+        image_url: 이미지 URL
+        output_path: 저장 경로
+        timeout: 연결/읽기 타임아웃 (초)
+
+    Returns:
+        저장 경로, 크기, SHA-256 을 담은 딕셔너리
+
+    Raises:
+        IOError: 받은 데이터가 헤더의 길이/체크섬과 다를 때
+    """
+    session = get_http_session()
+    with session.get(image_url, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        expected_length = response.headers.get("Content-Length")
+        expected_md5 = response.headers.get("Content-MD5")
+        if response.headers.get("Content-Encoding", "identity").lower() not in ("", "identity"):
+            # iter_content 는 압축을 푼 바이트를 주므로
+            # 압축된 본문 기준의 길이/체크섬과 비교할 수 없음
+            expected_length = expected_md5 = None
+
+        md5 = hashlib.md5()
+        size = 0
+
+        def chunks():
+            nonlocal size
+            for chunk in response.iter_content(chunk_size=IMAGE_DOWNLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                md5.update(chunk)
+                yield chunk
+
+        def verify():
+            if expected_length is not None and int(expected_length) != size:
+                raise IOError(f"다운로드 크기 불일치: {size} / {expected_length} bytes")
+            if expected_md5 and base64.b64encode(md5.digest()).decode() != expected_md5:
+                raise IOError("다운로드 체크섬(Content-MD5) 불일치")
+
+        digest = _write_atomically(output_path, chunks(), verify)
+
+    return {"path": output_path, "size": size, "sha256": digest}
+
+
+def download_images(
+    downloads: List[Tuple[str, str]],
+    max_workers: int = 4,
+    timeout: float = 30,
+) -> List[Optional[str]]:
+    """
+    여러 이미지 URL 을 공용 커넥션 풀로 동시에 다운로드합니다.
+
+    Args:
+        downloads: (이미지 URL, 저장 경로) 리스트
+        max_workers: 동시 다운로드 수
+        timeout: 요청별 타임아웃 (초)
+
+    Returns:
+        입력 순서대로 저장된 파일 경로 리스트 (실패한 항목은 None)
+    """
+    def _download(item: Tuple[str, str]) -> Optional[str]:
+        image_url, output_path = item
+        try:
+            return download_image(image_url, output_path, timeout=timeout)["path"]
+        except Exception as e:
+            logger.warning("이미지 다운로드 오류: %s", e)
+            return None
+
+    if not downloads:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(downloads))) as executor:
+        return list(executor.map(_download, downloads))
+
+
 def generate_image_with_dalle(
     prompt: str,
     output_path: str,
     size: str = "1024x1024",
-    quality: str = "standard"
+    quality: str = "standard",
+    response_format: str = "url",
+    deadline: Optional[Deadline] = None,
 ) -> Optional[str]:
     """
     DALL-E를 사용하여 이미지를 생성하고 저장합니다.
@@ -352,6 +451,9 @@ def generate_image_with_dalle(
         output_path: 이미지 저장 경로
         size: 이미지 크기 ("1024x1024", "1024x1792", "1792x1024")
         quality: 이미지 품질 ("standard", "hd")
+        response_format: "url" (URL 을 받아 스트리밍 다운로드) 또는
+            "b64_json" (응답에 이미지를 포함해 두 번째 요청 생략)
+        deadline: 요청 마감 시간 (생성/다운로드가 남은 시간만큼만 기다림)
         
     Returns:
         생성된 이미지 파일 경로 (실패 시 None)
@@ -360,95 +462,99 @@ def generate_image_with_dalle(
         return None
     
     try:
-        # DALL-E 3로 이미지 생성
-        response = OPENAI_CLIENT.images.generate(
-            model="dall-e-3",
-            prompt=prompt,
-            size=size,
-            quality=quality,
-            n=1,
-        )
-        
-        # 이미지 다운로드 및 저장
-        image_url = response.data[0].url
-        img_response = requests.get(image_url, timeout=30)
-        img_response.raise_for_status()
-        
-        # 디렉토리 생성
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        # DALL-E 3로 이미지 생성 (예산을 넘기면 BudgetExceededError 로 실패 처리)
+        request = {"model": "dall-e-3", "size": size, "quality": quality, "n": 1}
+        ledger = get_cost_ledger()
+        # 예산 확인과 기록이 같은 요청 ID 로 남도록 범위를 엶 (바깥 범위가 있으면 그대로 따름)
+        with request_scope():
+            ledger.check_budget(ledger.estimate_image(request), stage="이미지 생성")
+            response = OPENAI_CLIENT.images.generate(
+                prompt=prompt,
+                response_format=response_format,
+                timeout=resolve_timeout(deadline, 120, "이미지 생성"),
+                **request,
+            )
+            ledger.charge_image(request)
         
-        # 파일 저장
-        with open(output_path, "wb") as f:
-            f.write(img_response.content)
+        if response_format == "b64_json":
+            # 응답에 포함된 이미지를 바로 저장
+            image_bytes = base64.b64decode(response.data[0].b64_json)
+            _write_atomically(output_path, [image_bytes])
+            return output_path
         
-        return output_path
+        # 이미지 다운로드 및 저장 (스트리밍 + 체크섬 검증)
+        return download_image(
+            response.data[0].url,
+            output_path,
+            timeout=resolve_timeout(deadline, 30, "이미지 다운로드"),
+        )["path"]
         
     except Exception as e:
-        print(f"이미지 생성 오류: {e}")
+        logger.warning("이미지 생성 오류: %s", e)
         return None
 
 
-def create_content_base(topic: str, content_format: str, reference_files: Optional[List[str]] = None) -> dict:
-    """
-    기본 콘텐츠 제작 프로세스를 실행합니다 (텍스트만 생성).
-    서브 에이전트에서 사용하는 공통 함수입니다.
-    
-    Args:
-        topic: 콘텐츠 주제
-        content_format: 콘텐츠 형식
-        reference_files: 참고자료 파일 경로 리스트 (선택사항)
-        
-    Returns:
-        생성된 콘텐츠 정보 (텍스트만)
-    """
-    # 1. 파일 처리 (있는 경우)
-    reference_info = None
-    if reference_files:
-        file_summaries = []
-        for file_path in reference_files:
-            file_info = process_reference_file(file_path)
-            if file_info.get("status") == "success":
-                file_summaries.append(json.dumps(file_info, ensure_ascii=False))
-        
-        if file_summaries:
-            reference_info = "\n\n".join(file_summaries)
-    
-    # 2. 콘텐츠 구조 기획
-    plan = plan_content_structure(topic, content_format, reference_info)
-    
-    # 3. LLM을 사용하여 실제 콘텐츠 생성 (OpenAI 전용)
-    if OPENAI_CLIENT:
-        try:
-            # 형식별 프롬프트 구성
-            if content_format == "카드뉴스":
-                format_guide = """
+# 형식별 작성 가이드 (전체 생성과 섹션 재생성에서 공통으로 사용)
+FORMAT_GUIDES = {
+    "카드뉴스": """
 카드뉴스 형식으로 작성해주세요:
 - 각 카드는 핵심 메시지 하나에 집중
 - 간결하고 명확한 문장 (2-3문장)
 - 시각적 요소 제안 포함
 - 보통 5-10개의 카드로 구성
-"""
-            elif content_format == "뉴스레터":
-                format_guide = """
+""",
+    "뉴스레터": """
 뉴스레터 형식으로 작성해주세요:
 - 전문적이고 깊이 있는 내용
 - 각 섹션은 5-10문장으로 구성
 - 독자와의 연결감을 주는 톤앤매너
 - 명확한 섹션 구분
-"""
-            elif content_format == "인포그래픽":
-                format_guide = """
+""",
+    "인포그래픽": """
 인포그래픽 형식으로 작성해주세요:
 - 통계, 숫자, 비교 데이터 강조
 - 시각화 타입 제안 (막대 그래프, 원형 차트 등)
 - 간결하고 명확한 정보 전달
 - 비교/대조 요소 포함
-"""
-            else:
-                format_guide = ""
-            
-            # 프롬프트 구성
-            prompt = f"""당신은 전문 콘텐츠 작가입니다. 다음 주제와 형식에 맞는 콘텐츠를 생성해주세요.
+""",
+}
+
+
+def _collect_reference_info(reference_files: Optional[List[str]]) -> Optional[str]:
+    """참고자료 파일들을 처리해 프롬프트에 넣을 요약 문자열을 만듭니다."""
+    if not reference_files:
+        return None
+    file_summaries = []
+    for file_path in reference_files:
+        file_info = process_reference_file(file_path)
+        if file_info.get("status") == "success":
+            file_summaries.append(json.dumps(file_info, ensure_ascii=False))
+    return "\n\n".join(file_summaries) if file_summaries else None
+
+
+# 텍스트 생성/재생성/부분 복구에서 공통으로 쓰는 system 메시지
+WRITER_SYSTEM_PROMPT = (
+    "당신은 전문 콘텐츠 작가입니다. 주어진 주제와 형식에 맞는 고품질 콘텐츠를 생성합니다."
+)
+
+
+def _writer_messages(prompt: str) -> List[Dict[str, str]]:
+    """작가 system 메시지와 user 프롬프트로 LLM 메시지를 만듭니다."""
+    return [
+        {"role": "system", "content": WRITER_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _build_content_messages(
+    topic: str, content_format: str, reference_info: Optional[str]
+) -> List[Dict[str, str]]:
+    """콘텐츠 생성용 LLM 메시지를 구성합니다."""
+    # 형식별 프롬프트 구성
+    format_guide = FORMAT_GUIDES.get(content_format, "")
+
+    # 프롬프트 구성
+    prompt = f"""당신은 전문 콘텐츠 작가입니다. 다음 주제와 형식에 맞는 콘텐츠를 생성해주세요.
 
 주제: {topic}
 콘텐츠 형식: {content_format}
@@ -458,61 +564,735 @@ def create_content_base(topic: str, content_format: str, reference_files: Option
 {reference_info if reference_info else "참고자료 없음"}
 
 각 섹션의 content는 최소 200자 이상으로 구체적이고 전문적으로 작성해주세요."""
-            
-            # OpenAI JSON mode 사용 (response_format="json_object" + 스키마)
+
+    return _writer_messages(prompt)
+
+
+def _merge_generated_content(plan: dict, generated: dict, content_format: str) -> None:
+    """LLM 이 생성한 내용을 기획(plan)에 병합합니다."""
+    plan.update({
+        "title": generated.get("title", plan.get("title", "")),
+        "introduction": generated.get("introduction", plan.get("introduction", "")),
+        "sections": [
+            {
+                "title": section.get("title", ""),
+                "content": section.get("content", ""),
+                "key_points": section.get("key_points", [])
+            }
+            for section in generated.get("sections", [])
+        ],
+        "key_points": generated.get("key_points", plan.get("key_points", [])),
+        "conclusion": generated.get("conclusion", plan.get("conclusion", ""))
+    })
+
+    # 인포그래픽의 경우 추가 필드
+    if content_format == "인포그래픽":
+        plan["statistics"] = generated.get("statistics", [])
+        plan["visual_elements"] = generated.get("visual_elements", [])
+
+
+# 구조화 생성 검증 기준: 섹션 본문이 이보다 짧으면 비었거나 잘린 것으로 보고 그 섹션만 다시 요청
+SECTION_MIN_CHARS = 50
+
+# 쓸 수 있는 섹션이 하나도 없을 때만 하는 전체 재요청 횟수 (최후 수단)
+CONTENT_FULL_RETRIES = max(0, int(os.getenv("CONTENT_FULL_RETRIES", "1")))
+
+# 섹션 부분 복구 요청 동시 실행 수
+CONTENT_REPAIR_CONCURRENCY = 4
+
+# 부분 복구 프롬프트에 쓰는 최상위 필드 이름
+_FIELD_LABELS = {
+    "title": "제목",
+    "introduction": "도입부",
+    "key_points": "핵심 포인트 목록",
+    "conclusion": "결론",
+    "statistics": "주요 통계 (label/value 목록)",
+}
+
+
+class StatisticItem(BaseModel):
+    label: str
+    value: str
+
+
+# 부분 복구 요청 스키마의 필드 타입 (statistics 는 인포그래픽 차트가 쓰므로 복구할 때는 필수)
+_REPAIR_FIELD_TYPES = {
+    "title": str,
+    "introduction": str,
+    "key_points": List[str],
+    "conclusion": str,
+    "statistics": List[StatisticItem],
+}
+
+
+def _load_partial_json(text: str) -> Optional[dict]:
+    """
+    잘린 JSON 문자열에서 완성된 부분만 읽습니다.
+    열린 문자열/괄호를 닫아 보고, 안 되면 뒤에서부터 쉼표 앞까지 잘라 가며 다시 시도합니다.
+    """
+    if not text:
+        return None
+    stack: List[str] = []
+    cuts: List[Tuple[int, str]] = []
+    in_string = escaped = False
+    for pos, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+        elif ch == ",":
+            cuts.append((pos, "".join(reversed(stack))))
+    candidates = [text + ('"' if in_string else "") + "".join(reversed(stack))]
+    candidates += [text[:pos] + closing for pos, closing in reversed(cuts[-64:])]
+    for candidate in candidates:
+        try:
+            value = json.loads(candidate)
+        except ValueError:
+            continue
+        return value if isinstance(value, dict) else None
+    return None
+
+
+def _structured_output(response: Any) -> Tuple[Optional[dict], bool]:
+    """
+    parse 응답(또는 LengthFinishReasonError 의 completion)에서 내용을 꺼냅니다.
+
+    Returns:
+        (파싱된 dict 또는 잘린 JSON 에서 읽은 부분, 길이 제한으로 잘렸는지)
+    """
+    if response is None or not getattr(response, "choices", None):
+        return None, False
+    choice = response.choices[0]
+    truncated = getattr(choice, "finish_reason", None) == "length"
+    parsed = getattr(choice.message, "parsed", None)
+    if parsed is not None and not truncated:
+        return parsed.model_dump(), False
+    return _load_partial_json(getattr(choice.message, "content", None) or ""), truncated
+
+
+def _text(value: Any) -> str:
+    return value.strip() if isinstance(value, str) else ""
+
+
+def _texts(value: Any) -> List[str]:
+    return [item for item in value if _text(item)] if isinstance(value, list) else []
+
+
+def _statistics(value: Any) -> List[Dict[str, str]]:
+    """label/value 가 모두 있는 통계 항목만 남깁니다."""
+    items = value if isinstance(value, list) else []
+    return [
+        {"label": _text(item.get("label")), "value": _text(str(item.get("value", "")))}
+        for item in items
+        if isinstance(item, dict) and _text(item.get("label")) and _text(str(item.get("value", "")))
+    ]
+
+
+def _validate_generated(
+    generated: Optional[dict], truncated: bool = False, content_format: str = ""
+) -> Tuple[dict, List[str], List[int]]:
+    """
+    구조화 생성 결과에서 쓸 수 있는 값만 남기고,
+    비었거나 형식이 틀린 최상위 필드와 섹션 인덱스를 찾습니다.
+    응답이 잘렸으면(truncated) 마지막 섹션도 잘린 것으로 봅니다.
+    인포그래픽은 차트를 그리는 statistics 도 검사합니다.
+
+    Returns:
+        (정리된 내용, 실패한 필드 이름 리스트, 실패한 섹션 인덱스 리스트)
+    """
+    generated = generated if isinstance(generated, dict) else {}
+    content: Dict[str, Any] = {}
+    failed_fields = []
+    for name in ("title", "introduction", "conclusion"):
+        if _text(generated.get(name)):
+            content[name] = generated[name]
+        else:
+            failed_fields.append(name)
+    key_points = _texts(generated.get("key_points"))
+    if key_points:
+        content["key_points"] = key_points
+    else:
+        failed_fields.append("key_points")
+
+    sections = []
+    failed_sections = []
+    raw_sections = generated.get("sections") if isinstance(generated.get("sections"), list) else []
+    for idx, section in enumerate(raw_sections):
+        section = section if isinstance(section, dict) else {}
+        sections.append({
+            "title": _text(section.get("title")),
+            "content": _text(section.get("content")),
+            "key_points": _texts(section.get("key_points")),
+        })
+        if (
+            not sections[-1]["title"]
+            or len(sections[-1]["content"]) < SECTION_MIN_CHARS
+            or (truncated and idx == len(raw_sections) - 1)
+        ):
+            failed_sections.append(idx)
+    content["sections"] = sections
+
+    statistics = _statistics(generated.get("statistics"))
+    if statistics:
+        content["statistics"] = statistics
+    elif content_format == "인포그래픽":
+        failed_fields.append("statistics")
+    if isinstance(generated.get("visual_elements"), list):
+        content["visual_elements"] = generated["visual_elements"]
+    return content, failed_fields, failed_sections
+
+
+def _new_generation_report() -> Dict[str, Any]:
+    """
+    구조화 생성 결과 보고
+    (전체 요청 횟수, 문제가 있던 항목, 부분 복구한 항목, 끝까지 실패한 항목).
+    """
+    return {"status": "ok", "full_attempts": 0, "issues": [], "repaired": [], "unresolved": []}
+
+
+def _repair_requests(
+    topic: str,
+    content_format: str,
+    content: dict,
+    failed_fields: List[str],
+    failed_sections: List[int],
+    report: Dict[str, Any],
+) -> List[Tuple[Any, List[Dict[str, str]], Any]]:
+    """
+    실패한 필드와 섹션만 다시 요청할 (대상, 메시지, 응답 스키마) 목록을 만듭니다.
+    필드는 한 번에 묶어서, 섹션은 섹션마다 하나씩 요청합니다.
+    """
+    from pydantic import create_model
+
+    report["issues"] = failed_fields + [f"sections[{idx}]" for idx in failed_sections]
+    sections = content["sections"]
+    title = content.get("title") or topic
+    repair_jobs = []
+
+    if failed_fields:
+        schema = create_model(
+            "ContentFieldsRepair",
+            **{name: (_REPAIR_FIELD_TYPES[name], ...) for name in failed_fields},
+        )
+        outline = "\n".join(f"- {section['title']}" for section in sections if section["title"])
+        labels = ", ".join(_FIELD_LABELS[name] for name in failed_fields)
+        prompt = f"""다음 {content_format} 콘텐츠에서 빠진 항목만 작성해주세요: {labels}
+
+주제: {topic}
+콘텐츠 제목: {title}
+
+섹션 구성:
+{outline}
+
+다른 항목과 자연스럽게 이어지도록 작성하고, 핵심 포인트는 3-5개로 작성해주세요."""
+        if "statistics" in failed_fields:
+            prompt += (
+                "\n통계는 3-6개로, label 에는 항목 이름을, "
+                "value 에는 단위를 포함한 수치(예: 35%, 120억 달러)를 넣어주세요."
+            )
+        repair_jobs.append(("fields", _writer_messages(prompt), schema))
+
+    for idx in failed_sections:
+        current = sections[idx]
+        outline = "\n".join(
+            f"{'▶' if i == idx else '-'} {section['title'] or '(제목 없음)'}"
+            for i, section in enumerate(sections)
+        )
+        prompt = f"""다음 {content_format} 콘텐츠에서 표시된(▶) {idx + 1}번째 섹션이
+비어 있거나 중간에 잘렸습니다. 이 섹션 하나만 작성해주세요.
+
+주제: {topic}
+콘텐츠 제목: {title}
+
+{FORMAT_GUIDES.get(content_format, "")}
+
+전체 섹션 구성:
+{outline}
+
+현재 섹션 제목: {current["title"] or "(없음, 새로 지어주세요)"}
+현재 섹션 내용(잘린 부분): {current["content"] or "(없음)"}
+
+다른 섹션과 내용이 겹치지 않게 하고, content는 최소 200자 이상으로 작성해주세요."""
+        repair_jobs.append((idx, _writer_messages(prompt), ContentSection))
+    return repair_jobs
+
+
+def _apply_repair(
+    content: dict,
+    target: Any,
+    repaired: Optional[dict],
+    report: Dict[str, Any],
+    content_format: str,
+) -> None:
+    """부분 복구 응답을 검증해 통과한 값만 내용에 병합합니다."""
+    if not repaired:
+        return
+    if target == "fields":
+        fixed, failed, _ = _validate_generated(repaired, content_format=content_format)
+        for name in _FIELD_LABELS:
+            if name in repaired and name not in failed:
+                content[name] = fixed[name]
+                report["repaired"].append(name)
+        return
+    _, _, failed = _validate_generated({"sections": [repaired]})
+    if not failed:
+        section = content["sections"][target]
+        section.update({
+            "title": _text(repaired.get("title")) or section["title"],
+            "content": _text(repaired.get("content")),
+            "key_points": _texts(repaired.get("key_points")),
+        })
+        report["repaired"].append(f"sections[{target}]")
+
+
+def _finish_generation(content: dict, report: Dict[str, Any], content_format: str) -> dict:
+    """복구 후 남은 실패 항목을 보고하고, 본문이 없는 섹션은 뺀 최종 내용을 반환합니다."""
+    _, failed_fields, failed_sections = _validate_generated(content, content_format=content_format)
+    report["unresolved"] = failed_fields + [f"sections[{idx}]" for idx in failed_sections]
+    content["sections"] = [section for section in content["sections"] if section["content"]]
+    if report["unresolved"]:
+        report["status"] = "partial"
+    elif report["issues"] or report["full_attempts"] > 1:
+        report["status"] = "repaired"
+    return content
+
+
+async def _request_structured(
+    messages: List[Dict[str, str]],
+    response_format: Any,
+    deadline: Optional[Deadline],
+    stage: str,
+) -> Tuple[Optional[dict], bool]:
+    """
+    구조화 생성 요청 1번 (span/비용 기록 포함, 마감이 있으면 남은 시간이 지나는 즉시 취소).
+    응답이 길이 제한으로 잘렸으면(LengthFinishReasonError) 읽을 수 있는 부분을 돌려주고,
+    API 오류나 스키마에 맞지 않는 응답은 로그를 남긴 뒤 실패한 요청 (None, False) 으로 처리합니다.
+    마감 초과는 DeadlineExceededError, 비용 예산 초과는 BudgetExceededError 로 그대로 올려 보냅니다.
+    """
+    from openai import LengthFinishReasonError, OpenAIError
+
+    with start_span(
+        "chat gpt-4o-mini",
+        gen_ai__operation__name="chat",
+        gen_ai__request__model="gpt-4o-mini",
+        content__stage=stage,
+    ) as llm_span:
+        timeout = deadline.timeout(stage="텍스트 생성") if deadline is not None else None
+        try:
+            response = await asyncio.wait_for(
+                get_async_openai_client().beta.chat.completions.parse(
+                    model="gpt-4o-mini",
+                    messages=messages,
+                    response_format=response_format,
+                    temperature=0.7,
+                ),
+                timeout=timeout,
+            )
+        except LengthFinishReasonError as e:
+            # 잘린 응답은 completion 에 읽을 수 있는 부분이 남아 있음
+            record_error(llm_span, e)
+            response = e.completion
+        except asyncio.TimeoutError as e:
+            record_error(llm_span, e)
+            raise DeadlineExceededError(f"요청 마감 시간을 넘겼습니다 ({stage}).") from e
+        except (OpenAIError, ValidationError) as e:
+            record_error(llm_span, e)
+            logger.warning("구조화 생성 요청 실패 (%s): %s", stage, e)
+            return None, False
+        record_usage(llm_span, getattr(response, "usage", None))
+        await asyncio.to_thread(
+            get_cost_ledger().charge_llm,
+            "gpt-4o-mini",
+            getattr(response, "usage", None),
+            stage=stage,
+        )
+        return _structured_output(response)
+
+
+async def _can_repair(deadline: Optional[Deadline]) -> bool:
+    """마감이나 비용 예산 때문에 부분 복구 요청을 더 할 수 없으면 False."""
+    if deadline is not None and deadline.expired:
+        return False
+    try:
+        await asyncio.to_thread(get_cost_ledger().check_budget, stage="부분 복구")
+    except BudgetExceededError:
+        return False
+    return True
+
+
+async def _generate_content(
+    topic: str,
+    content_format: str,
+    reference_info: Optional[str],
+    deadline: Optional[Deadline],
+) -> Tuple[Optional[dict], Dict[str, Any]]:
+    """
+    구조화 생성 → 검증 → 실패한 필드/섹션만 다시 요청해 병합합니다 (부분 복구 요청은 동시에 실행).
+    쓸 수 있는 섹션이 하나도 없을 때만 전체를 다시 요청합니다 (CONTENT_FULL_RETRIES 번까지).
+
+    Returns:
+        (생성된 내용, 생성 보고). 끝까지 쓸 수 있는 내용이 없으면 내용은 None
+    """
+    report = _new_generation_report()
+    messages = _build_content_messages(topic, content_format, reference_info)
+    for attempt in range(1 + CONTENT_FULL_RETRIES):
+        if attempt and not await _can_repair(deadline):
+            break
+        report["full_attempts"] += 1
+        generated, truncated = await _request_structured(
+            messages, GeneratedContent, deadline, "create_content_base"
+        )
+        content, failed_fields, failed_sections = _validate_generated(
+            generated, truncated, content_format
+        )
+        if len(content["sections"]) > len(failed_sections):
+            break
+    if len(content["sections"]) <= len(failed_sections):
+        report.update(status="fallback", unresolved=["content"])
+        return None, report
+
+    repair_jobs = _repair_requests(
+        topic, content_format, content, failed_fields, failed_sections, report
+    )
+    if repair_jobs and await _can_repair(deadline):
+        semaphore = asyncio.Semaphore(CONTENT_REPAIR_CONCURRENCY)
+
+        async def repair(repair_job):
+            target, repair_messages, schema = repair_job
+            async with semaphore:
+                repaired, truncated = await _request_structured(
+                    repair_messages, schema, deadline, f"create_content_base repair {target}"
+                )
+            return None if truncated else repaired
+
+        repaired_results = await asyncio.gather(*(repair(repair_job) for repair_job in repair_jobs))
+        for (target, _, _), repaired in zip(repair_jobs, repaired_results):
+            _apply_repair(content, target, repaired, report, content_format)
+    return _finish_generation(content, report, content_format), report
+
+
+def _record_generation(span: Any, generation: Dict[str, Any]) -> None:
+    """구조화 생성 보고를 span 속성으로 남깁니다."""
+    set_attributes(
+        span,
+        content__repair__status=generation["status"],
+        content__repair__full_attempts=generation["full_attempts"],
+        content__repair__issues=len(generation["issues"]),
+        content__repair__repaired=len(generation["repaired"]),
+        content__repair__unresolved=len(generation["unresolved"]),
+    )
+
+
+def _content_result(
+    topic: str, content_format: str, plan: dict, generation: Optional[Dict[str, Any]] = None
+) -> dict:
+    """포맷팅된 콘텐츠를 포함한 최종 결과를 만듭니다."""
+    result = {
+        "topic": topic,
+        "format": content_format,
+        "raw_content": plan,
+        "formatted_content": format_content_output(plan, content_format),
+        "status": "success"
+    }
+    if generation is not None:
+        # 부분 복구/실패 내역 (status: ok, repaired, partial, fallback)
+        result["generation"] = generation
+    return result
+
+
+def _deadline_exceeded_result(
+    topic: str, content_format: str, error: DeadlineExceededError
+) -> dict:
+    """요청 마감 시간을 넘겨 생성을 중단했을 때의 결과."""
+    return {
+        "topic": topic,
+        "format": content_format,
+        "status": "error",
+        "error_type": "deadline",
+        "message": f"콘텐츠 생성을 중단했습니다: {error}",
+    }
+
+
+def _budget_exceeded_result(topic: str, content_format: str, error: BudgetExceededError) -> dict:
+    """비용 예산을 넘겨 생성을 중단했을 때의 결과."""
+    return {
+        "topic": topic,
+        "format": content_format,
+        "status": "error",
+        "error_type": "budget",
+        "message": str(error),
+    }
+
+
+async def create_content_base_async(
+    topic: str,
+    content_format: str,
+    reference_files: Optional[List[str]] = None,
+    progress: Optional[Callable[[str, int, int], None]] = None,
+    deadline: Optional[Deadline] = None,
+) -> dict:
+    """
+    기본 콘텐츠 제작 프로세스를 실행합니다 (텍스트만 생성, 백그라운드 작업용).
+    단계마다 progress(stage, done, total) 를 호출하며, 작업이 취소되면
+    진행 중인 OpenAI 요청도 함께 취소됩니다 (asyncio.CancelledError 전파).
+    마감 시간이 있으면 텍스트 요청은 남은 시간이 지나는 즉시 취소되고,
+    마감을 넘기면 DeadlineExceededError 를,
+    비용 예산을 넘겼으면 BudgetExceededError 를 발생시킵니다.
+    
+    Args:
+        topic: 콘텐츠 주제
+        content_format: 콘텐츠 형식
+        reference_files: 참고자료 파일 경로 리스트 (선택사항)
+        progress: 진행 상황 콜백 (선택사항)
+        deadline: 요청 마감 시간 (선택사항)
+
+    Returns:
+        생성된 콘텐츠 정보 (텍스트만)
+    """
+    report = progress or (lambda stage, done, total: None)
+    reference_files = reference_files or []
+
+    with start_span(
+        "create_content_base",
+        content__format=content_format,
+        content__reference_files=len(reference_files),
+    ) as span:
+        # 1. 파일 처리 (파일 단위로 진행 상황 보고)
+        file_summaries = []
+        with start_span("ingestion"):
+            for idx, file_path in enumerate(reference_files):
+                if deadline is not None:
+                    deadline.check("참고자료 처리")
+                report("ingestion", idx, len(reference_files))
+                file_info = await asyncio.to_thread(process_reference_file, file_path)
+                if file_info.get("status") == "success":
+                    file_summaries.append(json.dumps(file_info, ensure_ascii=False))
+        report("ingestion", len(reference_files), len(reference_files))
+        reference_info = "\n\n".join(file_summaries) if file_summaries else None
+
+        # 2. 콘텐츠 구조 기획
+        plan = plan_content_structure(topic, content_format, reference_info)
+
+        # 3. LLM 콘텐츠 생성 (취소 가능한 비동기 요청)
+        report("text", 0, 1)
+        generation = None
+        if OPENAI_CLIENT:
+            # 예산을 넘겼으면 BudgetExceededError 로 작업을 끝냄
+            await asyncio.to_thread(get_cost_ledger().check_budget, stage="텍스트 생성")
+            # 검증 후 실패한 필드/섹션만 다시 요청 (전체 재요청은 쓸 수 있는 내용이 없을 때만)
+            content, generation = await _generate_content(
+                topic, content_format, reference_info, deadline
+            )
+            if content is not None:
+                _merge_generated_content(plan, content, content_format)
+            _record_generation(span, generation)
+        if deadline is not None:
+            deadline.check("텍스트 생성")
+        report("text", 1, 1)
+        set_attributes(span, content__sections=len(plan.get("sections") or []), status="success")
+
+        # 4. 포맷팅된 콘텐츠 생성
+        return _content_result(topic, content_format, plan, generation)
+
+
+async def create_content_result(
+    topic: str,
+    content_format: str,
+    reference_files: Optional[List[str]] = None,
+    deadline: Optional[Deadline] = None,
+) -> dict:
+    """
+    create_content_base_async 를 실행하되 마감/예산 초과는 예외 대신 오류 결과로 반환합니다.
+    서브 에이전트 도구에서 사용하는 공통 함수입니다.
+    """
+    try:
+        return await create_content_base_async(
+            topic, content_format, reference_files, deadline=deadline
+        )
+    except DeadlineExceededError as e:
+        return _deadline_exceeded_result(topic, content_format, e)
+    except BudgetExceededError as e:
+        return _budget_exceeded_result(topic, content_format, e)
+
+
+def create_content_base(
+    topic: str,
+    content_format: str,
+    reference_files: Optional[List[str]] = None,
+    deadline: Optional[Deadline] = None,
+) -> dict:
+    """
+    create_content_result 의 동기 버전 (이벤트 루프 밖에서 호출할 때만 사용).
+
+    Args:
+        topic: 콘텐츠 주제
+        content_format: 콘텐츠 형식
+        reference_files: 참고자료 파일 경로 리스트 (선택사항)
+        deadline: 요청 마감 시간 (선택사항, 텍스트 생성은 남은 시간만큼만 기다림)
+
+    Returns:
+        생성된 콘텐츠 정보 (텍스트만)
+    """
+    async def run() -> dict:
+        try:
+            return await create_content_result(topic, content_format, reference_files, deadline)
+        finally:
+            await close_async_openai_client()
+
+    return asyncio.run(run())
+
+
+def get_section_dependencies(
+    content_format: str, raw_content: Dict[str, Any]
+) -> Dict[int, List[str]]:
+    """
+    섹션 인덱스별로 그 섹션 내용에 의존하는 이미지 artifact 이름을 반환합니다.
+    generate_images 는 내용이 바뀐 artifact 만 다시 만들기 때문에,
+    섹션 하나를 고치면 여기 나열된 이미지만 재생성됩니다.
+    """
+    sections = raw_content.get("sections", [])
+    if content_format == "카드뉴스":
+        return {idx: [f"card_{idx + 1:02d}.jpeg"] for idx in range(len(sections))}
+    if content_format == "뉴스레터":
+        return {
+            idx: (["newsletter_section.jpeg"] if idx == 0 else []) for idx in range(len(sections))
+        }
+    # 인포그래픽 이미지는 statistics 에만 의존
+    return {idx: [] for idx in range(len(sections))}
+
+
+def regenerate_section(
+    content_result: Dict[str, Any],
+    section_index: int,
+    instruction: Optional[str] = None,
+    deadline: Optional[Deadline] = None,
+) -> dict:
+    """
+    콘텐츠 중 섹션 하나만 다시 생성합니다 (LLM 호출 1번).
+    나머지 섹션과 서식 조각은 그대로 재사용됩니다.
+
+    Args:
+        content_result: create_content_base 결과 (topic, format, raw_content 포함)
+        section_index: 다시 생성할 섹션 인덱스 (0부터)
+        instruction: 수정 요청 사항 (선택사항)
+        deadline: 요청 마감 시간 (선택사항)
+
+    Returns:
+        섹션이 교체된 새 결과 (regenerated_section, affected_artifacts 포함)
+    """
+    # 예산 확인과 비용 기록이 같은 요청 ID 로 남도록 범위를 엶
+    # (바깥 범위나 결과의 request_id 를 따름)
+    with request_scope(
+        content_result.get("request_id"), content_format=content_result.get("format")
+    ):
+        return _regenerate_section(content_result, section_index, instruction, deadline)
+
+
+def _regenerate_section(
+    content_result: Dict[str, Any],
+    section_index: int,
+    instruction: Optional[str],
+    deadline: Optional[Deadline],
+) -> dict:
+    raw_content = content_result.get("raw_content") or {}
+    content_format = content_result.get("format", "")
+    sections = list(raw_content.get("sections", []))
+
+    if not 0 <= section_index < len(sections):
+        return {
+            **content_result,
+            "status": "error",
+            "message": f"섹션 인덱스가 범위를 벗어났습니다: {section_index}",
+        }
+
+    if not OPENAI_CLIENT:
+        return {
+            **content_result,
+            "status": "error",
+            "message": "OPENAI_API_KEY가 설정되지 않아 섹션을 다시 생성할 수 없습니다.",
+        }
+
+    try:
+        get_cost_ledger().check_budget(stage="섹션 재생성")
+    except BudgetExceededError as e:
+        return {**content_result, "status": "error", "error_type": "budget", "message": str(e)}
+
+    current = sections[section_index]
+    outline = "\n".join(
+        f"{'▶' if idx == section_index else '-'} {section.get('title', '')}"
+        for idx, section in enumerate(sections)
+    )
+    prompt = f"""다음 {content_format} 콘텐츠에서 표시된(▶) 섹션 하나만 다시 작성해주세요.
+
+주제: {content_result.get("topic", raw_content.get("title", ""))}
+콘텐츠 제목: {raw_content.get("title", "")}
+
+{FORMAT_GUIDES.get(content_format, "")}
+
+전체 섹션 구성:
+{outline}
+
+현재 섹션 제목: {current.get("title", "")}
+현재 섹션 내용: {current.get("content", "")}
+
+수정 요청: {instruction or "더 구체적이고 완성도 높게 다시 작성"}
+
+다른 섹션과 내용이 겹치지 않게 하고, content는 최소 200자 이상으로 작성해주세요."""
+
+    with start_span(
+        "regenerate_section chat gpt-4o-mini",
+        gen_ai__operation__name="chat",
+        gen_ai__request__model="gpt-4o-mini",
+        content__format=content_format,
+        content__section_index=section_index,
+    ) as llm_span:
+        try:
             response = OPENAI_CLIENT.beta.chat.completions.parse(
                 model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "당신은 전문 콘텐츠 작가입니다. 주어진 주제와 형식에 맞는 고품질 콘텐츠를 생성합니다."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                response_format=GeneratedContent,
+                messages=_writer_messages(prompt),
+                response_format=ContentSection,
                 temperature=0.7,
+                timeout=resolve_timeout(deadline, 600, "섹션 재생성"),
             )
-            
-            # 파싱된 응답을 dict로 변환
-            generated = response.choices[0].message.parsed.model_dump()
-            
-            # plan에 생성된 내용 병합
-            plan.update({
-                "title": generated.get("title", plan.get("title", "")),
-                "introduction": generated.get("introduction", plan.get("introduction", "")),
-                "sections": [
-                    {
-                        "title": section.get("title", ""),
-                        "content": section.get("content", ""),
-                        "key_points": section.get("key_points", [])
-                    }
-                    for section in generated.get("sections", [])
-                ],
-                "key_points": generated.get("key_points", plan.get("key_points", [])),
-                "conclusion": generated.get("conclusion", plan.get("conclusion", ""))
-            })
-            
-            # 인포그래픽의 경우 추가 필드
-            if content_format == "인포그래픽":
-                plan["statistics"] = generated.get("statistics", [])
-                plan["visual_elements"] = generated.get("visual_elements", [])
-                
+            record_usage(llm_span, getattr(response, "usage", None))
+            get_cost_ledger().charge_llm(
+                "gpt-4o-mini", getattr(response, "usage", None), stage="regenerate_section"
+            )
+            regenerated = response.choices[0].message.parsed.model_dump()
         except Exception as e:
-            # 오류 발생 시 기본 구조 유지
-            pass
-    
-    # 4. 포맷팅된 콘텐츠 생성
-    formatted_content = format_content_output(plan, content_format)
-    
+            record_error(llm_span, e)
+            return {
+                **content_result,
+                "status": "error",
+                "message": f"섹션 재생성 실패: {e}",
+            }
+
+    sections[section_index] = {
+        "title": regenerated.get("title", ""),
+        "content": regenerated.get("content", ""),
+        "key_points": regenerated.get("key_points") or [],
+    }
+    new_raw_content = {**raw_content, "sections": sections}
+    dependencies = get_section_dependencies(content_format, new_raw_content)
+
     return {
-        "topic": topic,
-        "format": content_format,
-        "raw_content": plan,
-        "formatted_content": formatted_content,
-        "status": "success"
+        **content_result,
+        "raw_content": new_raw_content,
+        # 바뀐 섹션 조각만 새로 렌더링되고 나머지는 캐시된 조각을 재사용
+        "formatted_content": format_content_output(new_raw_content, content_format),
+        "regenerated_section": section_index,
+        "affected_artifacts": dependencies.get(section_index, []),
+        "status": "success",
     }
 
 
@@ -574,6 +1354,9 @@ from .subagents.infographic.agent import infographic_agent
 
 ROOT_MODEL = LiteLlm(model="openai/gpt-4o-mini")
 
+# 라우팅 턴 비용 기록과 예산 확인
+root_before_model, root_after_model = model_budget_callbacks(ROOT_MODEL.model)
+
 # 서브 에이전트를 AgentTool로 감싸기
 card_news_tool = AgentTool(agent=card_news_agent)
 newsletter_tool = AgentTool(agent=newsletter_agent)
@@ -584,6 +1367,10 @@ root_agent = Agent(
     name='content_creator_agent',
     description=ROOT_AGENT_DESCRIPTION,
     instruction=ROOT_AGENT_INSTRUCTION,
+    # 호출 ID 를 요청 ID 로 state 에 남겨 서브 에이전트 비용도 같은 요청으로 기록
+    before_agent_callback=start_request_callback,
+    before_model_callback=root_before_model,
+    after_model_callback=root_after_model,
     tools=[
         process_reference_file,  # 파일 처리 도구
         card_news_tool,          # 카드뉴스 제작 서브 에이전트
@@ -0,0 +1,186 @@
+"""
+세션 state 용 콘텐츠 저장소
+콘텐츠 본문(raw_content)은 세션 artifact("content.json")로 한 번만 저장하고,
+tool_context.state 에는 작은 핸들(artifact 버전, 콘텐츠 해시, 형식 등)만 남깁니다.
+
+ADK 는 이벤트마다 세션 state 를 저장/직렬화하므로, 큰 카드뉴스 덱을 state 에 통째로 넣으면
+세션 저장소가 커지고 매 턴이 느려집니다.
+formatted_content 는 raw_content 에서 다시 렌더링할 수 있으므로 저장하지 않습니다.
+
+도구가 LLM 에게 돌려주는 값도 같은 이유로 핸들과 짧은 요약(content_summary)만 담고,
+전체 결과는 artifact 로 호출한 쪽(클라이언트)에 전달합니다.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .formatting import render_content
+
+# 콘텐츠 본문을 저장하는 artifact 이름과 핸들을 저장하는 state 키
+CONTENT_ARTIFACT_NAME = "content.json"
+CONTENT_STATE_KEY = "content_creator_output"
+
+# 이미지별 전체 생성 결과를 담는 artifact (generate_images 는 LLM 에 요약만 반환)
+IMAGE_RESULT_ARTIFACT_NAME = "image_result.json"
+
+# 도구 요약에 넣는 섹션 제목 최대 길이
+_SUMMARY_TITLE_LENGTH = 40
+
+# 프로세스 안에서 다시 읽은 콘텐츠를 보관하는 개수 (artifact 재조회/파싱 생략)
+_CONTENT_CACHE_SIZE = 32
+# 키는 (형식, 주제, 내용 해시): 같은 raw_content 라도 형식/주제가 다르면 다른 결과
+_content_cache: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+_content_cache_lock = threading.Lock()
+
+
+def content_hash(raw_content: Dict[str, Any]) -> str:
+    """raw_content 의 내용 해시 (키 순서와 무관)."""
+    data = json.dumps(raw_content or {}, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def _cache_key(value: Dict[str, Any], digest: str) -> Tuple[str, str, str]:
+    return value.get("format", ""), value.get("topic", ""), digest
+
+
+def _remember(key: Tuple[str, str, str], result: Dict[str, Any]) -> None:
+    with _content_cache_lock:
+        _content_cache[key] = result
+        _content_cache.move_to_end(key)
+        while len(_content_cache) > _CONTENT_CACHE_SIZE:
+            _content_cache.popitem(last=False)
+
+
+def _recall(key: Tuple[str, str, str]) -> Optional[Dict[str, Any]]:
+    with _content_cache_lock:
+        result = _content_cache.get(key)
+    return dict(result) if result is not None else None
+
+
+def make_content_handle(result: Dict[str, Any], version: int) -> Dict[str, Any]:
+    """state 에 저장할 콘텐츠 핸들을 만듭니다 (본문 없이 식별 정보와 요약만)."""
+    raw_content = result.get("raw_content") or {}
+    return {
+        "artifact": CONTENT_ARTIFACT_NAME,
+        "version": version,
+        "content_hash": content_hash(raw_content),
+        "topic": result.get("topic", ""),
+        "format": result.get("format", ""),
+        "title": raw_content.get("title", ""),
+        "section_count": len(raw_content.get("sections") or []),
+        "status": result.get("status", "success"),
+    }
+
+
+def content_from_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """content.json 내용으로 create_content_base 결과 형식을 다시 만듭니다."""
+    raw_content = payload.get("raw_content") or {}
+    content_format = payload.get("format", "")
+    result = {
+        "topic": payload.get("topic", ""),
+        "format": content_format,
+        "raw_content": raw_content,
+        "formatted_content": render_content(raw_content, content_format),
+        "status": "success",
+    }
+    if payload.get("generation"):
+        result["generation"] = payload["generation"]
+    return result
+
+
+def content_summary(result: Dict[str, Any], handle: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    LLM 에게 돌려줄 콘텐츠 요약을 만듭니다.
+    본문과 서식 문자열 없이 핸들, 제목, 섹션 제목만 담아 다음 턴의 입력 토큰을 줄입니다.
+    """
+    raw_content = result.get("raw_content") or {}
+    titles = []
+    for section in raw_content.get("sections") or []:
+        title = str(section.get("title", ""))
+        titles.append(
+            title if len(title) <= _SUMMARY_TITLE_LENGTH else title[:_SUMMARY_TITLE_LENGTH] + "…"
+        )
+    summary = {
+        "status": result.get("status", "success"),
+        "content": {"artifact": handle["artifact"], "version": handle["version"]},
+        "format": result.get("format", ""),
+        "title": raw_content.get("title", ""),
+        "sections": titles,
+    }
+    # 부분 복구했거나 끝까지 비어 있는 항목이 있으면 알려서 revise_section 으로 고칠 수 있게 함
+    generation = result.get("generation") or {}
+    if generation.get("status", "ok") != "ok":
+        summary["generation"] = {
+            key: generation[key] for key in ("status", "repaired", "unresolved")
+        }
+    return summary
+
+
+async def save_json_artifact(tool_context, filename: str, payload: Any) -> int:
+    """JSON 으로 직렬화할 수 있는 값을 세션 artifact 로 저장하고 버전을 반환합니다."""
+    # ADK 서버 쪽에서만 필요하므로 여기서 import (클라이언트는 google-genai 없이 사용)
+    from google.genai import types
+
+    data = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+    return await tool_context.save_artifact(
+        filename=filename,
+        artifact=types.Part.from_bytes(data=data, mime_type="application/json"),
+    )
+
+
+async def save_content(tool_context, result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    콘텐츠 본문을 artifact 로 저장하고 state 에 핸들을 기록합니다.
+
+    Args:
+        tool_context: 도구 컨텍스트 (state / save_artifact)
+        result: create_content_base / regenerate_section 결과
+
+    Returns:
+        state 에 저장한 핸들
+    """
+    payload = {
+        "topic": result.get("topic", ""),
+        "format": result.get("format", ""),
+        "raw_content": result.get("raw_content") or {},
+    }
+    if result.get("generation"):
+        # 부분 복구/실패 내역도 남겨 클라이언트(클라우드 모드)가 경고를 표시할 수 있게 함
+        payload["generation"] = result["generation"]
+    version = await save_json_artifact(tool_context, CONTENT_ARTIFACT_NAME, payload)
+    handle = make_content_handle(result, version)
+    tool_context.state[CONTENT_STATE_KEY] = handle
+    _remember(_cache_key(handle, handle["content_hash"]), content_from_payload(payload))
+    return handle
+
+
+async def load_content(tool_context) -> Optional[Dict[str, Any]]:
+    """
+    state 의 핸들이 가리키는 콘텐츠를 읽습니다.
+    state 에 전체 결과가 들어 있으면(로컬 백그라운드 작업 등) 그대로 반환합니다.
+
+    Returns:
+        create_content_base 결과 형식의 콘텐츠 (없으면 None)
+    """
+    value = tool_context.state.get(CONTENT_STATE_KEY)
+    if not isinstance(value, dict) or not value:
+        return None
+    if "raw_content" in value:
+        return value
+
+    cached = _recall(_cache_key(value, value.get("content_hash", "")))
+    if cached is not None:
+        return cached
+
+    artifact = await tool_context.load_artifact(
+        value.get("artifact", CONTENT_ARTIFACT_NAME), version=value.get("version")
+    )
+    data = getattr(getattr(artifact, "inline_data", None), "data", None)
+    if not data:
+        return None
+    result = content_from_payload(json.loads(data))
+    digest = value.get("content_hash") or content_hash(result["raw_content"])
+    _remember(_cache_key(value, digest), result)
+    return dict(result)
@@ -0,0 +1,87 @@
+"""
+요청 단위 마감 시간
+진입점(app.py / adk_client / ADK 도구 컨텍스트)에서 한 번 만든 마감 시간을
+텍스트 생성과 이미지 생성까지 그대로 전달해,
+각 하위 호출이 남은 시간만큼만 기다리고 마감을 넘기면 작업을 멈추도록 합니다.
+
+프로세스 경계(Streamlit → ADK 서버)를 넘어 전달해야 하므로 epoch 기준 시각(time.time)을 사용하며,
+ADK 세션 state 에는 REQUEST_DEADLINE_STATE_KEY 키로 저장합니다.
+"""
+import os
+import time
+from typing import Any, Mapping, Optional
+
+# 기본 요청 마감 시간 (초). 0 이면 마감 없음
+CONTENT_REQUEST_TIMEOUT_SECONDS = float(os.getenv("CONTENT_REQUEST_TIMEOUT_SECONDS", "600"))
+
+# ADK 세션 state 에 마감 시각(epoch 초)을 저장하는 키
+REQUEST_DEADLINE_STATE_KEY = "request_deadline"
+
+
+class DeadlineExceededError(TimeoutError):
+    """요청 마감 시간을 넘김."""
+
+
+class Deadline:
+    """epoch 기준 마감 시각. 남은 시간 계산과 하위 호출용 타임아웃을 제공합니다."""
+
+    def __init__(self, expires_at: float):
+        self.expires_at = float(expires_at)
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        """지금부터 seconds 초 뒤에 끝나는 마감 시간을 만듭니다."""
+        return cls(time.time() + seconds)
+
+    @classmethod
+    def default(cls) -> Optional["Deadline"]:
+        """환경 변수 CONTENT_REQUEST_TIMEOUT_SECONDS 기준 마감 시간 (0 이면 None)."""
+        return (
+            cls.after(CONTENT_REQUEST_TIMEOUT_SECONDS)
+            if CONTENT_REQUEST_TIMEOUT_SECONDS > 0
+            else None
+        )
+
+    @classmethod
+    def from_state(cls, state: Optional[Mapping[str, Any]]) -> Optional["Deadline"]:
+        """ADK 세션 state 에 저장된 마감 시각을 읽습니다 (없거나 잘못된 값이면 None)."""
+        if not state:
+            return None
+        value = state.get(REQUEST_DEADLINE_STATE_KEY)
+        try:
+            return cls(float(value)) if value not in (None, "") else None
+        except (TypeError, ValueError):
+            return None
+
+    def to_state(self) -> dict:
+        """ADK state_delta 로 보낼 값을 반환합니다."""
+        return {REQUEST_DEADLINE_STATE_KEY: self.expires_at}
+
+    def remaining(self) -> float:
+        """남은 시간 (초, 음수면 이미 지남)."""
+        return self.expires_at - time.time()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self, stage: str = "") -> None:
+        """마감을 넘겼으면 DeadlineExceededError 를 발생시킵니다."""
+        if self.expired:
+            raise DeadlineExceededError(
+                f"요청 마감 시간을 넘겼습니다{f' ({stage})' if stage else ''}."
+            )
+
+    def timeout(self, cap: Optional[float] = None, stage: str = "") -> float:
+        """
+        하위 호출에 넘길 타임아웃 (남은 시간, cap 이 있으면 그보다 길지 않게).
+        이미 마감을 넘겼으면 DeadlineExceededError 를 발생시킵니다.
+        """
+        self.check(stage)
+        remaining = self.remaining()
+        return min(remaining, cap) if cap is not None else remaining
+
+
+def resolve_timeout(deadline: Optional[Deadline], default: float, stage: str = "") -> float:
+    """마감 시간이 있으면 남은 시간(default 이하), 없으면 default 를 반환합니다."""
+    return deadline.timeout(cap=default, stage=stage) if deadline is not None else default
@@ -0,0 +1,267 @@
+"""
+콘텐츠 내보내기 (ZIP / DOCX / HTML)
+다운로드 버튼을 누를 때만 파일을 만들고, 만든 파일은 콘텐츠 해시 기준으로 디스크에 캐싱합니다.
+
+- ZIP 은 이미지 파일을 메모리에 올리지 않고 디스크에서 바로 스트리밍해 묶습니다.
+  이미 압축된 JPEG/WebP 는 다시 압축하지 않고(STORED) 텍스트만 DEFLATE 합니다.
+- 같은 콘텐츠(원본 데이터 + 이미지 파일 크기/수정 시각)면 이전에 만든 파일을 그대로 반환합니다.
+  캐시가 EXPORT_CACHE_MAX_MB 를 넘으면 가장 오래 사용하지 않은 파일부터 삭제합니다.
+"""
+import base64
+import hashlib
+import html
+import json
+import os
+import tempfile
+import threading
+import zipfile
+from typing import Any, Callable, Dict, List, Optional
+
+from .formatting import render_content
+
+# 내보내기 파일 캐시 디렉토리
+EXPORT_CACHE_DIR = os.getenv(
+    "EXPORT_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "content_creator", "exports"),
+)
+# 캐시 용량 상한 (방금 만든 파일은 넘더라도 남김)
+EXPORT_CACHE_MAX_MB = float(os.getenv("EXPORT_CACHE_MAX_MB", "256"))
+
+# 내보내기 형식별 (확장자, MIME 타입)
+EXPORT_FORMATS = {
+    "zip": ("zip", "application/zip"),
+    "docx": ("docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    "html": ("html", "text/html"),
+}
+
+# 다시 압축해도 줄지 않는 확장자
+_PRECOMPRESSED = {".jpeg", ".jpg", ".png", ".webp"}
+
+_IMAGE_MIME = {
+    ".jpeg": "image/jpeg",
+    ".jpg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+}
+
+_build_lock = threading.Lock()
+
+
+def _existing_images(result: Dict[str, Any]) -> List[str]:
+    """결과에 포함된 이미지 중 실제로 존재하는 파일 경로만 반환합니다."""
+    return [path for path in result.get("images", []) or [] if path and os.path.isfile(path)]
+
+
+def export_hash(result: Dict[str, Any]) -> str:
+    """
+    내보내기 결과를 결정하는 값으로 콘텐츠 해시를 만듭니다.
+    이미지는 내용을 읽지 않고 (경로, 크기, 수정 시각)만 사용합니다.
+    """
+    images = []
+    for path in _existing_images(result):
+        stat = os.stat(path)
+        images.append([path, stat.st_size, stat.st_mtime_ns])
+    material = {
+        "topic": result.get("topic", ""),
+        "format": result.get("format", ""),
+        "raw_content": result.get("raw_content", {}),
+        "formatted_content": result.get("formatted_content", ""),
+        "images": images,
+    }
+    encoded = json.dumps(material, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _touch(path: str) -> bool:
+    """캐시 파일을 최근 사용으로 표시합니다. 파일이 없으면 False."""
+    try:
+        os.utime(path, None)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _evict_exports(cache_dir: str, keep: str) -> None:
+    """캐시 용량 상한을 넘으면 가장 오래 사용하지 않은 파일부터 삭제합니다 (keep 은 남김)."""
+    max_bytes = EXPORT_CACHE_MAX_MB * 1024 * 1024
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if not entry.is_file() or entry.name.endswith(".tmp"):
+            continue
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+def _write_zip(result: Dict[str, Any], f) -> None:
+    """이미지는 디스크에서 스트리밍하고, 텍스트/JSON 은 함께 묶어 ZIP 으로 씁니다."""
+    content_format = result.get("format", "")
+    with zipfile.ZipFile(f, "w", zipfile.ZIP_DEFLATED, strict_timestamps=False) as zip_file:
+        formatted_content = result.get("formatted_content", "")
+        if formatted_content:
+            zip_file.writestr("content.txt", formatted_content)
+        zip_file.writestr(
+            "content.json",
+            json.dumps(result.get("raw_content", {}), ensure_ascii=False, indent=2),
+        )
+        for path in _existing_images(result):
+            ext = os.path.splitext(path)[1].lower()
+            compress_type = zipfile.ZIP_STORED if ext in _PRECOMPRESSED else zipfile.ZIP_DEFLATED
+            # ZipFile.write 는 파일을 청크 단위로 읽어 기록
+            zip_file.write(path, f"images/{os.path.basename(path)}", compress_type=compress_type)
+        if content_format:
+            comment = f"{content_format} | {result.get('topic', '')}"
+            zip_file.comment = comment.encode("utf-8")[:65535]
+
+
+def _write_docx(result: Dict[str, Any], f) -> None:
+    """python-docx 로 제목/도입부/핵심 포인트/섹션/통계/결론과 이미지를 담은 문서를 씁니다."""
+    from docx import Document
+    from docx.shared import Inches
+
+    raw_content = result.get("raw_content", {}) or {}
+    content_format = result.get("format", "")
+    images = _existing_images(result)
+
+    document = Document()
+    document.add_heading(raw_content.get("title") or result.get("topic", ""), level=0)
+    if raw_content.get("introduction"):
+        document.add_paragraph(raw_content["introduction"])
+
+    key_points = raw_content.get("key_points", []) or []
+    if key_points:
+        document.add_heading("핵심 포인트", level=1)
+        for point in key_points:
+            document.add_paragraph(str(point), style="List Number")
+
+    # 카드뉴스는 카드 이미지를 해당 섹션 아래에, 그 외는 첫 이미지를 머리에 배치
+    section_images: Dict[int, str] = {}
+    if content_format == "카드뉴스":
+        section_images = dict(enumerate(images))
+    elif images:
+        document.add_picture(images[0], width=Inches(6))
+
+    for idx, section in enumerate(raw_content.get("sections", [])):
+        document.add_heading(section.get("title", ""), level=1)
+        if idx in section_images:
+            document.add_picture(section_images[idx], width=Inches(4.5))
+        if section.get("content"):
+            document.add_paragraph(section["content"])
+        for point in section.get("key_points", []) or []:
+            document.add_paragraph(str(point), style="List Bullet")
+
+    statistics = raw_content.get("statistics", []) or []
+    if statistics:
+        document.add_heading("주요 통계", level=1)
+        for stat in statistics:
+            if isinstance(stat, dict):
+                stat = f"{stat.get('label', '')}: {stat.get('value', '')}"
+            document.add_paragraph(str(stat), style="List Bullet")
+
+    if raw_content.get("conclusion"):
+        document.add_heading("결론", level=1)
+        document.add_paragraph(raw_content["conclusion"])
+
+    document.save(f)
+
+
+def _write_html(result: Dict[str, Any], f) -> None:
+    """이미지를 data URI 로 포함한 단일 HTML 문서를 씁니다."""
+    raw_content = result.get("raw_content", {}) or {}
+    title = raw_content.get("title") or result.get("topic", "")
+    body = render_content(raw_content, result.get("format", ""), "html")
+
+    f.write(
+        "<!DOCTYPE html>\n<html lang=\"ko\">\n<head>\n<meta charset=\"utf-8\">\n"
+        f"<title>{html.escape(title)}</title>\n"
+        "<style>body{max-width:760px;margin:2em auto;padding:0 1em;"
+        "font-family:sans-serif;line-height:1.6}"
+        "img{max-width:100%;height:auto;display:block;margin:1em 0}</style>\n"
+        "</head>\n<body>\n".encode("utf-8")
+    )
+    f.write(body.encode("utf-8"))
+    for path in _existing_images(result):
+        mime = _IMAGE_MIME.get(os.path.splitext(path)[1].lower(), "application/octet-stream")
+        with open(path, "rb") as image_file:
+            encoded = base64.b64encode(image_file.read()).decode("ascii")
+        alt = html.escape(os.path.basename(path))
+        f.write(f"\n<img src=\"data:{mime};base64,{encoded}\" alt=\"{alt}\">".encode("utf-8"))
+    f.write(b"\n</body>\n</html>\n")
+
+
+_WRITERS: Dict[str, Callable[[Dict[str, Any], Any], None]] = {
+    "zip": _write_zip,
+    "docx": _write_docx,
+    "html": _write_html,
+}
+
+
+def build_export(result: Dict[str, Any], kind: str, cache_dir: Optional[str] = None) -> str:
+    """
+    내보내기 파일을 만들고 경로를 반환합니다. 같은 콘텐츠로 이미 만든 파일이 있으면 재사용합니다.
+
+    Args:
+        result: create_content 결과
+        kind: 내보내기 형식 ("zip", "docx", "html")
+        cache_dir: 캐시 디렉토리 (기본값: EXPORT_CACHE_DIR)
+
+    Returns:
+        내보내기 파일 경로
+    """
+    if kind not in _WRITERS:
+        raise ValueError(f"지원하지 않는 내보내기 형식입니다: {kind}")
+
+    cache_dir = cache_dir or EXPORT_CACHE_DIR
+    extension, _ = EXPORT_FORMATS[kind]
+    output_path = os.path.join(cache_dir, f"{export_hash(result)}.{extension}")
+    if _touch(output_path):
+        return output_path
+
+    with _build_lock:
+        if _touch(output_path):
+            return output_path
+        os.makedirs(cache_dir, exist_ok=True)
+        # 쓰는 도중의 파일이 캐시로 보이지 않도록 임시 파일에 쓴 뒤 교체
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                _WRITERS[kind](result, f)
+            os.replace(tmp_path, output_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        _evict_exports(cache_dir, keep=output_path)
+    return output_path
+
+
+def export_loader(result: Dict[str, Any], kind: str) -> Callable[[], bytes]:
+    """
+    다운로드 버튼에 넘길 지연 로더를 반환합니다.
+    버튼을 누를 때만 파일을 만들거나(캐시가 없으면) 읽습니다.
+    """
+    def load() -> bytes:
+        with open(build_export(result, kind), "rb") as f:
+            return f.read()
+    return load
+
+
+def file_loader(path: str) -> Callable[[], bytes]:
+    """파일을 다운로드 버튼을 누를 때만 읽는 지연 로더를 반환합니다."""
+    def load() -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+    return load
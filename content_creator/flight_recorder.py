@@ -0,0 +1,473 @@
+"""
+에이전트 실행 기록/재생 (flight recorder)
+root_agent 실행 한 번의 LiteLlm 턴, 구조화 생성(chat.completions.parse),
+이미지 생성(images.generate) 요청/응답과 도구 호출, 각 호출의 시작 시각/소요 시간을
+번들 파일 하나(JSONL, .gz 면 압축)에 기록하고, 같은 실행을 네트워크 없이 기록된 응답으로
+다시 돌려 오케스트레이션 오버헤드를 재현합니다.
+
+- LiteLlm 턴과 도구 호출은 ADK 플러그인(FlightRecorderPlugin)으로 기록/재생합니다.
+  플러그인은 AgentTool 로 실행되는 서브 에이전트에도 그대로 전달됩니다.
+- OpenAI 호출은 record_openai_client() 로 감싼 클라이언트가 flight_recording() 블록 안에서만
+  기록/재생하며, 블록 밖에서는 원래 클라이언트를 그대로 호출합니다.
+- 재생 시 응답은 기록된 소요 시간 × speed 만큼 기다린 뒤 돌려줍니다 (0 이면 바로, 1 이면 원래 속도).
+  요청은 호출 종류(stream)별로 요청 내용 해시가 같은 기록을 먼저 찾고, 없으면 순서대로 대응시키며
+  해시가 달랐던 수를 mismatches 로 셉니다.
+- 도구는 재생 중에도 실제로 실행되고(내부 모델 호출만 재생),
+  기록과 재생의 도구 순서/소요 시간을 비교할 수 있습니다.
+
+실행: python benchmarks/flight_recorder.py record|replay|show ...
+"""
+import asyncio
+import contextvars
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from google.adk.plugins.base_plugin import BasePlugin
+
+BUNDLE_VERSION = 1
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+class ReplayMismatchError(RuntimeError):
+    """재생 중 기록에 대응하는 응답이 없음."""
+
+
+def _to_jsonable(value: Any) -> Any:
+    """pydantic 응답 객체 등을 JSON 으로 저장할 수 있는 값으로 바꿉니다."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json", exclude_none=True)
+    if isinstance(value, dict):
+        return {str(k): _to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_jsonable(v) for v in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if hasattr(value, "__dict__"):
+        return {k: _to_jsonable(v) for k, v in vars(value).items() if not k.startswith("_")}
+    return str(value)
+
+
+def _strip_ids(value: Any) -> Any:
+    # ADK 가 실행마다 새로 만드는 function call id 는 요청 해시에서 제외
+    if isinstance(value, dict):
+        return {k: _strip_ids(v) for k, v in value.items() if k != "id"}
+    if isinstance(value, list):
+        return [_strip_ids(v) for v in value]
+    return value
+
+
+def request_key(payload: Any) -> str:
+    """요청 내용 해시 (키 순서와 실행마다 바뀌는 id 무관)."""
+    data = json.dumps(
+        _strip_ids(_to_jsonable(payload)), ensure_ascii=False, sort_keys=True, default=str
+    )
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+
+def _open_bundle(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class FlightRecorder:
+    """
+    실행 한 번의 호출 기록. record 모드에서는 entries 를 모아 save() 로 번들에 쓰고,
+    replay 모드에서는 번들의 기록(recorded)으로 응답을 돌려주며
+    이번 실행에서 본 호출을 entries 에 남깁니다.
+    """
+
+    def __init__(self, mode: str = RECORD, path: Optional[str] = None, speed: float = 1.0):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"지원하지 않는 모드: {mode} ({RECORD} / {REPLAY})")
+        self.mode = mode
+        self.path = path
+        self.speed = max(0.0, speed)
+        self.meta: Dict[str, Any] = {}
+        self.entries: List[Dict[str, Any]] = []
+        self.recorded: List[Dict[str, Any]] = []
+        self.recorded_meta: Dict[str, Any] = {}
+        self.mismatches = 0
+        self._origin = time.monotonic()
+        self._lock = threading.Lock()
+        self._pending: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        if mode == REPLAY:
+            if not path:
+                raise ValueError("재생할 번들 경로가 필요합니다.")
+            self._load(path)
+
+    # --- 번들 ---
+
+    def _load(self, path: str) -> None:
+        with _open_bundle(path, "r") as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        if not lines or lines[0].get("type") != "header":
+            raise ValueError(f"flight recorder 번들이 아닙니다: {path}")
+        self.recorded_meta = lines[0].get("meta") or {}
+        self.recorded = lines[1:]
+        for entry in self.recorded:
+            if "response" in entry or "error" in entry:
+                self._pending[entry["stream"]].append(entry)
+
+    def save(self, path: Optional[str] = None) -> str:
+        """기록한 호출을 시작 시각 순으로 번들에 씁니다."""
+        path = path or self.path
+        if not path:
+            raise ValueError("번들 경로가 필요합니다.")
+        header = {
+            "type": "header",
+            "version": BUNDLE_VERSION,
+            "created": time.time(),
+            "meta": self.meta,
+        }
+        with _open_bundle(path, "w") as f:
+            for record in [header] + sorted(self.entries, key=lambda e: e["start"]):
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        return path
+
+    # --- 기록/재생 ---
+
+    def now(self) -> float:
+        """기록 시작 기준 경과 시간 (초)."""
+        return time.monotonic() - self._origin
+
+    def add(self, stream: str, start: float, **fields: Any) -> Dict[str, Any]:
+        """호출 1건을 entries 에 추가합니다."""
+        entry = {
+            "stream": stream,
+            "start": round(start, 6),
+            "duration": round(self.now() - start, 6),
+            **fields,
+        }
+        with self._lock:
+            entry["seq"] = len(self.entries)
+            self.entries.append(entry)
+        return entry
+
+    def take(self, stream: str, key: str) -> Dict[str, Any]:
+        """
+        재생할 기록을 꺼냅니다 (같은 해시 우선, 없으면 같은 종류의 다음 기록).
+
+        Raises:
+            ReplayMismatchError: 이 종류의 기록이 더 없을 때
+        """
+        with self._lock:
+            queue = self._pending.get(stream) or []
+            for index, entry in enumerate(queue):
+                if entry.get("key") == key:
+                    return queue.pop(index)
+            if not queue:
+                raise ReplayMismatchError(f"기록에 없는 호출입니다: {stream} ({key})")
+            self.mismatches += 1
+            return queue.pop(0)
+
+    def unused(self) -> int:
+        """재생에서 쓰이지 않은 기록 수."""
+        with self._lock:
+            return sum(len(queue) for queue in self._pending.values())
+
+    def replay_delay(self, entry: Dict[str, Any]) -> float:
+        return float(entry.get("duration") or 0.0) * self.speed
+
+    @staticmethod
+    def replay_result(entry: Dict[str, Any], load: Callable[[Any], Any]) -> Any:
+        if "error" in entry:
+            raise RuntimeError(f"(재생) {entry['error']}")
+        return load(entry["response"])
+
+    def call(
+        self, stream: str, payload: Any, call: Callable[[], Any], load: Callable[[Any], Any]
+    ) -> Any:
+        """동기 호출을 기록하거나 기록된 응답으로 재생합니다."""
+        key = request_key(payload)
+        start = self.now()
+        if self.mode == REPLAY:
+            entry = self.take(stream, key)
+            time.sleep(self.replay_delay(entry))
+            self.add(stream, start, key=key)
+            return self.replay_result(entry, load)
+        try:
+            result = call()
+        except Exception as e:
+            self.add(
+                stream,
+                start,
+                key=key,
+                request=_to_jsonable(payload),
+                error=f"{type(e).__name__}: {e}",
+            )
+            raise
+        self.add(
+            stream, start, key=key, request=_to_jsonable(payload), response=_to_jsonable(result)
+        )
+        return result
+
+    async def call_async(
+        self, stream: str, payload: Any, call: Callable[[], Any], load: Callable[[Any], Any]
+    ) -> Any:
+        """비동기 호출을 기록하거나 기록된 응답으로 재생합니다 (call 은 awaitable 을 반환)."""
+        key = request_key(payload)
+        start = self.now()
+        if self.mode == REPLAY:
+            entry = self.take(stream, key)
+            await asyncio.sleep(self.replay_delay(entry))
+            self.add(stream, start, key=key)
+            return self.replay_result(entry, load)
+        try:
+            result = await call()
+        except Exception as e:
+            self.add(
+                stream,
+                start,
+                key=key,
+                request=_to_jsonable(payload),
+                error=f"{type(e).__name__}: {e}",
+            )
+            raise
+        self.add(
+            stream, start, key=key, request=_to_jsonable(payload), response=_to_jsonable(result)
+        )
+        return result
+
+
+_active_recorder: contextvars.ContextVar[Optional[FlightRecorder]] = contextvars.ContextVar(
+    "content_flight_recorder", default=None
+)
+
+
+def active_recorder() -> Optional[FlightRecorder]:
+    """현재 블록에서 기록/재생 중인 recorder (없으면 None)."""
+    return _active_recorder.get()
+
+
+@contextmanager
+def flight_recording(recorder: FlightRecorder) -> Iterator[FlightRecorder]:
+    """
+    이 블록 안의 OpenAI 호출을 recorder 로 기록/재생합니다.
+    record 모드에서 경로가 있으면 블록이 끝날 때(예외가 나도) 번들을 저장합니다.
+    """
+    token = _active_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _active_recorder.reset(token)
+        if recorder.mode == RECORD and recorder.path:
+            recorder.save()
+
+
+# --- OpenAI 클라이언트 ---
+
+def _chat_payload(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    payload = {k: v for k, v in kwargs.items() if k != "timeout"}
+    response_format = payload.get("response_format")
+    if isinstance(response_format, type):
+        payload["response_format"] = response_format.__name__
+    return payload
+
+
+def _chat_loader(kwargs: Dict[str, Any]) -> Callable[[Any], Any]:
+    def load(data: Any) -> Any:
+        from openai.types.chat import ParsedChatCompletion
+
+        response_format = kwargs.get("response_format")
+        model = (
+            ParsedChatCompletion[response_format]
+            if isinstance(response_format, type)
+            else ParsedChatCompletion
+        )
+        return model.model_validate(data)
+
+    return load
+
+
+def _load_images(data: Any) -> Any:
+    from openai.types import ImagesResponse
+
+    return ImagesResponse.model_validate(data)
+
+
+class _Namespace:
+    def __init__(self, **attributes: Any):
+        self.__dict__.update(attributes)
+
+
+class RecordedOpenAI:
+    """
+    OpenAI / AsyncOpenAI 클라이언트 래퍼.
+    beta.chat.completions.parse 와 images.generate 만 기록/재생하고
+    나머지 속성은 원래 클라이언트로 넘깁니다.
+    """
+
+    def __init__(self, client: Any, is_async: bool = False):
+        self._client = client
+        self._is_async = is_async
+        parse, generate = (
+            (self._parse_async, self._generate_async) if is_async else (self._parse, self._generate)
+        )
+        self.beta = _Namespace(chat=_Namespace(completions=_Namespace(parse=parse)))
+        self.images = _Namespace(generate=generate)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def _parse(self, **kwargs: Any) -> Any:
+        recorder = active_recorder()
+
+        def call() -> Any:
+            return self._client.beta.chat.completions.parse(**kwargs)
+
+        if recorder is None:
+            return call()
+        return recorder.call("chat", _chat_payload(kwargs), call, _chat_loader(kwargs))
+
+    def _generate(self, **kwargs: Any) -> Any:
+        recorder = active_recorder()
+
+        def call() -> Any:
+            return self._client.images.generate(**kwargs)
+
+        if recorder is None:
+            return call()
+        return recorder.call(
+            "image", {k: v for k, v in kwargs.items() if k != "timeout"}, call, _load_images
+        )
+
+    async def _parse_async(self, **kwargs: Any) -> Any:
+        recorder = active_recorder()
+
+        def call() -> Any:
+            return self._client.beta.chat.completions.parse(**kwargs)
+
+        if recorder is None:
+            return await call()
+        return await recorder.call_async("chat", _chat_payload(kwargs), call, _chat_loader(kwargs))
+
+    async def _generate_async(self, **kwargs: Any) -> Any:
+        recorder = active_recorder()
+
+        def call() -> Any:
+            return self._client.images.generate(**kwargs)
+
+        if recorder is None:
+            return await call()
+        return await recorder.call_async(
+            "image", {k: v for k, v in kwargs.items() if k != "timeout"}, call, _load_images
+        )
+
+
+def record_openai_client(client: Any, is_async: bool = False) -> Any:
+    """OpenAI 클라이언트를 기록/재생 래퍼로 감쌉니다 (None 이면 그대로)."""
+    if client is None or isinstance(client, RecordedOpenAI):
+        return client
+    return RecordedOpenAI(client, is_async)
+
+
+# --- ADK 플러그인 ---
+
+class FlightRecorderPlugin(BasePlugin):
+    """
+    LiteLlm 턴과 도구 호출을 recorder 로 기록/재생하는 ADK 플러그인.
+    재생 모드에서는 before_model_callback 이 기록된 LlmResponse 를 돌려주므로
+    모델을 호출하지 않습니다.
+    """
+
+    def __init__(self, recorder: FlightRecorder, name: str = "flight_recorder"):
+        super().__init__(name=name)
+        self.recorder = recorder
+        self._model_calls: Dict[tuple, tuple] = {}
+        self._tool_calls: Dict[str, float] = {}
+
+    @staticmethod
+    def _model_payload(llm_request) -> Dict[str, Any]:
+        return {
+            "model": llm_request.model,
+            "contents": [
+                content.model_dump(mode="json", exclude_none=True)
+                for content in llm_request.contents
+            ],
+        }
+
+    async def before_model_callback(self, *, callback_context, llm_request):
+        stream = f"llm:{callback_context.agent_name}"
+        payload = self._model_payload(llm_request)
+        key = request_key(payload)
+        start = self.recorder.now()
+        if self.recorder.mode == REPLAY:
+            from google.adk.models.llm_response import LlmResponse
+
+            entry = self.recorder.take(stream, key)
+            await asyncio.sleep(self.recorder.replay_delay(entry))
+            self.recorder.add(stream, start, key=key)
+            return self.recorder.replay_result(entry, LlmResponse.model_validate)
+        self._model_calls[(callback_context.invocation_id, callback_context.agent_name)] = (
+            start,
+            key,
+            payload,
+        )
+        return None
+
+    async def after_model_callback(self, *, callback_context, llm_response):
+        if self.recorder.mode == REPLAY or llm_response.partial:
+            return None
+        started = self._model_calls.pop(
+            (callback_context.invocation_id, callback_context.agent_name), None
+        )
+        if started is not None:
+            start, key, payload = started
+            self.recorder.add(
+                f"llm:{callback_context.agent_name}",
+                start,
+                key=key,
+                request=payload,
+                response=llm_response.model_dump(mode="json", exclude_none=True),
+            )
+        return None
+
+    async def on_model_error_callback(self, *, callback_context, llm_request, error):
+        started = self._model_calls.pop(
+            (callback_context.invocation_id, callback_context.agent_name), None
+        )
+        if started is not None and self.recorder.mode == RECORD:
+            start, key, payload = started
+            self.recorder.add(
+                f"llm:{callback_context.agent_name}",
+                start,
+                key=key,
+                request=payload,
+                error=f"{type(error).__name__}: {error}",
+            )
+        return None
+
+    async def before_tool_callback(self, *, tool, tool_args, tool_context):
+        self._tool_calls[tool_context.function_call_id] = self.recorder.now()
+        return None
+
+    async def after_tool_callback(self, *, tool, tool_args, tool_context, result):
+        start = self._tool_calls.pop(tool_context.function_call_id, None)
+        if start is not None:
+            self.recorder.add(
+                f"tool:{tool.name}",
+                start,
+                agent=tool_context.agent_name,
+                args=_to_jsonable(tool_args),
+                result=_to_jsonable(result),
+            )
+        return None
+
+
+def timeline_summary(entries: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """호출 종류(stream)별 횟수와 소요 시간 합계."""
+    summary: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"count": 0, "seconds": 0.0})
+    for entry in entries:
+        item = summary[entry["stream"]]
+        item["count"] += 1
+        item["seconds"] += float(entry.get("duration") or 0.0)
+    return dict(summary)
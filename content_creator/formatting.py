@@ -0,0 +1,434 @@
+"""
+콘텐츠 렌더링 엔진
+같은 raw_content 로부터 텍스트/Markdown/HTML 출력을 만듭니다.
+
+- 템플릿은 모듈 로드 시 1번만 파싱(컴파일)해 두고 반복 사용합니다.
+- 출력은 문자열 += 대신 리스트에 모은 뒤 한 번에 join 하므로 섹션 수에 선형입니다.
+- 텍스트 박스의 폭은 East Asian Width 기준(한글/이모지 = 2칸)으로 계산합니다.
+- 섹션 조각은 (형식, 출력, 번호, 제목, 내용) 기준으로 캐싱되므로, 섹션 하나만 바뀌면
+  그 섹션만 다시 렌더링됩니다.
+"""
+import html
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+OUTPUT_FORMATS = ("text", "markdown", "html")
+
+
+# ---------------------------------------------------------------------------
+# 표시 폭 계산
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=8192)
+def char_width(char: str) -> int:
+    """터미널/고정폭 글꼴 기준 문자 1개의 표시 폭을 반환합니다."""
+    if unicodedata.combining(char) or char in "\u200b\u200d\ufe0f":
+        return 0
+    return 2 if unicodedata.east_asian_width(char) in ("W", "F") else 1
+
+
+def display_width(text: str) -> int:
+    """문자열의 표시 폭을 반환합니다 (한글, 한자, 이모지는 2칸)."""
+    if text.isascii():
+        return len(text)
+    return sum(char_width(char) for char in text)
+
+
+def truncate(text: str, width: int) -> str:
+    """표시 폭이 width 를 넘지 않도록 문자열을 자릅니다."""
+    if display_width(text) <= width:
+        return text
+    total = 0
+    for idx, char in enumerate(text):
+        total += char_width(char)
+        if total > width:
+            return text[:idx]
+    return text
+
+
+def pad(text: str, width: int, align: str = "<") -> str:
+    """표시 폭 기준으로 정렬/패딩합니다. 넘치는 부분은 잘라냅니다."""
+    text = truncate(text, width)
+    gap = width - display_width(text)
+    if align == ">":
+        return " " * gap + text
+    if align == "^":
+        left = gap // 2
+        return " " * left + text + " " * (gap - left)
+    return text + " " * gap
+
+
+def wrap(text: str, width: int) -> List[str]:
+    """표시 폭 기준으로 줄바꿈합니다 (띄어쓰기 우선, 긴 단어는 글자 단위로 분리)."""
+    lines: List[str] = []
+    for paragraph in text.splitlines() or [""]:
+        current, current_width = "", 0
+        for word in paragraph.split(" "):
+            word_width = display_width(word)
+            needed = word_width + (1 if current else 0)
+            if current_width + needed <= width:
+                current = f"{current} {word}" if current else word
+                current_width += needed
+                continue
+            if current:
+                lines.append(current)
+                current, current_width = "", 0
+            for char in word:
+                w = char_width(char)
+                if current_width + w > width and current:
+                    lines.append(current)
+                    current, current_width = "", 0
+                current += char
+                current_width += w
+        lines.append(current)
+    return lines
+
+
+# ---------------------------------------------------------------------------
+# 템플릿
+# ---------------------------------------------------------------------------
+
+class Template:
+    """
+    `{field}` 또는 `{field:<40}` 형태의 자리표시자를 가진 템플릿.
+    생성 시 1번만 파싱하고, render_into 는 출력 리스트에 조각을 추가만 합니다.
+    정렬 지정(<, ^, >)과 폭은 표시 폭 기준으로 적용됩니다.
+    """
+
+    _FIELD = re.compile(r"\{(\w+)(?::([<^>])(\d+))?\}")
+
+    def __init__(self, source: str):
+        self._parts = []
+        position = 0
+        for match in self._FIELD.finditer(source):
+            field, align, width = match.groups()
+            literal = source[position:match.start()]
+            self._parts.append((literal, field, align, int(width) if width else 0))
+            position = match.end()
+        self._tail = source[position:]
+
+    def render_into(
+        self, out: List[str], values: Dict[str, Any], escape: Callable[[str], str]
+    ) -> None:
+        for literal, field, align, width in self._parts:
+            if literal:
+                out.append(literal)
+            value = escape(str(values[field]))
+            out.append(pad(value, width, align) if width else value)
+        if self._tail:
+            out.append(self._tail)
+
+
+def _compile(
+    templates: Dict[str, Dict[str, Dict[str, str]]],
+) -> Dict[str, Dict[str, Dict[str, Template]]]:
+    return {
+        content_format: {
+            output: {part: Template(source) for part, source in parts.items()}
+            for output, parts in outputs.items()
+        }
+        for content_format, outputs in templates.items()
+    }
+
+
+_RULE = "━" * 40
+_BOX_INNER = 40
+_SECTION_BOX_INNER = 42
+_SECTION_TEXT_WIDTH = _SECTION_BOX_INNER - 2
+
+_TEMPLATES = _compile({
+    "카드뉴스": {
+        "text": {
+            "header": f"\n{_RULE}\n📌 카드뉴스: {{title}}\n{_RULE}\n\n",
+            "key_points_header": "🔑 핵심 포인트\n\n",
+            "key_point": "{number}. {point}\n",
+            "key_points_footer": "\n",
+            "section": f"\n{_RULE}\n카드 {{number}}: {{title}}\n{_RULE}\n\n{{content}}\n\n",
+            "footer": f"\n{_RULE}\n",
+        },
+        "markdown": {
+            "header": "# 📌 카드뉴스: {title}\n\n",
+            "key_points_header": "## 🔑 핵심 포인트\n\n",
+            "key_point": "{number}. {point}\n",
+            "key_points_footer": "\n",
+            "section": "---\n\n## 카드 {number}: {title}\n\n{content}\n\n",
+            "footer": "---\n",
+        },
+        "html": {
+            "header": "<article class=\"card-news\">\n<h1>📌 카드뉴스: {title}</h1>\n",
+            "key_points_header": "<section class=\"key-points\">\n<h2>🔑 핵심 포인트</h2>\n<ol>\n",
+            "key_point": "<li>{point}</li>\n",
+            "key_points_footer": "</ol>\n</section>\n",
+            "section": (
+                "<section class=\"card\">\n<h2>카드 {number}: {title}</h2>\n"
+                "<p>{content}</p>\n</section>\n"
+            ),
+            "footer": "</article>\n",
+        },
+    },
+    "뉴스레터": {
+        "text": {
+            "header": (
+                f"\n╔{'═' * _BOX_INNER}╗\n║{{title:^{_BOX_INNER}}}║\n"
+                f"╚{'═' * _BOX_INNER}╝\n\n"
+            ),
+            "introduction": "📬 인사말\n\n{introduction}\n\n",
+            "section": f"{_RULE}\n📰 {{title}}\n{_RULE}\n\n{{content}}\n\n",
+            "conclusion": f"{_RULE}\n💭 마무리\n\n{{conclusion}}\n\n",
+            "footer": "\n" + "=" * 50 + "\n이 뉴스레터가 유용하셨나요? 피드백을 남겨주세요!\n",
+        },
+        "markdown": {
+            "header": "# {title}\n\n",
+            "introduction": "## 📬 인사말\n\n{introduction}\n\n",
+            "section": "## 📰 {title}\n\n{content}\n\n",
+            "conclusion": "## 💭 마무리\n\n{conclusion}\n\n",
+            "footer": "---\n\n이 뉴스레터가 유용하셨나요? 피드백을 남겨주세요!\n",
+        },
+        "html": {
+            "header": "<article class=\"newsletter\">\n<h1>{title}</h1>\n",
+            "introduction": (
+                "<section class=\"introduction\">\n<h2>📬 인사말</h2>\n"
+                "<p>{introduction}</p>\n</section>\n"
+            ),
+            "section": "<section>\n<h2>📰 {title}</h2>\n<p>{content}</p>\n</section>\n",
+            "conclusion": (
+                "<section class=\"conclusion\">\n<h2>💭 마무리</h2>\n"
+                "<p>{conclusion}</p>\n</section>\n"
+            ),
+            "footer": (
+                "<footer>이 뉴스레터가 유용하셨나요? 피드백을 남겨주세요!</footer>\n"
+                "</article>\n"
+            ),
+        },
+    },
+    "인포그래픽": {
+        "text": {
+            "header": (
+                f"\n┏{'━' * _BOX_INNER}┓\n┃{' ' * _BOX_INNER}┃\n"
+                f"┃{{title:^{_BOX_INNER}}}┃\n┃{' ' * _BOX_INNER}┃\n┗{'━' * _BOX_INNER}┛\n\n"
+            ),
+            "statistics_header": "📈 주요 통계\n\n",
+            "statistic": "  • {label}: {value}\n",
+            "statistics_footer": "\n",
+            "visual_elements_header": "🎨 시각적 요소\n\n",
+            "visual_element": "  [{type}] {description}\n",
+            "visual_elements_footer": "\n",
+            "section_header": (
+                f"\n┌{'─' * _SECTION_BOX_INNER}┐\n│ {{title:<{_SECTION_TEXT_WIDTH}}} │\n"
+                f"├{'─' * _SECTION_BOX_INNER}┤\n│{' ' * _SECTION_BOX_INNER}│\n"
+            ),
+            "section_line": f"│ {{line:<{_SECTION_TEXT_WIDTH}}} │\n",
+            "section_footer": f"│{' ' * _SECTION_BOX_INNER}│\n└{'─' * _SECTION_BOX_INNER}┘\n\n",
+            "footer": (
+                "\n" + "━" * 50 + "\n💡 인포그래픽은 시각적 요소와 함께 보시면 더 효과적입니다.\n"
+            ),
+        },
+        "markdown": {
+            "header": "# 📊 {title}\n\n",
+            "statistics_header": "## 📈 주요 통계\n\n| 항목 | 값 |\n| --- | --- |\n",
+            "statistic": "| {label} | {value} |\n",
+            "statistics_footer": "\n",
+            "visual_elements_header": "## 🎨 시각적 요소\n\n",
+            "visual_element": "- **{type}** {description}\n",
+            "visual_elements_footer": "\n",
+            "section_header": "## {title}\n\n",
+            "section_line": "{line}\n",
+            "section_footer": "\n",
+            "footer": "---\n\n💡 인포그래픽은 시각적 요소와 함께 보시면 더 효과적입니다.\n",
+        },
+        "html": {
+            "header": "<article class=\"infographic\">\n<h1>📊 {title}</h1>\n",
+            "statistics_header": "<section class=\"statistics\">\n<h2>📈 주요 통계</h2>\n<table>\n",
+            "statistic": "<tr><th>{label}</th><td>{value}</td></tr>\n",
+            "statistics_footer": "</table>\n</section>\n",
+            "visual_elements_header": (
+                "<section class=\"visual-elements\">\n<h2>🎨 시각적 요소</h2>\n<ul>\n"
+            ),
+            "visual_element": "<li><strong>{type}</strong> {description}</li>\n",
+            "visual_elements_footer": "</ul>\n</section>\n",
+            "section_header": "<section>\n<h2>{title}</h2>\n",
+            "section_line": "<p>{line}</p>\n",
+            "section_footer": "</section>\n",
+            "footer": (
+                "<footer>💡 인포그래픽은 시각적 요소와 함께 보시면 더 효과적입니다.</footer>\n"
+                "</article>\n"
+            ),
+        },
+    },
+})
+
+_ESCAPES: Dict[str, Callable[[str], str]] = {
+    "text": lambda value: value,
+    "markdown": lambda value: value.replace("|", "\\|") if "|" in value else value,
+    "html": lambda value: html.escape(value, quote=False),
+}
+
+
+# ---------------------------------------------------------------------------
+# 형식별 조립
+# ---------------------------------------------------------------------------
+
+def _section_card_news(
+    emit: Callable[..., None], number: int, title: str, content: str, output: str
+) -> None:
+    emit("section", number=number, title=title, content=content)
+
+
+def _section_newsletter(
+    emit: Callable[..., None], number: int, title: str, content: str, output: str
+) -> None:
+    emit("section", title=title, content=content)
+
+
+def _section_infographic(
+    emit: Callable[..., None], number: int, title: str, content: str, output: str
+) -> None:
+    emit("section_header", title=f"{number}. {title}" if output == "text" else title)
+    if output == "text":
+        # 박스 안에 들어가도록 200자까지만, 표시 폭 기준으로 줄바꿈
+        for line in wrap(content[:200], _SECTION_TEXT_WIDTH):
+            emit("section_line", line=line)
+    else:
+        emit("section_line", line=content)
+    emit("section_footer")
+
+
+def _emit_card_news(
+    emit: Callable[..., None],
+    emit_section: Callable[..., None],
+    content_data: Dict[str, Any],
+    output: str,
+) -> None:
+    emit("header", title=content_data.get("title", "제목 없음"))
+
+    key_points = content_data.get("key_points", [])
+    if key_points:
+        emit("key_points_header")
+        for number, point in enumerate(key_points[:5], 1):
+            emit("key_point", number=number, point=point)
+        emit("key_points_footer")
+
+    for number, section in enumerate(content_data.get("sections", []), 1):
+        emit_section(number, section.get("title", f"섹션 {number}"), section.get("content", ""))
+
+    emit("footer")
+
+
+def _emit_newsletter(
+    emit: Callable[..., None],
+    emit_section: Callable[..., None],
+    content_data: Dict[str, Any],
+    output: str,
+) -> None:
+    emit("header", title=content_data.get("title", "뉴스레터 제목"))
+
+    introduction = content_data.get("introduction", "")
+    if introduction:
+        emit("introduction", introduction=introduction)
+
+    for number, section in enumerate(content_data.get("sections", []), 1):
+        emit_section(number, section.get("title", ""), section.get("content", ""))
+
+    conclusion = content_data.get("conclusion", "")
+    if conclusion:
+        emit("conclusion", conclusion=conclusion)
+
+    emit("footer")
+
+
+def _emit_infographic(
+    emit: Callable[..., None],
+    emit_section: Callable[..., None],
+    content_data: Dict[str, Any],
+    output: str,
+) -> None:
+    emit("header", title=f"📊 {content_data.get('title', '인포그래픽 제목')}" if output == "text"
+         else content_data.get("title", "인포그래픽 제목"))
+
+    stats = content_data.get("statistics", [])
+    if stats:
+        emit("statistics_header")
+        for stat in stats:
+            emit("statistic", label=stat.get("label", ""), value=stat.get("value", ""))
+        emit("statistics_footer")
+
+    visual_elements = content_data.get("visual_elements", [])
+    if visual_elements:
+        emit("visual_elements_header")
+        for element in visual_elements:
+            emit(
+                "visual_element",
+                type=element.get("type", ""),
+                description=element.get("description", ""),
+            )
+        emit("visual_elements_footer")
+
+    for number, section in enumerate(content_data.get("sections", []), 1):
+        emit_section(number, section.get("title", f"섹션 {number}"), section.get("content", ""))
+
+    emit("footer")
+
+
+_ASSEMBLERS = {
+    "카드뉴스": (_emit_card_news, _section_card_news),
+    "뉴스레터": (_emit_newsletter, _section_newsletter),
+    "인포그래픽": (_emit_infographic, _section_infographic),
+}
+
+
+def _emitter(out: List[str], content_format: str, output: str) -> Callable[..., None]:
+    templates = _TEMPLATES[content_format][output]
+    escape = _ESCAPES[output]
+
+    def emit(part: str, **values: Any) -> None:
+        templates[part].render_into(out, values, escape)
+
+    return emit
+
+
+@lru_cache(maxsize=4096)
+def render_section(content_format: str, output: str, number: int, title: str, content: str) -> str:
+    """섹션 1개의 렌더링 결과를 반환합니다 (같은 입력이면 캐시된 조각을 재사용)."""
+    out: List[str] = []
+    assemble_section = _ASSEMBLERS[content_format][1]
+    assemble_section(_emitter(out, content_format, output), number, title, content, output)
+    return "".join(out)
+
+
+def render_content(content_data: Dict[str, Any], content_format: str, output: str = "text") -> str:
+    """
+    콘텐츠를 지정한 출력 형식으로 렌더링합니다.
+
+    Args:
+        content_data: raw_content 딕셔너리
+        content_format: 콘텐츠 형식 (카드뉴스/뉴스레터/인포그래픽, 그 외는 뉴스레터)
+        output: 출력 형식 ("text", "markdown", "html")
+
+    Returns:
+        렌더링된 문자열
+    """
+    if output not in OUTPUT_FORMATS:
+        raise ValueError(f"지원하지 않는 출력 형식입니다: {output}")
+    if content_format not in _ASSEMBLERS:
+        content_format = "뉴스레터"  # 기본값
+
+    out: List[str] = []
+
+    def emit_section(number: int, title: str, content: str) -> None:
+        out.append(render_section(content_format, output, number, str(title), str(content)))
+
+    assemble = _ASSEMBLERS[content_format][0]
+    assemble(_emitter(out, content_format, output), emit_section, content_data, output)
+    return "".join(out)
+
+
+def render_all(
+    content_data: Dict[str, Any], content_format: str, outputs: Optional[List[str]] = None
+) -> Dict[str, str]:
+    """여러 출력 형식을 한 번에 렌더링합니다."""
+    return {
+        output: render_content(content_data, content_format, output)
+        for output in (outputs or OUTPUT_FORMATS)
+    }
@@ -0,0 +1,411 @@
+"""
+백그라운드 콘텐츠 생성 작업
+Streamlit 세션을 막지 않도록 콘텐츠 생성을 별도 스레드의 이벤트 루프에서 실행하고,
+단계별 진행 상황(참고자료 처리 → 텍스트 생성 → 이미지 n/N)을 UI 가 폴링할 수 있게 합니다.
+
+취소하면 작업 태스크에 asyncio 취소가 전달되어, 진행 중인 OpenAI 텍스트/이미지 요청
+(AsyncOpenAI → httpx 연결)까지 함께 중단됩니다.
+요청 마감 시간(deadline)을 넘기면 각 단계가 스스로 멈추며, 그래도 끝나지 않는 작업은
+유예 시간 뒤에 취소됩니다.
+"""
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .deadline import Deadline, DeadlineExceededError
+from .openai_clients import close_async_openai_client
+
+# 동시에 실행할 백그라운드 작업 수
+CONTENT_JOB_WORKERS = max(1, int(os.getenv("CONTENT_JOB_WORKERS", "2")))
+
+# 로컬 모드에서 생성한 이미지를 저장할 디렉토리 (작업별 하위 디렉토리)
+CONTENT_OUTPUT_DIR = os.getenv(
+    "CONTENT_OUTPUT_DIR",
+    os.path.join(tempfile.gettempdir(), "content_creator", "outputs"),
+)
+
+# 끝난 작업을 메모리에 보관하는 시간 (초)
+CONTENT_JOB_RETENTION_SECONDS = 3600
+
+# 마감 시간이 지나도 하위 단계가 멈추지 않을 때 작업을 강제로 취소하기까지의 유예 시간 (초)
+CONTENT_JOB_DEADLINE_GRACE_SECONDS = 5.0
+
+STAGE_LABELS = {
+    "queued": "대기 중",
+    "ingestion": "참고자료 처리",
+    "text": "텍스트 생성",
+    "images": "이미지 생성",
+    "server": "서버에서 생성",
+    "done": "완료",
+}
+
+
+class ContentJob:
+    """백그라운드 작업 1건의 상태 (여러 스레드에서 읽고 쓰므로 잠금으로 보호)."""
+
+    def __init__(self, job_id: str, topic: str, content_format: str):
+        self.id = job_id
+        self.topic = topic
+        self.content_format = content_format
+        self.status = "queued"  # queued / running / success / error / cancelled
+        self.stage = "queued"
+        self.done = 0
+        self.total = 0
+        self.result: Optional[Dict[str, Any]] = None
+        self.partial: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._cancel_requested = False
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("success", "error", "cancelled")
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_requested
+
+    def report(self, stage: str, done: int = 0, total: int = 0) -> None:
+        """현재 단계와 단계 내 진행 수를 기록합니다."""
+        with self._lock:
+            self.stage = stage
+            self.done = done
+            self.total = total
+
+    def publish(self, partial: Dict[str, Any]) -> None:
+        """스트리밍 중인 중간 결과를 기록합니다 (UI 가 미리보기로 표시)."""
+        with self._lock:
+            self.partial = partial
+
+    def snapshot(self) -> Dict[str, Any]:
+        """UI 표시용 상태 사본을 반환합니다."""
+        with self._lock:
+            return {
+                "id": self.id,
+                "status": self.status,
+                "stage": self.stage,
+                "stage_label": STAGE_LABELS.get(self.stage, self.stage),
+                "done": self.done,
+                "total": self.total,
+                "error": self.error,
+                "partial": self.partial,
+                "elapsed": (self.finished_at or time.time()) - self.created_at,
+            }
+
+    def cancel(self) -> bool:
+        """작업 취소를 요청합니다. 실행 중이면 진행 중인 요청까지 취소됩니다."""
+        with self._lock:
+            if self.finished:
+                return False
+            self._cancel_requested = True
+            loop, task = self._loop, self._task
+        if loop is not None and task is not None:
+            loop.call_soon_threadsafe(task.cancel)
+        return True
+
+    def _finish(
+        self, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None
+    ) -> None:
+        with self._lock:
+            self.status = status
+            self.result = result
+            self.error = error
+            self.stage = "done" if status == "success" else self.stage
+            self.finished_at = time.time()
+            self._loop = None
+            self._task = None
+
+
+class LocalArtifactContext:
+    """
+    ToolContext 대신 사용하는 로컬 artifact 저장소.
+    image_builder 의 이미지 생성 흐름이 필요로 하는 state / list_artifacts / save_artifact 만
+    제공하며, artifact 는 output_dir 아래 파일로 저장합니다.
+    """
+
+    def __init__(self, output_dir: str, state: Optional[Dict[str, Any]] = None):
+        self.output_dir = output_dir
+        self.state: Dict[str, Any] = state if state is not None else {}
+        self._versions: Dict[str, int] = {}
+        os.makedirs(output_dir, exist_ok=True)
+
+    def path_for(self, filename: str) -> str:
+        return os.path.join(self.output_dir, filename)
+
+    async def list_artifacts(self) -> List[str]:
+        return sorted(os.listdir(self.output_dir))
+
+    async def save_artifact(
+        self, filename: str, artifact: Any, mime_type: Optional[str] = None
+    ) -> int:
+        data = getattr(getattr(artifact, "inline_data", None), "data", artifact)
+        path = self.path_for(filename)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self._versions[filename] = self._versions.get(filename, -1) + 1
+        return self._versions[filename]
+
+    async def link_artifact(self, filename: str, blob_key: str) -> Optional[int]:
+        """이미지 캐시 blob 을 복사하지 않고 하드링크로 저장합니다 (링크할 수 없으면 None)."""
+        from .subagents.image_builder.cache import get_image_cache
+
+        if not await asyncio.to_thread(get_image_cache().link, blob_key, self.path_for(filename)):
+            return None
+        self._versions[filename] = self._versions.get(filename, -1) + 1
+        return self._versions[filename]
+
+
+async def run_local_content_job(
+    job: ContentJob,
+    topic: str,
+    content_format: str,
+    reference_files: Optional[List[str]] = None,
+    deadline: Optional[Deadline] = None,
+) -> Dict[str, Any]:
+    """
+    로컬 모드: 텍스트 생성 후 이미지까지 만들어 파일 경로를 결과에 담습니다.
+    마감 시간이 있으면 이미지 단계는 텍스트 생성 후 남은 시간 안에서만 진행됩니다.
+    모델/이미지 호출 비용은 작업 ID 를 요청 ID 로 장부에 기록하고 합계를 결과의 cost 에 담습니다.
+    """
+    from .agent import create_content_base_async
+    from .ledger import get_cost_ledger, request_scope
+
+    with request_scope(job.id, content_format=content_format):
+        result = await create_content_base_async(
+            topic, content_format, reference_files, progress=job.report, deadline=deadline
+        )
+
+        job.report("images", 0, 0)
+        await generate_local_images(
+            result,
+            os.path.join(CONTENT_OUTPUT_DIR, job.id),
+            progress=lambda done, total: job.report("images", done, total),
+            deadline=deadline,
+        )
+    report = await asyncio.to_thread(get_cost_ledger().request_report, job.id)
+    # 섹션 재생성 등 이후 호출도 같은 요청으로 기록하도록 요청 ID 를 남김
+    result["request_id"] = job.id
+    result["cost"] = {key: value for key, value in report.items() if key != "entries"}
+    return result
+
+
+async def generate_local_images(
+    result: Dict[str, Any],
+    output_dir: Optional[str] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    deadline: Optional[Deadline] = None,
+) -> Dict[str, Any]:
+    """
+    로컬 모드 이미지 생성. output_dir 의 파일을 artifact 로 쓰고,
+    어떤 내용으로 만든 파일인지(image_artifact_keys)를 결과의 image_state 에 남겨 두므로
+    섹션을 다시 생성한 뒤 다시 호출하면 바뀐 섹션의 이미지만 새로 만듭니다.
+    result 의 images / image_errors / image_state 를 갱신하고 이미지 생성 결과를 반환합니다.
+    """
+    from .content_store import CONTENT_STATE_KEY
+    from .subagents.image_builder.tools import run_image_generation
+
+    image_state = result.get("image_state") or {}
+    output_dir = (
+        output_dir
+        or image_state.get("output_dir")
+        or os.path.join(CONTENT_OUTPUT_DIR, uuid.uuid4().hex[:12])
+    )
+    context = LocalArtifactContext(
+        output_dir,
+        state={
+            CONTENT_STATE_KEY: result,
+            "image_artifact_keys": dict(image_state.get("artifact_keys") or {}),
+        },
+    )
+    image_result = await run_image_generation(context, progress=progress, deadline=deadline)
+    result["images"] = [
+        context.path_for(info["filename"])
+        for info in image_result.get("generated_images", [])
+        if info.get("filename")
+    ]
+    result.pop("image_errors", None)
+    if image_result.get("errors"):
+        result["image_errors"] = image_result["errors"]
+    result["image_state"] = {
+        "output_dir": output_dir,
+        "artifact_keys": context.state.get("image_artifact_keys", {}),
+    }
+    return image_result
+
+
+def refresh_local_images(
+    result: Dict[str, Any], deadline: Optional[Deadline] = None
+) -> Dict[str, Any]:
+    """
+    generate_local_images 의 동기 버전
+    (Streamlit 에서 섹션을 다시 생성한 뒤 바뀐 이미지만 다시 만들 때 사용).
+    """
+
+    async def run() -> Dict[str, Any]:
+        try:
+            return await generate_local_images(result, deadline=deadline)
+        finally:
+            await close_async_openai_client()
+
+    return asyncio.run(run())
+
+
+async def run_remote_content_job(
+    job: ContentJob,
+    topic: str,
+    content_format: str,
+    reference_files: Optional[List[str]] = None,
+    session_id: Optional[str] = None,
+    deadline: Optional[Deadline] = None,
+) -> Dict[str, Any]:
+    """
+    Cloud 모드: ADK 서버의 /run_sse 스트림을 작업 스레드에서 받으며 중간 결과를 게시합니다.
+    취소하면 다음 이벤트를 받는 시점에 스트림 연결을 닫으므로 서버 실행도 함께 중단됩니다.
+    마감 시각은 세션 state 로 서버에 전달되어 서버 쪽 도구들도 남은 시간만 사용합니다.
+    """
+    from .adk_client import stream_content_via_adk
+
+    def consume() -> Dict[str, Any]:
+        final: Dict[str, Any] = {}
+        stream = stream_content_via_adk(
+            topic,
+            content_format,
+            reference_files,
+            session_id=session_id,
+            should_stop=lambda: job.cancel_requested,
+            deadline=deadline,
+        )
+        for snapshot in stream:
+            job.publish(snapshot)
+            job.report(snapshot.get("stage", "server"), 0, 0)
+            final = snapshot
+        return final
+
+    job.report("server", 0, 0)
+    result = await asyncio.to_thread(consume)
+    if job.cancel_requested:
+        raise asyncio.CancelledError()
+    if result.get("partial", True):
+        raise RuntimeError("ADK 서버 스트림이 완료되지 않았습니다.")
+    return result
+
+
+class JobManager:
+    """백그라운드 작업 제출/조회를 담당합니다 (프로세스 공용)."""
+
+    def __init__(self, max_workers: int = CONTENT_JOB_WORKERS):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="content-job"
+        )
+        self._jobs: Dict[str, ContentJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        runner: Callable[..., Awaitable[Dict[str, Any]]],
+        topic: str,
+        content_format: str,
+        **kwargs: Any,
+    ) -> ContentJob:
+        """
+        작업을 제출하고 바로 반환합니다.
+
+        Args:
+            runner: async runner(job, topic, content_format, **kwargs) -> 결과 dict
+            topic: 콘텐츠 주제
+            content_format: 콘텐츠 형식
+            **kwargs: runner 에 넘길 추가 인자
+
+        Returns:
+            제출된 작업 (진행 상황은 job.snapshot() 으로 조회)
+        """
+        job = ContentJob(uuid.uuid4().hex[:12], topic, content_format)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        self._executor.submit(asyncio.run, self._drive(job, runner, topic, content_format, kwargs))
+        return job
+
+    def get(self, job_id: Optional[str]) -> Optional[ContentJob]:
+        with self._lock:
+            return self._jobs.get(job_id) if job_id else None
+
+    async def _drive(
+        self, job: ContentJob, runner, topic: str, content_format: str, kwargs: Dict[str, Any]
+    ) -> None:
+        try:
+            await self._run_job(job, runner, topic, content_format, kwargs)
+        finally:
+            # 작업마다 루프가 따로 있으므로 이 루프에서 연 OpenAI 커넥션을 닫고 끝냄
+            await close_async_openai_client()
+
+    async def _run_job(
+        self, job: ContentJob, runner, topic: str, content_format: str, kwargs: Dict[str, Any]
+    ) -> None:
+        deadline: Optional[Deadline] = kwargs.get("deadline")
+        task = asyncio.ensure_future(runner(job, topic, content_format, **kwargs))
+        with job._lock:
+            job._loop = asyncio.get_running_loop()
+            job._task = task
+            job.status = "running"
+            cancel_requested = job._cancel_requested
+        if cancel_requested:
+            task.cancel()
+
+        try:
+            if deadline is None:
+                result = await task
+            else:
+                # 하위 단계가 마감을 지키지 못하면 유예 시간 뒤 작업 전체를 취소
+                try:
+                    result = await asyncio.wait_for(
+                        task, max(0.0, deadline.remaining()) + CONTENT_JOB_DEADLINE_GRACE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    if task.cancelled() and not job.cancel_requested:
+                        message = "요청 마감 시간을 넘겨 작업을 중단했습니다."
+                        raise DeadlineExceededError(message) from None
+                    raise
+        except asyncio.CancelledError:
+            job._finish("cancelled")
+        except Exception as e:
+            job._finish("error", error=str(e))
+        else:
+            if result.get("status") == "error":
+                job._finish(
+                    "error", result=result, error=result.get("error") or result.get("message")
+                )
+            else:
+                job._finish("success", result=result)
+
+    def _prune(self) -> None:
+        """보관 시간이 지난 끝난 작업을 정리합니다."""
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at and now - job.finished_at > CONTENT_JOB_RETENTION_SECONDS
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+_job_manager: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+    """프로세스 공용 작업 관리자를 가져옵니다 (싱글턴)."""
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = JobManager()
+    return _job_manager
@@ -0,0 +1,608 @@
+"""
+요청 단위 비용/토큰 장부와 예산
+카드뉴스 1건은 LLM 라우팅 턴 여러 번, 구조화 생성 1번, 이미지 모델 호출 최대 10번으로 이루어지는데,
+각 호출의 프롬프트/응답/캐시 토큰 수와 이미지 수를 요청(request_id)·사용자·콘텐츠 형식별로
+SQLite 장부에 기록하고, 단가표로 비용(USD)을 계산합니다.
+
+- 단가표는 DEFAULT_RATES 를 기본으로 하고
+  CONTENT_COST_RATES(JSON 파일 경로 또는 JSON 문자열)로 덮어씁니다.
+- CONTENT_REQUEST_BUDGET_USD / CONTENT_USER_BUDGET_USD 를 넘기면 이후의 모델/이미지 호출을 하지 않고
+  BudgetExceededError 를 발생시킵니다 (이미지는 플레이스홀더로, ADK 턴은 안내 메시지로 대체).
+- 요청 범위는 request_scope() 로 정하며, ADK 서버에서는 root_agent 가 호출(invocation) ID 를
+  state["request_id"] 로 남겨 서브 에이전트와 도구가 같은 요청으로 기록합니다.
+- 기록은 python benchmarks/ledger_report.py 로 요청/사용자/형식별로 조회할 수 있습니다.
+"""
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 장부 SQLite 파일 ("" 이면 기록하지 않음)
+CONTENT_LEDGER_DB = os.getenv(
+    "CONTENT_LEDGER_DB",
+    os.path.join(os.path.expanduser("~"), ".cache", "content_creator", "ledger.db"),
+)
+
+# 예산 (USD, 0 이면 제한 없음). 사용자 예산은 최근 CONTENT_USER_BUDGET_WINDOW_HOURS 시간 합계 기준
+CONTENT_REQUEST_BUDGET_USD = float(os.getenv("CONTENT_REQUEST_BUDGET_USD", "0"))
+CONTENT_USER_BUDGET_USD = float(os.getenv("CONTENT_USER_BUDGET_USD", "0"))
+CONTENT_USER_BUDGET_WINDOW_HOURS = float(os.getenv("CONTENT_USER_BUDGET_WINDOW_HOURS", "24"))
+
+# 단가표 덮어쓰기 (JSON 파일 경로 또는 JSON 문자열, 모델 단위로 병합)
+CONTENT_COST_RATES = os.getenv("CONTENT_COST_RATES", "")
+
+# ADK 세션 state 에 요청 ID 를 저장하는 키
+REQUEST_ID_STATE_KEY = "request_id"
+
+# 요청 범위가 없을 때 쓰는 사용자 ID
+DEFAULT_USER_ID = "local"
+
+# 기본 단가 (USD / 100만 토큰, per_image 는 품질 → 크기 → 장당 USD)
+DEFAULT_RATES: Dict[str, Dict[str, Any]] = {
+    "gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "output": 0.60},
+    "gpt-4o": {"input": 2.50, "cached_input": 1.25, "output": 10.00},
+    "gpt-image-1": {
+        "input": 5.00,
+        "image_input": 10.00,
+        "cached_input": 1.25,
+        "output": 40.00,
+        # usage 가 없을 때와 호출 전 예산 확인용 추정치 (quality 생략/auto 는 high 로 계산)
+        "per_image": {
+            "low": {"1024x1024": 0.011, "1024x1536": 0.016, "1536x1024": 0.016},
+            "medium": {"1024x1024": 0.042, "1024x1536": 0.063, "1536x1024": 0.063},
+            "high": {"1024x1024": 0.167, "1024x1536": 0.25, "1536x1024": 0.25},
+        },
+    },
+    "dall-e-3": {
+        "per_image": {
+            "standard": {"1024x1024": 0.04, "1024x1792": 0.08, "1792x1024": 0.08},
+            "hd": {"1024x1024": 0.08, "1024x1792": 0.12, "1792x1024": 0.12},
+        },
+    },
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ledger_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    request_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    content_format TEXT NOT NULL DEFAULT '',
+    kind TEXT NOT NULL,
+    model TEXT NOT NULL,
+    stage TEXT NOT NULL DEFAULT '',
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    cached_tokens INTEGER NOT NULL DEFAULT 0,
+    images INTEGER NOT NULL DEFAULT 0,
+    cost_usd REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_ledger_request ON ledger_entries (request_id);
+CREATE INDEX IF NOT EXISTS idx_ledger_user_ts ON ledger_entries (user_id, ts);
+CREATE INDEX IF NOT EXISTS idx_ledger_format_ts ON ledger_entries (content_format, ts);
+"""
+
+# summary() 의 group_by 값 → 컬럼
+_GROUP_COLUMNS = {
+    "request": "request_id",
+    "user": "user_id",
+    "format": "content_format",
+    "model": "model",
+}
+
+
+class BudgetExceededError(RuntimeError):
+    """요청 또는 사용자 예산을 넘겨 모델/이미지 호출을 중단함."""
+
+
+class RequestScope:
+    """비용을 기록할 요청 범위 (요청 ID, 사용자 ID, 콘텐츠 형식)."""
+
+    def __init__(self, request_id: str, user_id: str = DEFAULT_USER_ID, content_format: str = ""):
+        self.request_id = request_id
+        self.user_id = user_id
+        self.content_format = content_format
+
+
+_current_scope: contextvars.ContextVar[Optional[RequestScope]] = contextvars.ContextVar(
+    "content_request_scope", default=None
+)
+
+
+# request_scope 밖에서 한 호출을 모아 두는 범위. 호출마다 새 요청 ID 를 쓰면 예산 확인과
+# 기록이 서로 다른 요청으로 갈라져 요청 예산이 적용되지 않으므로 하나의 ID 로 모음
+_UNSCOPED = RequestScope("unscoped")
+_warned_unscoped = False
+
+
+def current_scope() -> RequestScope:
+    """현재 요청 범위 (request_scope 밖이면 경고 후 공용 "unscoped" 범위)."""
+    global _warned_unscoped
+    scope = _current_scope.get()
+    if scope is not None:
+        return scope
+    if not _warned_unscoped:
+        _warned_unscoped = True
+        logger.warning("request_scope 밖에서 비용을 기록합니다. 요청 ID \"unscoped\" 로 모읍니다.")
+    return _UNSCOPED
+
+
+@contextmanager
+def request_scope(
+    request_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    content_format: Optional[str] = None,
+) -> Iterator[RequestScope]:
+    """
+    이 블록 안의 모델/이미지 호출을 같은 요청으로 기록합니다.
+    지정하지 않은 값은 바깥 범위를 따르므로 도구 안에서 형식만 덧붙일 수 있습니다.
+    asyncio 태스크와 asyncio.to_thread 에도 그대로 전달됩니다.
+    """
+    outer = _current_scope.get()
+    scope = RequestScope(
+        request_id or (outer.request_id if outer else uuid.uuid4().hex[:12]),
+        user_id or (outer.user_id if outer else DEFAULT_USER_ID),
+        content_format or (outer.content_format if outer else ""),
+    )
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+
+
+def tool_scope(tool_context: Any, content_format: Optional[str] = None):
+    """
+    ADK 도구 컨텍스트의 state["request_id"] / user_id 로 요청 범위를 엽니다.
+    값이 없는 컨텍스트(로컬 작업용 컨텍스트 등)는 바깥 범위를 그대로 따릅니다.
+    """
+    state = getattr(tool_context, "state", None) or {}
+    return request_scope(
+        state.get(REQUEST_ID_STATE_KEY) or None,
+        getattr(tool_context, "user_id", None) or None,
+        content_format,
+    )
+
+
+def normalize_model(model: str) -> str:
+    """LiteLlm 형식 모델 이름("openai/gpt-4o-mini")을 단가표 키로 바꿉니다."""
+    return (model or "").split("/")[-1]
+
+
+def load_rates(override: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """기본 단가표에 CONTENT_COST_RATES(파일 경로 또는 JSON 문자열)를 모델 단위로 덮어씁니다."""
+    rates = {model: dict(rate) for model, rate in DEFAULT_RATES.items()}
+    override = (override if override is not None else CONTENT_COST_RATES).strip()
+    if not override:
+        return rates
+    try:
+        if override.startswith("{"):
+            custom = json.loads(override)
+        else:
+            with open(os.path.expanduser(override), encoding="utf-8") as f:
+                custom = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning("CONTENT_COST_RATES 를 읽지 못해 기본 단가를 사용합니다: %s", e)
+        return rates
+    for model, rate in custom.items():
+        rates.setdefault(normalize_model(model), {}).update(rate)
+    return rates
+
+
+def _usage_value(usage: Any, *names: str) -> int:
+    """dict / 객체 형태 usage 에서 처음 찾은 값을 정수로 반환합니다."""
+    if usage is None:
+        return 0
+    for name in names:
+        value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+        if value is not None:
+            return int(value)
+    return 0
+
+
+def _usage_details(usage: Any) -> Any:
+    if usage is None:
+        return None
+    for name in ("prompt_tokens_details", "input_tokens_details"):
+        details = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+        if details is not None:
+            return details
+    return None
+
+
+class CostLedger:
+    """
+    모델/이미지 호출 비용을 SQLite 에 기록하고 예산을 확인합니다 (프로세스 공용).
+    여러 프로세스가 같은 파일을 써도 되며, 예산 확인 중 진행 중인 호출의 추정 비용은
+    프로세스 안에서만 예약(reserve)됩니다.
+    """
+
+    def __init__(
+        self,
+        db_path: str = CONTENT_LEDGER_DB,
+        rates: Optional[Dict[str, Dict[str, Any]]] = None,
+        request_budget_usd: float = CONTENT_REQUEST_BUDGET_USD,
+        user_budget_usd: float = CONTENT_USER_BUDGET_USD,
+        user_window_hours: float = CONTENT_USER_BUDGET_WINDOW_HOURS,
+    ):
+        self.db_path = os.path.expanduser(db_path) if db_path else ""
+        self.rates = rates if rates is not None else load_rates()
+        self.request_budget_usd = request_budget_usd
+        self.user_budget_usd = user_budget_usd
+        self.user_window_hours = user_window_hours
+        self._lock = threading.Lock()
+        # _query 가 self._lock 을 쓰므로 예약표는 별도 잠금으로 보호
+        self._reservation_lock = threading.Lock()
+        self._reserved: Dict[tuple, float] = defaultdict(float)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._warned_models = set()
+
+    # --- 단가 ---
+
+    def _rate(self, model: str) -> Dict[str, Any]:
+        name = normalize_model(model)
+        rate = self.rates.get(name)
+        if rate is None:
+            if name not in self._warned_models:
+                self._warned_models.add(name)
+                logger.warning("단가표에 없는 모델이라 비용을 0 으로 기록합니다: %s", name)
+            return {}
+        return rate
+
+    def price_llm(
+        self, model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0
+    ) -> float:
+        """텍스트 모델 호출 비용 (캐시된 입력 토큰은 cached_input 단가)."""
+        rate = self._rate(model)
+        uncached = max(0, prompt_tokens - cached_tokens)
+        return (
+            uncached * rate.get("input", 0.0)
+            + cached_tokens * rate.get("cached_input", rate.get("input", 0.0))
+            + completion_tokens * rate.get("output", 0.0)
+        ) / 1_000_000
+
+    def estimate_image(self, request: Dict[str, Any]) -> float:
+        """이미지 요청 1건의 추정 비용 (per_image 표, quality 생략/auto 는 가장 높은 품질)."""
+        per_image = self._rate(request.get("model", "")).get("per_image") or {}
+        if not per_image:
+            return 0.0
+        quality = request.get("quality")
+        if quality not in per_image:
+            quality = (
+                "high"
+                if "high" in per_image
+                else ("hd" if "hd" in per_image else next(iter(per_image)))
+            )
+        by_size = per_image[quality]
+        price = by_size.get(request.get("size") or "1024x1024", max(by_size.values()))
+        return price * int(request.get("n") or 1)
+
+    def price_image(self, request: Dict[str, Any], usage: Any = None) -> float:
+        """
+        이미지 모델 호출 비용.
+        토큰 usage 가 있으면 토큰 단가로, 없으면 장당 추정치로 계산합니다.
+        """
+        rate = self._rate(request.get("model", ""))
+        input_tokens = _usage_value(usage, "input_tokens", "prompt_tokens")
+        output_tokens = _usage_value(usage, "output_tokens", "completion_tokens")
+        if not (input_tokens or output_tokens) or "output" not in rate:
+            return self.estimate_image(request)
+        details = _usage_details(usage)
+        image_tokens = _usage_value(details, "image_tokens")
+        text_tokens = _usage_value(details, "text_tokens") or max(0, input_tokens - image_tokens)
+        return (
+            text_tokens * rate.get("input", 0.0)
+            + image_tokens * rate.get("image_input", rate.get("input", 0.0))
+            + output_tokens * rate.get("output", 0.0)
+        ) / 1_000_000
+
+    # --- 저장소 ---
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(os.path.abspath(self.db_path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(
+                self.db_path, timeout=10, check_same_thread=False, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        if not self.db_path:
+            return []
+        with self._lock:
+            conn = self._connection()
+            conn.row_factory = sqlite3.Row
+            return conn.execute(sql, params).fetchall()
+
+    def record(
+        self,
+        kind: str,
+        model: str,
+        cost_usd: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cached_tokens: int = 0,
+        images: int = 0,
+        stage: str = "",
+        scope: Optional[RequestScope] = None,
+    ) -> Dict[str, Any]:
+        """호출 1건을 현재 요청 범위로 장부에 기록합니다 (기록 실패는 경고만 남김)."""
+        scope = scope or current_scope()
+        entry = {
+            "ts": time.time(),
+            "request_id": scope.request_id,
+            "user_id": scope.user_id,
+            "content_format": scope.content_format or "",
+            "kind": kind,
+            "model": normalize_model(model),
+            "stage": stage,
+            "prompt_tokens": int(prompt_tokens),
+            "completion_tokens": int(completion_tokens),
+            "cached_tokens": int(cached_tokens),
+            "images": int(images),
+            "cost_usd": round(cost_usd, 8),
+        }
+        if not self.db_path:
+            return entry
+        try:
+            with self._lock:
+                columns = ", ".join(entry)
+                placeholders = ", ".join("?" * len(entry))
+                self._connection().execute(
+                    f"INSERT INTO ledger_entries ({columns}) VALUES ({placeholders})",
+                    tuple(entry.values()),
+                )
+        except sqlite3.Error as e:
+            logger.warning("비용 장부 기록 실패: %s", e)
+        return entry
+
+    def charge_llm(self, model: str, usage: Any, stage: str = "") -> Optional[Dict[str, Any]]:
+        """OpenAI chat usage(prompt/completion_tokens) 또는 ADK usage_metadata 를 기록합니다."""
+        if usage is None:
+            return None
+        prompt_tokens = _usage_value(usage, "prompt_tokens", "prompt_token_count", "input_tokens")
+        completion_tokens = _usage_value(
+            usage, "completion_tokens", "candidates_token_count", "output_tokens"
+        )
+        cached_tokens = _usage_value(_usage_details(usage), "cached_tokens") or _usage_value(
+            usage, "cached_content_token_count"
+        )
+        return self.record(
+            "llm",
+            model,
+            self.price_llm(model, prompt_tokens, completion_tokens, cached_tokens),
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cached_tokens=cached_tokens,
+            stage=stage,
+        )
+
+    def charge_image(
+        self, request: Dict[str, Any], usage: Any = None, stage: str = "images"
+    ) -> Dict[str, Any]:
+        """이미지 모델 호출 1건을 기록합니다."""
+        return self.record(
+            "image",
+            request.get("model", ""),
+            self.price_image(request, usage),
+            prompt_tokens=_usage_value(usage, "input_tokens", "prompt_tokens"),
+            completion_tokens=_usage_value(usage, "output_tokens", "completion_tokens"),
+            images=int(request.get("n") or 1),
+            stage=stage,
+        )
+
+    # --- 예산 ---
+
+    def spent(
+        self,
+        request_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        since: Optional[float] = None,
+    ) -> float:
+        """요청 또는 사용자(since 이후)의 누적 비용."""
+        if request_id is not None:
+            rows = self._query(
+                "SELECT SUM(cost_usd) FROM ledger_entries WHERE request_id = ?", (request_id,)
+            )
+        else:
+            rows = self._query(
+                "SELECT SUM(cost_usd) FROM ledger_entries WHERE user_id = ? AND ts >= ?",
+                (user_id, since or 0.0),
+            )
+        return float(rows[0][0] or 0.0) if rows else 0.0
+
+    def _limits(self, scope: RequestScope) -> List[tuple]:
+        limits = []
+        if self.request_budget_usd > 0:
+            limits.append((("request", scope.request_id), self.request_budget_usd, "요청"))
+        if self.user_budget_usd > 0:
+            limits.append((("user", scope.user_id), self.user_budget_usd, "사용자"))
+        return limits
+
+    def _spent_for(self, key: tuple) -> float:
+        if key[0] == "request":
+            return self.spent(request_id=key[1])
+        return self.spent(user_id=key[1], since=time.time() - self.user_window_hours * 3600)
+
+    def check_budget(
+        self, estimate_usd: float = 0.0, stage: str = "", scope: Optional[RequestScope] = None
+    ) -> None:
+        """
+        이번 호출(추정 비용 estimate_usd)을 해도 예산 안인지 확인합니다.
+
+        Raises:
+            BudgetExceededError: 이미 예산을 다 썼거나 이번 호출로 예산을 넘기는 경우
+        """
+        scope = scope or current_scope()
+        for key, limit, label in self._limits(scope):
+            used = self._spent_for(key) + self._reserved.get(key, 0.0)
+            if used >= limit or used + estimate_usd > limit:
+                estimate = f"(추정 ${estimate_usd:.4f})" if estimate_usd else ""
+                raise BudgetExceededError(
+                    f"{label} 예산 ${limit:.4f} 중 ${used:.4f} 를 사용해 "
+                    f"{stage or '모델'} 호출{estimate}을 하지 않습니다."
+                )
+
+    @contextmanager
+    def reserve(self, estimate_usd: float, stage: str = "") -> Iterator[None]:
+        """
+        예산을 확인하고 호출이 끝날 때까지 추정 비용을 예약합니다.
+        동시에 실행되는 이미지 호출들이 같은 남은 예산을 중복으로 쓰지 않게 합니다.
+        """
+        keys = self._reserve(estimate_usd, stage, current_scope())
+        try:
+            yield
+        finally:
+            self._release(keys, estimate_usd)
+
+    @asynccontextmanager
+    async def reserve_async(self, estimate_usd: float, stage: str = "") -> AsyncIterator[None]:
+        """reserve 의 비동기 버전 (SQLite 조회는 스레드에서 해서 이벤트 루프를 막지 않음)."""
+        keys = await asyncio.to_thread(self._reserve, estimate_usd, stage, current_scope())
+        try:
+            yield
+        finally:
+            self._release(keys, estimate_usd)
+
+    def _reserve(self, estimate_usd: float, stage: str, scope: RequestScope) -> List[tuple]:
+        keys = [key for key, _, _ in self._limits(scope)]
+        with self._reservation_lock:
+            self.check_budget(estimate_usd, stage, scope)
+            for key in keys:
+                self._reserved[key] += estimate_usd
+        return keys
+
+    def _release(self, keys: List[tuple], estimate_usd: float) -> None:
+        with self._reservation_lock:
+            for key in keys:
+                self._reserved[key] -= estimate_usd
+                if self._reserved[key] <= 1e-12:
+                    del self._reserved[key]
+
+    # --- 조회 ---
+
+    def summary(
+        self, group_by: str = "request", since: Optional[float] = None, limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """요청/사용자/형식/모델별 합계 (비용 큰 순)."""
+        column = _GROUP_COLUMNS.get(group_by)
+        if column is None:
+            raise ValueError(f"지원하지 않는 group_by: {group_by} ({' / '.join(_GROUP_COLUMNS)})")
+        rows = self._query(
+            f"""
+            SELECT {column} AS key, COUNT(DISTINCT request_id) AS requests,
+                   SUM(CASE WHEN kind = 'llm' THEN 1 ELSE 0 END) AS llm_calls,
+                   SUM(prompt_tokens) AS prompt_tokens, SUM(completion_tokens) AS completion_tokens,
+                   SUM(cached_tokens) AS cached_tokens, SUM(images) AS images,
+                   SUM(cost_usd) AS cost_usd,
+                   MIN(ts) AS first_ts, MAX(ts) AS last_ts
+            FROM ledger_entries WHERE ts >= ?
+            GROUP BY {column} ORDER BY cost_usd DESC LIMIT ?
+            """,
+            (since or 0.0, limit),
+        )
+        return [dict(row) for row in rows]
+
+    def request_report(self, request_id: str) -> Dict[str, Any]:
+        """요청 1건의 합계와 호출별 기록."""
+        entries = [
+            dict(row)
+            for row in self._query(
+                "SELECT * FROM ledger_entries WHERE request_id = ? ORDER BY ts", (request_id,)
+            )
+        ]
+        return {
+            "request_id": request_id,
+            "llm_calls": sum(1 for entry in entries if entry["kind"] == "llm"),
+            "prompt_tokens": sum(entry["prompt_tokens"] for entry in entries),
+            "completion_tokens": sum(entry["completion_tokens"] for entry in entries),
+            "cached_tokens": sum(entry["cached_tokens"] for entry in entries),
+            "images": sum(entry["images"] for entry in entries),
+            "cost_usd": round(sum(entry["cost_usd"] for entry in entries), 6),
+            "entries": entries,
+        }
+
+
+_ledger: Optional[CostLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_cost_ledger() -> CostLedger:
+    """프로세스 공용 비용 장부를 가져옵니다."""
+    global _ledger
+    if _ledger is None:
+        with _ledger_lock:
+            if _ledger is None:
+                _ledger = CostLedger()
+    return _ledger
+
+
+# --- ADK 콜백 ---
+
+def start_request_callback(callback_context) -> None:
+    """
+    root_agent 의 before_agent_callback.
+    호출(invocation) ID 를 요청 ID 로 state 에 남겨 AgentTool 로 실행되는 서브 에이전트와
+    그 도구들의 비용이 같은 요청으로 모이게 합니다.
+    """
+    callback_context.state[REQUEST_ID_STATE_KEY] = callback_context.invocation_id
+    return None
+
+
+def _callback_scope(callback_context, content_format: Optional[str]):
+    return request_scope(
+        callback_context.state.get(REQUEST_ID_STATE_KEY) or callback_context.invocation_id,
+        getattr(callback_context, "user_id", None) or None,
+        content_format,
+    )
+
+
+def model_budget_callbacks(model: str, content_format: Optional[str] = None):
+    """
+    LlmAgent 에 붙일 (before_model_callback, after_model_callback) 을 만듭니다.
+    before 는 예산을 넘겼으면 모델을 호출하지 않고 안내 응답으로 턴을 끝내고,
+    after 는 LiteLlm 응답의 usage_metadata 를 장부에 기록합니다.
+    """
+    def before_model(callback_context, llm_request):
+        with _callback_scope(callback_context, content_format):
+            try:
+                get_cost_ledger().check_budget(stage=f"{callback_context.agent_name} 턴")
+            except BudgetExceededError as e:
+                from google.adk.models.llm_response import LlmResponse
+                from google.genai import types
+
+                return LlmResponse(
+                    content=types.Content(
+                        role="model",
+                        parts=[types.Part(text=f"비용 예산을 넘겨 작업을 중단했습니다. {e}")],
+                    ),
+                    turn_complete=True,
+                )
+        return None
+
+    def after_model(callback_context, llm_response):
+        # 스트리밍 조각에는 usage 가 없고 마지막 응답에만 있음
+        if llm_response.partial or llm_response.usage_metadata is None:
+            return None
+        with _callback_scope(callback_context, content_format):
+            get_cost_ledger().charge_llm(
+                model, llm_response.usage_metadata, stage=callback_context.agent_name
+            )
+        return None
+
+    return before_model, after_model
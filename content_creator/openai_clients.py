@@ -0,0 +1,48 @@
+"""
+이벤트 루프별 비동기 OpenAI 클라이언트
+텍스트 생성(agent.py)과 이미지 생성(image_builder/tools.py)이
+같은 루프에서 커넥션 풀 하나를 같이 씁니다.
+"""
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any
+
+from .flight_recorder import record_openai_client
+
+# 비동기 OpenAI 클라이언트는 이벤트 루프마다 하나
+# (httpx 커넥션은 연 루프에 묶여 있어 루프끼리 공유할 수 없음)
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = (
+    weakref.WeakKeyDictionary()
+)
+_async_clients_lock = threading.Lock()
+
+
+def get_async_openai_client():
+    """
+    현재 이벤트 루프의 비동기 OpenAI 클라이언트를 가져옵니다.
+    백그라운드 작업은 작업마다 asyncio.run 으로 루프를 따로 만들므로,
+    루프별로 클라이언트(커넥션 풀)를 둡니다.
+    """
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다.")
+            from openai import AsyncOpenAI
+
+            client = _async_clients[loop] = record_openai_client(
+                AsyncOpenAI(api_key=api_key), is_async=True
+            )
+    return client
+
+
+async def close_async_openai_client() -> None:
+    """현재 이벤트 루프의 비동기 클라이언트를 닫습니다 (루프를 끝내기 전에 호출)."""
+    with _async_clients_lock:
+        client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
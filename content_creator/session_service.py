@@ -0,0 +1,656 @@
+"""
+SQLite(WAL) 세션 서비스
+ADK API Server 의 세션/state/이벤트를 SQLite 파일에 저장해, 서버 재시작 후에도 세션이 유지되고
+같은 DB 파일을 쓰는 여러 워커 프로세스/인스턴스가 세션을 공유할 수 있게 합니다.
+
+- WAL 모드: 읽기는 쓰기를 막지 않고, 쓰기는 busy_timeout 동안 잠금을 기다립니다.
+- 커넥션 풀: sqlite3 커넥션을 미리 열어 두고 재사용합니다 (쿼리는 asyncio.to_thread 에서 실행).
+- 이벤트 배치 저장: append_event 는 메모리의 세션을 바로 갱신하고 DB 쓰기는 큐에 모아
+  배치 크기/대기 시간이 차거나, 최종 응답 이벤트가 오거나, flush() 가 호출될 때
+  트랜잭션 하나로 씁니다.
+  같은 프로세스의 조회(get_session 등)는 항상 큐를 먼저 비우므로 자기 쓰기를 그대로 읽습니다.
+  배치에서 기록하지 못한 세션(stale 등)의 오류는 그 세션의 다음 append_event 에서 발생합니다.
+- (app_name, user_id, session_id) 복합 키와 인덱스로 세션/이벤트를 조회합니다.
+
+테이블 구조는 ADK 기본 SqliteSessionService 와 같아서 필요하면 `sqlite:///` 로 되돌릴 수 있습니다.
+
+사용 예 (저장소 루트의 services.py 가 `sqlite-wal` 스킴을 등록):
+    adk api_server --session_service_uri sqlite-wal:////data/sessions.db .
+"""
+import asyncio
+import copy
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.adk.errors import StaleSessionError
+from google.adk.errors.already_exists_error import AlreadyExistsError
+from google.adk.errors.session_not_found_error import SessionNotFoundError
+from google.adk.events.event import Event
+from google.adk.sessions.base_session_service import (
+    BaseSessionService,
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+from google.adk.sessions.session import Session
+from google.adk.sessions.state import State
+
+logger = logging.getLogger(__name__)
+
+# DB 파일 경로 (Cloud Run 에서는 여러 인스턴스가 함께 마운트하는 볼륨 경로를 지정)
+ADK_SESSION_DB_PATH = os.getenv(
+    "ADK_SESSION_DB_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "content_creator", "sessions.db"),
+)
+
+# 커넥션 풀 크기와 쓰기 잠금 대기 시간 (초)
+ADK_SESSION_POOL_SIZE = max(1, int(os.getenv("ADK_SESSION_POOL_SIZE", "4")))
+ADK_SESSION_BUSY_TIMEOUT = float(os.getenv("ADK_SESSION_BUSY_TIMEOUT", "10"))
+
+# 이벤트 배치 저장: 최대 이벤트 수와 큐에 머무는 최대 시간 (초)
+ADK_SESSION_BATCH_SIZE = max(1, int(os.getenv("ADK_SESSION_BATCH_SIZE", "32")))
+ADK_SESSION_BATCH_INTERVAL = float(os.getenv("ADK_SESSION_BATCH_INTERVAL", "0.05"))
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS app_states (
+    app_name TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    update_time REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS user_states (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id)
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    create_time REAL NOT NULL,
+    update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, id)
+);
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT NOT NULL,
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    invocation_id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    event_data TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id, id),
+    FOREIGN KEY (app_name, user_id, session_id)
+        REFERENCES sessions(app_name, user_id, id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_app_update ON sessions (app_name, update_time);
+CREATE INDEX IF NOT EXISTS idx_sessions_user_update ON sessions (app_name, user_id, update_time);
+CREATE INDEX IF NOT EXISTS idx_events_session_time
+    ON events (app_name, user_id, session_id, timestamp);
+"""
+
+SessionKey = Tuple[str, str, str]
+
+
+def _merge_state(
+    app_state: Dict[str, Any], user_state: Dict[str, Any], session_state: Dict[str, Any]
+) -> Dict[str, Any]:
+    """app/user/session state 를 ADK 접두사 규칙(app:, user:)으로 합칩니다."""
+    merged = copy.deepcopy(session_state)
+    for key, value in app_state.items():
+        merged[State.APP_PREFIX + key] = value
+    for key, value in user_state.items():
+        merged[State.USER_PREFIX + key] = value
+    return merged
+
+
+def _split_state_delta(state: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    state(delta) 를 app/user/session 으로 나눕니다 (temp: 키는 저장하지 않음).
+    JSON 으로 저장할 수 없는 값은 문자열로 바꿔 쓰기 전체가 실패하지 않게 합니다.
+    """
+    deltas: Dict[str, Dict[str, Any]] = {"app": {}, "user": {}, "session": {}}
+    for key, value in (state or {}).items():
+        if key.startswith(State.APP_PREFIX):
+            deltas["app"][key[len(State.APP_PREFIX):]] = value
+        elif key.startswith(State.USER_PREFIX):
+            deltas["user"][key[len(State.USER_PREFIX):]] = value
+        elif not key.startswith(State.TEMP_PREFIX):
+            deltas["session"][key] = value
+    return json.loads(json.dumps(deltas, default=str))
+
+
+def _load_state(value: Optional[str]) -> Dict[str, Any]:
+    state = json.loads(value) if value else {}
+    return state if isinstance(state, dict) else {}
+
+
+class _ConnectionPool:
+    """스레드 간에 나눠 쓰는 sqlite3 커넥션 풀."""
+
+    def __init__(self, db_path: str, size: int, busy_timeout: float):
+        self.db_path = db_path
+        self.size = size
+        self.busy_timeout = busy_timeout
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None: 트랜잭션은 BEGIN IMMEDIATE 로 직접 관리
+        conn = sqlite3.connect(
+            self.db_path, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout * 1000)}")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("세션 DB 커넥션 풀이 이미 닫혔습니다.")
+            if self._opened < self.size:
+                self._opened += 1
+                try:
+                    return self._connect()
+                except Exception:
+                    self._opened -= 1
+                    raise
+        return self._idle.get()
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        if self._closed:
+            conn.close()
+            return
+        self._idle.put(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class SqliteWalSessionService(BaseSessionService):
+    """WAL 모드 SQLite 에 세션을 저장하고 이벤트를 배치로 기록하는 ADK 세션 서비스."""
+
+    def __init__(
+        self,
+        db_path: str = ADK_SESSION_DB_PATH,
+        pool_size: int = ADK_SESSION_POOL_SIZE,
+        batch_size: int = ADK_SESSION_BATCH_SIZE,
+        batch_interval: float = ADK_SESSION_BATCH_INTERVAL,
+        busy_timeout: float = ADK_SESSION_BUSY_TIMEOUT,
+    ):
+        if db_path not in ("", ":memory:"):
+            directory = os.path.dirname(os.path.abspath(db_path))
+            os.makedirs(directory, exist_ok=True)
+        else:
+            # 메모리 DB 는 커넥션마다 따로 생기므로 커넥션 1개로 고정
+            pool_size = 1
+        self.db_path = db_path or ":memory:"
+        self.batch_size = max(1, batch_size)
+        self.batch_interval = max(0.0, batch_interval)
+        self._pool = _ConnectionPool(self.db_path, pool_size, busy_timeout)
+
+        # 아직 DB 에 쓰지 않은 이벤트 (세션 키 → 이벤트 목록, 큐에 넣은 순서 유지)
+        self._pending: "OrderedDict[SessionKey, Dict[str, Any]]" = OrderedDict()
+        self._pending_count = 0
+        self._pending_lock = threading.Lock()
+        # 기록하지 못한 배치의 오류 (세션 키 → 예외)
+        # 그 세션의 다음 append_event/flush 에서 발생시킴
+        self._failed: Dict[SessionKey, Exception] = {}
+        # 배치 쓰기는 한 번에 하나만 (같은 세션 이벤트 순서 보장)
+        self._flush_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+        self._run(self._create_schema)
+
+    # ---- 커넥션 ----
+
+    def _run(self, func, *args):
+        conn = self._pool.acquire()
+        try:
+            return func(conn, *args)
+        finally:
+            self._pool.release(conn)
+
+    async def _run_async(self, func, *args):
+        return await asyncio.to_thread(self._run, func, *args)
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection) -> None:
+        conn.executescript(SCHEMA_SQL)
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, func, *args):
+        """BEGIN IMMEDIATE 트랜잭션 안에서 func 를 실행합니다 (쓰기 잠금을 먼저 잡아 교착 방지)."""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = func(conn, *args)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return result
+
+    @staticmethod
+    def _get_state(conn: sqlite3.Connection, query: str, params: tuple) -> Dict[str, Any]:
+        row = conn.execute(query, params).fetchone()
+        return _load_state(row["state"]) if row else {}
+
+    def _get_app_state(self, conn: sqlite3.Connection, app_name: str) -> Dict[str, Any]:
+        return self._get_state(conn, "SELECT state FROM app_states WHERE app_name=?", (app_name,))
+
+    def _get_user_state(
+        self, conn: sqlite3.Connection, app_name: str, user_id: str
+    ) -> Dict[str, Any]:
+        return self._get_state(
+            conn,
+            "SELECT state FROM user_states WHERE app_name=? AND user_id=?",
+            (app_name, user_id),
+        )
+
+    def _upsert_app_state(
+        self, conn: sqlite3.Connection, app_name: str, delta: Dict[str, Any], now: float
+    ) -> None:
+        state = self._get_app_state(conn, app_name)
+        state.update(delta)
+        conn.execute(
+            "INSERT INTO app_states (app_name, state, update_time) VALUES (?, ?, ?) "
+            "ON CONFLICT(app_name) DO UPDATE "
+            "SET state=excluded.state, update_time=excluded.update_time",
+            (app_name, json.dumps(state), now),
+        )
+
+    def _upsert_user_state(
+        self,
+        conn: sqlite3.Connection,
+        app_name: str,
+        user_id: str,
+        delta: Dict[str, Any],
+        now: float,
+    ) -> None:
+        state = self._get_user_state(conn, app_name, user_id)
+        state.update(delta)
+        conn.execute(
+            "INSERT INTO user_states (app_name, user_id, state, update_time) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(app_name, user_id) DO UPDATE "
+            "SET state=excluded.state, update_time=excluded.update_time",
+            (app_name, user_id, json.dumps(state), now),
+        )
+
+    # ---- 세션 생성/조회/삭제 ----
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = (session_id or "").strip() or str(uuid.uuid4())
+        deltas = _split_state_delta(state or {})
+        now = time.time()
+
+        def insert(conn: sqlite3.Connection):
+            if deltas["app"]:
+                self._upsert_app_state(conn, app_name, deltas["app"], now)
+            if deltas["user"]:
+                self._upsert_user_state(conn, app_name, user_id, deltas["user"], now)
+            try:
+                conn.execute(
+                    "INSERT INTO sessions (app_name, user_id, id, state, create_time, update_time) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (app_name, user_id, session_id, json.dumps(deltas["session"]), now, now),
+                )
+            except sqlite3.IntegrityError:
+                raise AlreadyExistsError(f"Session with id {session_id} already exists.")
+            app_state = self._get_app_state(conn, app_name)
+            return app_state, self._get_user_state(conn, app_name, user_id)
+
+        app_state, user_state = await self._run_async(self._write, insert)
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=_merge_state(app_state, user_state, deltas["session"]),
+            events=[],
+            last_update_time=now,
+        )
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        await self.flush()
+
+        def select(conn: sqlite3.Connection):
+            row = conn.execute(
+                "SELECT state, update_time FROM sessions WHERE app_name=? AND user_id=? AND id=?",
+                (app_name, user_id, session_id),
+            ).fetchone()
+            if row is None:
+                return None
+            query = "SELECT event_data FROM events WHERE app_name=? AND user_id=? AND session_id=?"
+            params: List[Any] = [app_name, user_id, session_id]
+            if config and config.after_timestamp:
+                query += " AND timestamp >= ?"
+                params.append(config.after_timestamp)
+            # 같은 timestamp 는 rowid 로 저장 순서를 유지
+            query += " ORDER BY timestamp DESC, rowid DESC"
+            if config and config.num_recent_events is not None:
+                query += " LIMIT ?"
+                params.append(config.num_recent_events)
+            event_rows = conn.execute(query, params).fetchall()
+            return (
+                row,
+                [r["event_data"] for r in event_rows],
+                self._get_app_state(conn, app_name),
+                self._get_user_state(conn, app_name, user_id),
+            )
+
+        selected = await self._run_async(select)
+        if selected is None:
+            return None
+        row, event_data, app_state, user_state = selected
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=_merge_state(app_state, user_state, _load_state(row["state"])),
+            events=[Event.model_validate_json(data) for data in reversed(event_data)],
+            last_update_time=row["update_time"],
+        )
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: Optional[str] = None
+    ) -> ListSessionsResponse:
+        await self.flush()
+
+        def select(conn: sqlite3.Connection):
+            if user_id is not None:
+                rows = conn.execute(
+                    "SELECT id, user_id, state, update_time FROM sessions "
+                    "WHERE app_name=? AND user_id=? ORDER BY update_time, user_id, id",
+                    (app_name, user_id),
+                ).fetchall()
+                user_states = {user_id: self._get_user_state(conn, app_name, user_id)}
+            else:
+                rows = conn.execute(
+                    "SELECT id, user_id, state, update_time FROM sessions "
+                    "WHERE app_name=? ORDER BY update_time, user_id, id",
+                    (app_name,),
+                ).fetchall()
+                user_states = {
+                    r["user_id"]: _load_state(r["state"])
+                    for r in conn.execute(
+                        "SELECT user_id, state FROM user_states WHERE app_name=?", (app_name,)
+                    )
+                }
+            return rows, self._get_app_state(conn, app_name), user_states
+
+        rows, app_state, user_states = await self._run_async(select)
+        sessions = [
+            Session(
+                app_name=app_name,
+                user_id=row["user_id"],
+                id=row["id"],
+                state=_merge_state(
+                    app_state, user_states.get(row["user_id"], {}), _load_state(row["state"])
+                ),
+                events=[],
+                last_update_time=row["update_time"],
+            )
+            for row in rows
+        ]
+        return ListSessionsResponse(sessions=sessions)
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        with self._pending_lock:
+            self._failed.pop((app_name, user_id, session_id), None)
+            dropped = self._pending.pop((app_name, user_id, session_id), None)
+            if dropped:
+                self._pending_count -= len(dropped["events"])
+
+        def delete(conn: sqlite3.Connection):
+            conn.execute(
+                "DELETE FROM sessions WHERE app_name=? AND user_id=? AND id=?",
+                (app_name, user_id, session_id),
+            )
+
+        await self._run_async(self._write, delete)
+
+    async def get_user_state(self, *, app_name: str, user_id: str) -> Dict[str, Any]:
+        await self.flush()
+        return await self._run_async(self._get_user_state, app_name, user_id)
+
+    # ---- 이벤트 배치 저장 ----
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+
+        # temp: state 는 메모리 세션에만 적용하고 저장하지 않음 (ADK 기본 동작과 동일)
+        self._apply_temp_state(session, event)
+        event = self._trim_temp_delta_state(event)
+
+        key = (session.app_name, session.user_id, session.id)
+        # 앞서 큐에 넣은 이벤트를 기록하지 못했으면 이어서 쌓지 않고 그 오류를 알림
+        self._raise_failed(key)
+        deltas = None
+        if event.actions and event.actions.state_delta:
+            deltas = _split_state_delta(event.actions.state_delta)
+        row = (
+            event.id,
+            session.app_name,
+            session.user_id,
+            session.id,
+            event.invocation_id,
+            event.timestamp,
+            event.model_dump_json(exclude_none=True),
+        )
+
+        with self._pending_lock:
+            entry = self._pending.get(key)
+            if entry is None:
+                # 배치의 첫 이벤트 시점에 세션이 알고 있던 마지막 갱신 시각 (stale 검사 기준)
+                entry = self._pending[key] = {
+                    "base_update_time": session.last_update_time,
+                    "events": [],
+                }
+            entry["events"].append((row, deltas))
+            self._pending_count += 1
+            batch_full = self._pending_count >= self.batch_size
+
+        session.last_update_time = event.timestamp
+        self._commit_event_to_session(session, event)
+
+        # 배치가 찼거나 턴이 끝났으면(다음 요청은 다른 워커가 받을 수 있음) 바로 기록
+        if batch_full or self.batch_interval == 0 or event.is_final_response():
+            await self.flush(session)
+        else:
+            self._schedule_flush()
+        return event
+
+    def _raise_failed(self, key: SessionKey) -> None:
+        with self._pending_lock:
+            error = self._failed.pop(key, None)
+        if error is not None:
+            raise error
+
+    def _schedule_flush(self) -> None:
+        with self._pending_lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(self.batch_interval, self._flush_from_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_from_timer(self) -> None:
+        with self._pending_lock:
+            self._timer = None
+        # 세션별 실패는 _failed 에 남아 그 세션의 다음 append_event 에서 발생하고,
+        # 트랜잭션 자체가 실패했으면 배치가 큐에 되돌아가 있으므로 다시 예약
+        if self._flush_pending() is not None:
+            self._schedule_flush()
+
+    async def flush(self, session: Optional[Session] = None) -> None:
+        """
+        큐에 쌓인 이벤트를 DB 에 기록합니다 (Runner.close() 에서도 호출됨).
+        타이머가 배치를 쓰는 중이면 _flush_lock 을 잡아 끝날 때까지 기다립니다.
+        session 을 주면 그 세션 이벤트를 기록하지 못했을 때 오류를 발생시킵니다.
+        """
+        # 타이머 flush 는 _flush_lock 을 잡은 뒤에 큐를 비우므로,
+        # 큐가 비어 있고 잠금도 풀려 있으면 기록이 끝난 것
+        error = None
+        if self._pending_count or self._flush_lock.locked():
+            error = await asyncio.to_thread(self._flush_pending)
+        if session is not None:
+            key = (session.app_name, session.user_id, session.id)
+            self._raise_failed(key)
+            with self._pending_lock:
+                requeued = key in self._pending
+            if error is not None and requeued:
+                raise error
+
+    def _flush_pending(self) -> Optional[Exception]:
+        """
+        큐를 한 트랜잭션으로 기록합니다. 세션별 실패(stale 등)는 _failed 에 남기고,
+        트랜잭션 자체가 실패하면(잠금 시간 초과 등) 배치를 큐 앞에 되돌린 뒤 그 예외를 반환합니다.
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, OrderedDict()
+                self._pending_count = 0
+            if not batch:
+                return None
+            try:
+                errors = self._run(self._write, self._write_batch, batch)
+            except Exception as e:
+                logger.warning("세션 이벤트 배치 저장 실패, 큐에 되돌립니다: %s", e)
+                self._requeue(batch)
+                return e
+            if errors:
+                with self._pending_lock:
+                    self._failed.update(errors)
+            return None
+
+    def _requeue(self, batch: "OrderedDict[SessionKey, Dict[str, Any]]") -> None:
+        with self._pending_lock:
+            for key, entry in self._pending.items():
+                if key in batch:
+                    batch[key]["events"].extend(entry["events"])
+                else:
+                    batch[key] = entry
+            self._pending = batch
+            self._pending_count = sum(len(entry["events"]) for entry in batch.values())
+
+    def _write_batch(
+        self, conn: sqlite3.Connection, batch: "OrderedDict[SessionKey, Dict[str, Any]]"
+    ) -> Dict[SessionKey, Exception]:
+        """배치 하나를 한 트랜잭션으로 기록합니다. 기록하지 못한 세션별 오류를 반환합니다."""
+        errors: Dict[SessionKey, Exception] = {}
+        for (app_name, user_id, session_id), entry in batch.items():
+            row = conn.execute(
+                "SELECT state, update_time FROM sessions WHERE app_name=? AND user_id=? AND id=?",
+                (app_name, user_id, session_id),
+            ).fetchone()
+            if row is None:
+                errors[(app_name, user_id, session_id)] = SessionNotFoundError(
+                    f"Session {session_id} not found."
+                )
+                continue
+            if row["update_time"] > entry["base_update_time"]:
+                # 다른 워커가 그 사이 이 세션에 이벤트를 기록함
+                errors[(app_name, user_id, session_id)] = StaleSessionError(
+                    "The last_update_time provided in the session object is earlier than the "
+                    "update_time in storage. Please check if it is a stale session."
+                )
+                continue
+
+            session_state = _load_state(row["state"])
+            update_time = row["update_time"]
+            app_delta: Dict[str, Any] = {}
+            user_delta: Dict[str, Any] = {}
+            rows = []
+            for event_row, deltas in entry["events"]:
+                rows.append(event_row)
+                update_time = max(update_time, event_row[5])
+                if deltas:
+                    app_delta.update(deltas["app"])
+                    user_delta.update(deltas["user"])
+                    session_state.update(deltas["session"])
+
+            if app_delta:
+                self._upsert_app_state(conn, app_name, app_delta, update_time)
+            if user_delta:
+                self._upsert_user_state(conn, app_name, user_id, user_delta, update_time)
+            conn.executemany(
+                "INSERT OR REPLACE INTO events "
+                "(id, app_name, user_id, session_id, invocation_id, timestamp, event_data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute(
+                "UPDATE sessions SET state=?, update_time=? "
+                "WHERE app_name=? AND user_id=? AND id=?",
+                (json.dumps(session_state), update_time, app_name, user_id, session_id),
+            )
+        return errors
+
+    async def close(self) -> None:
+        """남은 이벤트를 기록하고 커넥션을 닫습니다."""
+        with self._pending_lock:
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        await self.flush()
+        self._pool.close()
+
+
+def session_service_from_uri(uri: str, **kwargs: Any) -> SqliteWalSessionService:
+    """
+    `sqlite-wal:///상대경로.db` / `sqlite-wal:////절대경로.db` URI 로 세션 서비스를 만듭니다.
+    쿼리 문자열로 pool_size, batch_size, batch_interval, busy_timeout 을 바꿀 수 있습니다.
+    (ADK 서비스 레지스트리 팩토리 형식: kwargs 의 agents_dir 등은 무시)
+    """
+    from urllib.parse import parse_qs, unquote, urlparse
+
+    parsed = urlparse(uri)
+    db_path = unquote(parsed.path)
+    if db_path.startswith("/"):
+        db_path = db_path[1:]
+    options = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+    return SqliteWalSessionService(
+        db_path=db_path or ADK_SESSION_DB_PATH,
+        pool_size=int(options.get("pool_size", ADK_SESSION_POOL_SIZE)),
+        batch_size=int(options.get("batch_size", ADK_SESSION_BATCH_SIZE)),
+        batch_interval=float(options.get("batch_interval", ADK_SESSION_BATCH_INTERVAL)),
+        busy_timeout=float(options.get("busy_timeout", ADK_SESSION_BUSY_TIMEOUT)),
+    )
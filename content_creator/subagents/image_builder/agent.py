@@ -1,16 +1,22 @@
 from google.adk.agents import Agent
 from google.adk.models.lite_llm import LiteLlm
+from ...ledger import model_budget_callbacks
 from .prompt import IMAGE_BUILDER_DESCRIPTION, IMAGE_BUILDER_PROMPT
 from .tools import generate_images
 
 MODEL = LiteLlm(model="openai/gpt-4o-mini")
 
+# 턴별 비용 기록과 예산 확인
+before_model, after_model = model_budget_callbacks(MODEL.model)
+
 image_builder_agent = Agent(
     name="image_builder_agent",
     description=IMAGE_BUILDER_DESCRIPTION,
     instruction=IMAGE_BUILDER_PROMPT,
     model=MODEL,
     output_key="image_builder_output",
+    before_model_callback=before_model,
+    after_model_callback=after_model,
     tools=[
         generate_images,
     ],
@@ -0,0 +1,145 @@
+"""
+이미지 생성 결과 캐시
+(모델, 최종 프롬프트, 크기, 품질) 해시를 키로 로컬 디스크에 저장하며,
+세션/사용자 구분 없이 공유합니다. 용량 상한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제합니다.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+# 캐시 디렉토리와 용량 상한 (0 이면 캐시 사용 안 함)
+IMAGE_CACHE_DIR = os.getenv(
+    "IMAGE_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "content_creator", "images"),
+)
+IMAGE_CACHE_MAX_MB = float(os.getenv("IMAGE_CACHE_MAX_MB", "512"))
+
+# 키 계산에 포함하는 이미지 요청 필드
+_KEY_FIELDS = ("model", "prompt", "size", "quality", "output_format", "background")
+
+
+def image_cache_key(request: Dict[str, Any]) -> str:
+    """이미지 요청에서 결과를 결정하는 필드만 골라 SHA-256 키를 만듭니다."""
+    material = {field: request.get(field) for field in _KEY_FIELDS}
+    encoded = json.dumps(material, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ImageCache:
+    """용량 상한과 LRU 삭제를 지원하는 내용 주소 기반 디스크 캐시."""
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def path_for(self, key: str) -> str:
+        """캐시 키에 해당하는 blob 경로를 반환합니다."""
+        return os.path.join(self.root, key[:2], f"{key}.bin")
+
+    def get(self, key: str) -> Optional[bytes]:
+        """캐시된 이미지를 읽습니다. 읽은 항목은 최근 사용으로 표시합니다."""
+        if not self.enabled:
+            return None
+        path = self.path_for(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # LRU 순서를 mtime 으로 관리
+            os.utime(path, None)
+            return data
+        except OSError:
+            return None
+
+    def put(self, key: str, data: bytes) -> Optional[str]:
+        """이미지를 캐시에 저장하고 blob 경로를 반환합니다."""
+        if not self.enabled or len(data) > self.max_bytes:
+            return None
+        path = self.path_for(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if os.path.exists(path):
+                os.utime(path, None)
+                return path
+            # 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return None
+
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += len(data)
+            self._evict_if_needed()
+        return path
+
+    def link(self, key: str, dest_path: str) -> bool:
+        """
+        캐시 blob 을 dest_path 에 하드링크합니다 (같은 이미지를 디스크에 한 번만 저장).
+        blob 이 없거나 다른 파일시스템이라 링크할 수 없으면 False.
+        """
+        if not self.enabled:
+            return False
+        tmp_path = f"{dest_path}.link"
+        try:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            os.link(self.path_for(key), tmp_path)
+            os.replace(tmp_path, dest_path)
+        except OSError:
+            return False
+        return True
+
+    def _scan(self):
+        """캐시 디렉토리의 (mtime, 크기, 경로) 목록을 반환합니다."""
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if not name.endswith(".bin"):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict_if_needed(self) -> None:
+        """용량 상한을 넘으면 가장 오래 사용하지 않은 blob 부터 삭제합니다."""
+        if self._total_bytes is not None and self._total_bytes <= self.max_bytes:
+            return
+
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            for _, size, path in sorted(entries):
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        self._total_bytes = total
+
+
+_image_cache: Optional[ImageCache] = None
+
+
+def get_image_cache() -> ImageCache:
+    """프로세스 공용 이미지 캐시를 가져옵니다 (싱글턴)."""
+    global _image_cache
+    if _image_cache is None:
+        _image_cache = ImageCache(IMAGE_CACHE_DIR, int(IMAGE_CACHE_MAX_MB * 1024 * 1024))
+    return _image_cache
@@ -0,0 +1,243 @@
+"""
+인포그래픽 로컬 렌더러
+statistics / visual_elements 를 matplotlib 차트로 그려 세로형(1080x1920) 템플릿에 배치합니다.
+렌더링은 이벤트 루프를 막지 않도록 프로세스 풀에서 실행합니다.
+"""
+import io
+import multiprocessing
+import os
+import re
+import textwrap
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from .renderer import find_font_path
+
+# 최종 인포그래픽 크기 (프롬프트에서 약속한 1080x1920)
+INFOGRAPHIC_SIZE = (1080, 1920)
+_DPI = 100
+
+# 차트 렌더링 프로세스 수
+INFOGRAPHIC_RENDER_WORKERS = max(1, int(os.getenv("INFOGRAPHIC_RENDER_WORKERS", "2")))
+
+# 한 장에 배치할 최대 차트 수
+MAX_CHARTS = 3
+
+# visual_elements.type 문자열 → 차트 종류
+_CHART_TYPE_KEYWORDS = {
+    "pie": ("pie", "donut", "원형", "파이", "도넛"),
+    "line": ("line", "trend", "꺾은선", "선 그래프", "선그래프", "추이"),
+    "bar": ("bar", "column", "histogram", "막대", "히스토그램"),
+}
+
+_PALETTE = ["#4C6EF5", "#F59F00", "#12B886", "#F03E3E", "#7950F2", "#1C7ED6", "#E64980", "#74B816"]
+
+_NUMBER_PATTERN = re.compile(r"-?\d[\d,]*(?:\.\d+)?")
+
+# 숫자 바로 뒤에 오면 통계 값으로 보는 단위 ("2023년 매출 45%" 에서 연도가 아닌 45 를 고름)
+_UNIT_PATTERN = re.compile(r"\s*(?:%|퍼센트|배|원|달러|억|만|조|천|명|개|건|점|위)")
+
+_render_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_render_pool() -> ProcessPoolExecutor:
+    """인포그래픽 렌더링용 프로세스 풀을 가져옵니다 (싱글턴)."""
+    global _render_pool
+    if _render_pool is None:
+        # fork 는 부모의 스레드(작업 스레드, 이벤트 루프)와 그 락 상태까지 복제해
+        # 자식이 멈출 수 있으므로, 작업자는 spawn 으로 새로 띄움
+        _render_pool = ProcessPoolExecutor(
+            max_workers=INFOGRAPHIC_RENDER_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _render_pool
+
+
+def parse_statistic(stat: Dict[str, Any]) -> Optional[Tuple[str, float, str]]:
+    """통계 항목에서 (라벨, 숫자 값, 단위)를 추출합니다. 숫자가 없으면 None."""
+    value_text = str(stat.get("value", ""))
+    matches = list(_NUMBER_PATTERN.finditer(value_text))
+    if not matches:
+        return None
+    # 숫자가 여러 개면 단위가 붙은 숫자, 없으면 마지막 숫자
+    with_unit = [match for match in matches if _UNIT_PATTERN.match(value_text, match.end())]
+    match = (with_unit or matches)[-1]
+    try:
+        number = float(match.group().replace(",", ""))
+    except ValueError:
+        return None
+    unit = value_text[match.end():].strip()
+    return str(stat.get("label", "")), number, unit
+
+
+def classify_chart_type(element_type: str) -> str:
+    """visual_elements 의 type 문자열을 bar / pie / line 중 하나로 매핑합니다."""
+    lowered = (element_type or "").lower()
+    for chart_type, keywords in _CHART_TYPE_KEYWORDS.items():
+        if any(keyword in lowered for keyword in keywords):
+            return chart_type
+    return "bar"
+
+
+def plan_charts(
+    statistics: List[Dict[str, Any]],
+    visual_elements: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    통계를 단위별로 묶어 차트 목록을 구성합니다.
+
+    Returns:
+        (차트 목록, 숫자로 표현할 수 없는 통계 목록)
+    """
+    chart_types = []
+    for element in visual_elements or []:
+        chart_type = classify_chart_type(element.get("type", ""))
+        if chart_type not in chart_types:
+            chart_types.append(chart_type)
+    if not chart_types:
+        chart_types = ["bar"]
+
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    facts = []
+    for stat in statistics or []:
+        parsed = parse_statistic(stat)
+        if parsed is None:
+            facts.append(stat)
+            continue
+        label, number, unit = parsed
+        groups.setdefault(unit, []).append({
+            "label": label,
+            "number": number,
+            "display": str(stat.get("value", "")),
+        })
+
+    charts = []
+    for idx, (unit, items) in enumerate(groups.items()):
+        if len(charts) >= MAX_CHARTS:
+            # 남은 항목은 텍스트로 표시
+            facts.extend({"label": item["label"], "value": item["display"]} for item in items)
+            continue
+        chart_type = chart_types[idx % len(chart_types)]
+        # 원형 차트는 양수 값이 2개 이상일 때만 의미가 있음
+        if chart_type == "pie" and (len(items) < 2 or any(item["number"] <= 0 for item in items)):
+            chart_type = "bar"
+        # 꺾은선은 점이 2개 이상이어야 함
+        if chart_type == "line" and len(items) < 2:
+            chart_type = "bar"
+        charts.append({"type": chart_type, "unit": unit, "items": items})
+
+    return charts, facts
+
+
+@lru_cache(maxsize=1)
+def _configure_matplotlib() -> None:
+    """워커 프로세스마다 1번만 matplotlib 백엔드와 한글 폰트를 설정합니다."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from matplotlib import font_manager, rcParams
+
+    font_path = find_font_path(bold=False)
+    if font_path:
+        font_manager.fontManager.addfont(font_path)
+        rcParams["font.family"] = font_manager.FontProperties(fname=font_path).get_name()
+    rcParams["axes.unicode_minus"] = False
+
+
+def _draw_chart(ax, chart: Dict[str, Any]) -> None:
+    """차트 1개를 주어진 축에 그립니다. 값 라벨은 원본 문자열 그대로 표시합니다."""
+    items = chart["items"]
+    labels = [textwrap.fill(item["label"], 10) for item in items]
+    numbers = [item["number"] for item in items]
+    displays = [item["display"] for item in items]
+    colors = [_PALETTE[i % len(_PALETTE)] for i in range(len(items))]
+
+    if chart["type"] == "pie":
+        wedges, _ = ax.pie(numbers, colors=colors, startangle=90, counterclock=False,
+                           wedgeprops={"width": 0.45, "edgecolor": "white"})
+        ax.legend(
+            wedges,
+            [f"{label} ({display})" for label, display in zip(labels, displays)],
+            loc="center left", bbox_to_anchor=(1.0, 0.5), frameon=False, fontsize=13,
+        )
+        ax.set_aspect("equal")
+        return
+
+    positions = list(range(len(items)))
+    if chart["type"] == "line":
+        ax.plot(positions, numbers, color=_PALETTE[0], linewidth=3, marker="o", markersize=9)
+        ax.fill_between(positions, numbers, color=_PALETTE[0], alpha=0.08)
+    else:
+        ax.bar(positions, numbers, color=colors, width=0.6)
+
+    for x, number, display in zip(positions, numbers, displays):
+        ax.annotate(display, (x, number), textcoords="offset points", xytext=(0, 8),
+                    ha="center", fontsize=13, fontweight="bold")
+
+    ax.set_xticks(positions)
+    ax.set_xticklabels(labels, fontsize=12)
+    ax.spines[["top", "right", "left"]].set_visible(False)
+    ax.tick_params(axis="y", labelsize=11, colors="#868E96")
+    ax.grid(axis="y", alpha=0.25)
+    ax.margins(y=0.2)
+    if chart["unit"]:
+        ax.set_ylabel(chart["unit"], fontsize=12, color="#868E96")
+
+
+def render_infographic(payload: Dict[str, Any], quality: int = 92) -> bytes:
+    """
+    인포그래픽을 렌더링해 JPEG 바이트로 반환합니다 (프로세스 풀에서 실행).
+
+    Args:
+        payload: title, statistics, visual_elements, key_points 를 담은 딕셔너리
+        quality: JPEG 품질
+    """
+    _configure_matplotlib()
+    import matplotlib.pyplot as plt
+
+    title = payload.get("title", "") or "인포그래픽"
+    charts, facts = plan_charts(
+        payload.get("statistics") or [], payload.get("visual_elements") or []
+    )
+    key_points = [str(point) for point in (payload.get("key_points") or [])][:4]
+    facts_text = [f"{fact.get('label', '')}: {fact.get('value', '')}" for fact in facts][:4]
+    notes = facts_text + key_points
+
+    width, height = INFOGRAPHIC_SIZE
+    fig = plt.figure(figsize=(width / _DPI, height / _DPI), dpi=_DPI, facecolor="white")
+
+    # 헤더
+    fig.patches.append(plt.Rectangle((0, 0.86), 1, 0.14, transform=fig.transFigure,
+                                     color="#1B2A4A", zorder=0))
+    fig.text(0.07, 0.93, textwrap.fill(title, 22), fontsize=34, fontweight="bold",
+             color="white", va="center")
+
+    # 차트 영역
+    chart_top, chart_bottom = 0.82, 0.30 if notes else 0.08
+    if charts:
+        slot = (chart_top - chart_bottom) / len(charts)
+        for idx, chart in enumerate(charts):
+            bottom = chart_top - slot * (idx + 1) + slot * 0.12
+            ax = fig.add_axes([0.12, bottom, 0.62 if chart["type"] == "pie" else 0.8, slot * 0.72])
+            _draw_chart(ax, chart)
+    else:
+        fig.text(0.5, (chart_top + chart_bottom) / 2, "표시할 수치 데이터가 없습니다",
+                 fontsize=20, color="#868E96", ha="center", va="center")
+
+    # 하단 핵심 정보
+    if notes:
+        fig.patches.append(plt.Rectangle((0.05, 0.04), 0.9, 0.23, transform=fig.transFigure,
+                                         color="#F1F3F5", zorder=0))
+        fig.text(0.08, 0.245, "핵심 정보", fontsize=20, fontweight="bold", color="#1B2A4A",
+                 va="top")
+        y = 0.205
+        for note in notes:
+            fig.text(0.08, y, "• " + textwrap.shorten(note, 60, placeholder="…"),
+                     fontsize=15, color="#343A40", va="top")
+            y -= 0.02
+
+    output = io.BytesIO()
+    fig.savefig(output, format="jpeg", dpi=_DPI, pil_kwargs={"quality": quality, "optimize": True})
+    plt.close(fig)
+    return output.getvalue()
@@ -0,0 +1,75 @@
+"""
+이미지 후처리
+모델이 만든 1024/1536 px 원본을 약속한 최종 크기로 맞추고,
+UI 미리보기용 작은 WebP 렌디션을 함께 만듭니다.
+"""
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from PIL import Image, ImageOps
+
+# 후처리 스레드 수 (Pillow 리사이즈/인코딩은 대부분 GIL 을 해제함)
+IMAGE_POSTPROCESS_WORKERS = max(1, int(os.getenv("IMAGE_POSTPROCESS_WORKERS", "4")))
+
+# 미리보기 렌디션의 최대 가로 폭
+PREVIEW_MAX_WIDTH = int(os.getenv("IMAGE_PREVIEW_MAX_WIDTH", "480"))
+
+FULL_JPEG_QUALITY = 90
+PREVIEW_WEBP_QUALITY = 75
+
+_postprocess_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_postprocess_pool() -> ThreadPoolExecutor:
+    """후처리용 스레드 풀을 가져옵니다 (싱글턴)."""
+    global _postprocess_pool
+    if _postprocess_pool is None:
+        _postprocess_pool = ThreadPoolExecutor(
+            max_workers=IMAGE_POSTPROCESS_WORKERS,
+            thread_name_prefix="image-postprocess",
+        )
+    return _postprocess_pool
+
+
+def preview_filename(filename: str) -> str:
+    """원본 artifact 이름에 대응하는 미리보기 artifact 이름을 반환합니다."""
+    stem, _ = os.path.splitext(filename)
+    return f"{stem}.preview.webp"
+
+
+def build_renditions(image_bytes: bytes, target_size: Tuple[int, int]) -> Dict[str, bytes]:
+    """
+    최종 크기 JPEG 와 미리보기 WebP 렌디션을 만듭니다.
+
+    Args:
+        image_bytes: 원본 이미지 바이트
+        target_size: 최종 (가로, 세로) 크기
+
+    Returns:
+        {"full": 최종 JPEG 바이트, "preview": 미리보기 WebP 바이트}
+    """
+    with Image.open(io.BytesIO(image_bytes)) as img:
+        original_format = img.format
+        img = img.convert("RGB")
+
+        if img.size == tuple(target_size) and original_format == "JPEG":
+            # 로컬 렌더러 결과처럼 이미 최종 크기면 다시 인코딩하지 않음
+            full_bytes = image_bytes
+            full = img
+        else:
+            # 비율이 다르면 가운데를 기준으로 잘라서 맞춤
+            full = ImageOps.fit(img, target_size, method=Image.LANCZOS)
+            output = io.BytesIO()
+            full.save(
+                output, format="JPEG", quality=FULL_JPEG_QUALITY, optimize=True, progressive=True
+            )
+            full_bytes = output.getvalue()
+
+        preview = full.copy()
+        preview.thumbnail((PREVIEW_MAX_WIDTH, PREVIEW_MAX_WIDTH * 4), Image.LANCZOS)
+        output = io.BytesIO()
+        preview.save(output, format="WEBP", quality=PREVIEW_WEBP_QUALITY, method=4)
+
+    return {"full": full_bytes, "preview": output.getvalue()}
@@ -18,5 +18,7 @@ IMAGE_BUILDER_PROMPT = """당신은 이미지 생성 전문가입니다. 주어
 사용 가능한 도구:
 - generate_images: 이미지 생성 도구
 
-콘텐츠 정보가 준비되면, generate_images 도구를 사용하여 적절한 이미지를 생성하세요."""
+콘텐츠 정보가 준비되면, generate_images 도구를 사용하여 적절한 이미지를 생성하세요.
+생성이 끝나면 이미지 목록을 나열하지 말고,
+생성된 이미지 수와 플레이스홀더/실패가 있었는지만 한 문장으로 알려주세요."""
 
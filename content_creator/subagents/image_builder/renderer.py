@@ -0,0 +1,279 @@
+"""
+카드뉴스 로컬 렌더러
+덱마다 배경 이미지 1장만 준비하고, 카드별 제목/본문/페이지 표시는 Pillow로 합성합니다.
+"""
+import colorsys
+import hashlib
+import io
+import os
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont, ImageOps
+
+# 최종 카드 크기 (프롬프트에서 약속한 1080x1080)
+CARD_SIZE = (1080, 1080)
+
+# 한글 폰트 경로 (환경 변수 우선, 없으면 일반적인 설치 경로 탐색)
+CARD_NEWS_FONT_PATH = os.getenv("CARD_NEWS_FONT_PATH", "")
+CARD_NEWS_BOLD_FONT_PATH = os.getenv("CARD_NEWS_BOLD_FONT_PATH", "")
+
+# 미리 준비된 배경 이미지 풀 디렉토리 (있으면 API 호출 없이 사용)
+CARD_NEWS_BACKGROUND_DIR = os.getenv("CARD_NEWS_BACKGROUND_DIR", "")
+
+_FONT_CANDIDATES = [
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "C:/Windows/Fonts/malgun.ttf",
+]
+
+_BOLD_FONT_CANDIDATES = [
+    "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Bold.ttc",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "C:/Windows/Fonts/malgunbd.ttf",
+]
+
+_BACKGROUND_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+
+
+class MissingKoreanFontError(RuntimeError):
+    """한글 글리프가 있는 폰트를 찾지 못했을 때 발생합니다."""
+
+
+def find_font_path(bold: bool) -> Optional[str]:
+    """사용 가능한 한글 폰트 파일 경로를 찾습니다 (카드 렌더러와 인포그래픽 차트가 같이 씀)."""
+    configured = CARD_NEWS_BOLD_FONT_PATH if bold else CARD_NEWS_FONT_PATH
+    if configured and os.path.exists(configured):
+        return configured
+    if bold and CARD_NEWS_FONT_PATH and os.path.exists(CARD_NEWS_FONT_PATH):
+        return CARD_NEWS_FONT_PATH
+
+    for path in (_BOLD_FONT_CANDIDATES if bold else _FONT_CANDIDATES):
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def has_korean_font() -> bool:
+    """로컬 렌더링에 쓸 한글 폰트가 있는지 확인합니다."""
+    return find_font_path(bold=False) is not None
+
+
+@lru_cache(maxsize=32)
+def get_font(size: int, bold: bool = False) -> ImageFont.ImageFont:
+    """크기별 폰트를 로드합니다 (프로세스 내에서 캐싱).
+
+    Pillow 기본 폰트에는 한글 글리프가 없어 글자가 두부(□)로 찍히므로,
+    한글 폰트를 찾지 못하면 기본 폰트로 대체하지 않고 MissingKoreanFontError 를 냅니다.
+    """
+    paths = [find_font_path(bold)]
+    if bold:
+        paths.append(find_font_path(bold=False))
+    for path in paths:
+        if not path:
+            continue
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:
+            continue
+    raise MissingKoreanFontError(
+        "한글 폰트를 찾을 수 없습니다. "
+        "CARD_NEWS_FONT_PATH 를 설정하거나 Nanum/Noto CJK 폰트를 설치하세요."
+    )
+
+
+def _deck_palette(seed: str) -> Tuple[Tuple[int, int, int], Tuple[int, int, int]]:
+    """주제 문자열로부터 덱 고유의 그라데이션 색상 두 개를 만듭니다."""
+    digest = hashlib.sha256(seed.encode("utf-8")).digest()
+    hue = digest[0] / 255.0
+    start = colorsys.hsv_to_rgb(hue, 0.55, 0.85)
+    end = colorsys.hsv_to_rgb((hue + 0.12) % 1.0, 0.75, 0.45)
+    return (
+        tuple(int(c * 255) for c in start),
+        tuple(int(c * 255) for c in end),
+    )
+
+
+def make_gradient_background(seed: str, size: Tuple[int, int] = CARD_SIZE) -> Image.Image:
+    """API 없이 사용할 수 있는 세로 그라데이션 배경을 생성합니다."""
+    start, end = _deck_palette(seed)
+    # 256px 그라데이션을 확대하면 픽셀 단위 루프보다 훨씬 빠릅니다
+    gradient = Image.linear_gradient("L").resize(size)
+    return Image.composite(Image.new("RGB", size, end), Image.new("RGB", size, start), gradient)
+
+
+def load_background(image_bytes: bytes, size: Tuple[int, int] = CARD_SIZE) -> Image.Image:
+    """배경 이미지 바이트를 카드 크기에 맞게 잘라 RGB 이미지로 반환합니다."""
+    with Image.open(io.BytesIO(image_bytes)) as img:
+        return ImageOps.fit(img.convert("RGB"), size, method=Image.LANCZOS)
+
+
+def pick_pool_background(seed: str) -> Optional[bytes]:
+    """배경 풀 디렉토리에서 주제에 따라 결정적으로 배경 하나를 고릅니다."""
+    if not CARD_NEWS_BACKGROUND_DIR or not os.path.isdir(CARD_NEWS_BACKGROUND_DIR):
+        return None
+
+    candidates = sorted(
+        name for name in os.listdir(CARD_NEWS_BACKGROUND_DIR)
+        if name.lower().endswith(_BACKGROUND_EXTENSIONS)
+    )
+    if not candidates:
+        return None
+
+    digest = hashlib.sha256(seed.encode("utf-8")).digest()
+    chosen = candidates[int.from_bytes(digest[:4], "big") % len(candidates)]
+    with open(os.path.join(CARD_NEWS_BACKGROUND_DIR, chosen), "rb") as f:
+        return f.read()
+
+
+def build_background_prompt(title: str) -> str:
+    """덱 전체에서 공유할 텍스트 없는 배경 이미지 프롬프트를 만듭니다."""
+    return f"""Create an abstract background image for a Korean card news deck:
+
+Topic: {title}
+
+Design requirements:
+- No text, letters, numbers or logos
+- Square format
+- Soft, modern shapes and gradients related to the topic
+- Calm center area so overlaid text stays readable
+- Attractive, consistent color scheme
+
+Style: Minimal, modern, vibrant background"""
+
+
+def _wrap_text(text: str, font: ImageFont.ImageFont, max_width: int) -> List[str]:
+    """픽셀 폭 기준으로 줄바꿈합니다 (띄어쓰기 우선, 긴 단어는 글자 단위로 분리)."""
+    lines = []
+    for paragraph in text.splitlines() or [""]:
+        current = ""
+        for word in paragraph.split(" "):
+            candidate = f"{current} {word}" if current else word
+            if font.getlength(candidate) <= max_width:
+                current = candidate
+                continue
+            if current:
+                lines.append(current)
+                current = ""
+            # 한 단어가 한 줄보다 긴 경우 글자 단위로 분리
+            for char in word:
+                if font.getlength(current + char) > max_width and current:
+                    lines.append(current)
+                    current = char
+                else:
+                    current += char
+        lines.append(current)
+    return [line for line in lines if line.strip()]
+
+
+def _clip_lines(
+    lines: List[str], max_lines: int, font: ImageFont.ImageFont, max_width: int
+) -> List[str]:
+    """최대 줄 수를 넘으면 마지막 줄을 말줄임표로 자릅니다."""
+    if len(lines) <= max_lines:
+        return lines
+    clipped = lines[:max_lines]
+    last = clipped[-1]
+    while last and font.getlength(last + "…") > max_width:
+        last = last[:-1]
+    clipped[-1] = last + "…"
+    return clipped
+
+
+def render_card(
+    background: Image.Image,
+    title: str,
+    content: str,
+    index: int,
+    total: int,
+    quality: int = 92,
+) -> bytes:
+    """배경 위에 카드 제목, 본문, "n/N" 표시를 합성해 JPEG 바이트로 반환합니다."""
+    width, height = background.size
+    margin = int(width * 0.08)
+    text_width = width - margin * 2
+
+    card = background.copy().convert("RGBA")
+
+    # 가독성을 위한 반투명 패널
+    overlay = Image.new("RGBA", card.size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(overlay)
+    panel_top = int(height * 0.22)
+    draw.rounded_rectangle(
+        (margin // 2, panel_top, width - margin // 2, height - margin),
+        radius=int(width * 0.04),
+        fill=(0, 0, 0, 150),
+    )
+    card = Image.alpha_composite(card, overlay)
+    draw = ImageDraw.Draw(card)
+
+    title_size = int(width * 0.064)
+    body_size = int(width * 0.037)
+    indicator_size = int(width * 0.033)
+    title_font = get_font(title_size, bold=True)
+    body_font = get_font(body_size)
+    indicator_font = get_font(indicator_size, bold=True)
+
+    # 제목
+    y = panel_top + margin // 2
+    title_lines = _clip_lines(_wrap_text(title, title_font, text_width), 3, title_font, text_width)
+    title_line_height = int(title_size * 1.3)
+    for line in title_lines:
+        draw.text((margin, y), line, font=title_font, fill=(255, 255, 255))
+        y += title_line_height
+
+    # 구분선
+    y += margin // 4
+    draw.line((margin, y, margin + int(text_width * 0.2), y), fill=(255, 214, 102), width=6)
+    y += margin // 2
+
+    # 본문
+    body_line_height = int(body_size * 1.55)
+    available = (height - margin - margin // 2) - y - indicator_size * 2
+    max_body_lines = max(1, available // body_line_height)
+    wrapped = _wrap_text(content, body_font, text_width)
+    body_lines = _clip_lines(wrapped, max_body_lines, body_font, text_width)
+    for line in body_lines:
+        draw.text((margin, y), line, font=body_font, fill=(235, 235, 235))
+        y += body_line_height
+
+    # 카드 번호 표시 (n/N)
+    indicator = f"{index}/{total}"
+    indicator_width = draw.textlength(indicator, font=indicator_font)
+    draw.text(
+        (width - margin - indicator_width, height - margin - margin // 2 - indicator_size),
+        indicator,
+        font=indicator_font,
+        fill=(255, 214, 102),
+    )
+
+    output = io.BytesIO()
+    card.convert("RGB").save(output, format="JPEG", quality=quality, optimize=True)
+    return output.getvalue()
+
+
+def render_placeholder(title: str, size: Tuple[int, int], quality: int = 85) -> bytes:
+    """이미지 생성이 마감 안에 끝나지 않을 때 쓰는 그라데이션 + 제목 플레이스홀더를 만듭니다."""
+    width, height = size
+    image = make_gradient_background(title or "placeholder", size)
+    draw = ImageDraw.Draw(image)
+
+    font_size = max(16, int(min(width, height) * 0.07))
+    font = get_font(font_size, bold=True)
+    max_width = int(width * 0.8)
+    lines = _clip_lines(_wrap_text(title or "", font, max_width), 3, font, max_width)
+    line_height = int(font_size * 1.3)
+
+    y = (height - line_height * len(lines)) // 2
+    for line in lines:
+        line_width = draw.textlength(line, font=font)
+        draw.text(((width - line_width) // 2, y), line, font=font, fill=(255, 255, 255))
+        y += line_height
+
+    output = io.BytesIO()
+    image.save(output, format="JPEG", quality=quality, optimize=True)
+    return output.getvalue()
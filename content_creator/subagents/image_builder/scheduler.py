@@ -0,0 +1,207 @@
+"""
+마감 시간 기반 이미지 스케줄러
+요청의 시간 예산 안에 끝나도록 이미지별 품질을 고르고,
+중요한 이미지(표지 카드, 헤더)를 먼저 생성합니다.
+예산 안에 끝낼 수 없는 이미지는 로컬 플레이스홀더로 대체되며,
+나중에 다시 생성해 업그레이드할 수 있습니다.
+
+크기(size)는 단계로 낮추지 않고 품질만 조절합니다.
+이미지 모델이 받는 가장 작은 크기가 1024 급이라 지금 요청 크기보다 줄일 수 없고,
+더 작게 만들면 후처리에서 최종 크기(카드 1080x1080 등)로 확대돼 흐려지기 때문입니다.
+"""
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+# 기본 시간 예산 (초). 비어 있으면 마감 없이 기존 품질 그대로 생성합니다.
+IMAGE_TIME_BUDGET_SECONDS = os.getenv("IMAGE_TIME_BUDGET_SECONDS", "")
+
+# 높은 품질부터 낮은 품질 순서 (gpt-image-1)
+QUALITY_TIERS = ("high", "medium", "low")
+
+# 모델별 품질 단계. 모델마다 받는 quality 값이 다름 (gpt-image-1 에 "hd" 를 보내면 거부됨)
+MODEL_QUALITY_TIERS = {
+    "gpt-image-1": QUALITY_TIERS,
+    "dall-e-3": ("hd", "standard"),
+}
+
+# 다른 모델의 품질 이름 → 같은 수준의 품질 이름
+_QUALITY_ALIASES = {
+    "hd": "high",
+    "standard": "medium",
+    "high": "hd",
+    "medium": "standard",
+    "low": "standard",
+}
+
+# 1024x1024 1장 기준 예상 소요 시간 (초). 실제 측정값이 쌓이면 그 값을 우선 사용합니다.
+_BASE_LATENCY_SECONDS = {"high": 40.0, "medium": 15.0, "low": 6.0, "hd": 20.0, "standard": 12.0}
+
+# 측정값 지수이동평균 가중치
+_EMA_ALPHA = 0.3
+
+
+def resolve_time_budget(explicit: Optional[float], state_value: Any) -> Optional[float]:
+    """도구 인자 → state → 환경 변수 순서로 시간 예산(초)을 결정합니다."""
+    for candidate in (explicit, state_value, IMAGE_TIME_BUDGET_SECONDS):
+        if candidate in (None, ""):
+            continue
+        try:
+            budget = float(candidate)
+        except (TypeError, ValueError):
+            continue
+        if budget > 0:
+            return budget
+    return None
+
+
+def quality_tiers(model: str) -> Tuple[str, ...]:
+    """모델이 받는 품질 단계 (높은 순서, 모르는 모델은 gpt-image-1 기준)."""
+    return MODEL_QUALITY_TIERS.get(model, QUALITY_TIERS)
+
+
+def normalize_quality(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    quality 를 요청 모델이 받는 이름으로 바꾼 요청을 반환합니다
+    (예: gpt-image-1 의 "hd" → "high").
+    """
+    model = request.get("model", "")
+    quality = request.get("quality")
+    if not quality or model not in MODEL_QUALITY_TIERS or quality in MODEL_QUALITY_TIERS[model]:
+        return request
+    alias = _QUALITY_ALIASES.get(quality)
+    return {
+        **request,
+        "quality": alias if alias in MODEL_QUALITY_TIERS[model] else quality_tiers(model)[0],
+    }
+
+
+def _pixel_scale(size: str) -> float:
+    """1024x1024 대비 픽셀 수 비율을 반환합니다."""
+    try:
+        width, height = (int(v) for v in str(size).split("x"))
+    except ValueError:
+        return 1.0
+    return (width * height) / (1024 * 1024)
+
+
+class ImageScheduler:
+    """이미지별 품질 선택과 예상 소요 시간 관리를 담당합니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._observed: Dict[Tuple[str, str, str], float] = {}
+
+    def estimate(self, request: Dict[str, Any], quality: Optional[str] = None) -> float:
+        """요청 1건의 예상 소요 시간(초)을 반환합니다."""
+        quality = quality or request.get("quality") or "medium"
+        key = (request.get("model", ""), quality, request.get("size", ""))
+        with self._lock:
+            observed = self._observed.get(key)
+        if observed is not None:
+            return observed
+        base = _BASE_LATENCY_SECONDS.get(quality, _BASE_LATENCY_SECONDS["medium"])
+        return base * _pixel_scale(request.get("size", "1024x1024"))
+
+    def record(self, request: Dict[str, Any], elapsed: float) -> None:
+        """실제 소요 시간을 기록해 이후 예측에 반영합니다."""
+        key = (
+            request.get("model", ""),
+            request.get("quality") or "medium",
+            request.get("size", ""),
+        )
+        with self._lock:
+            previous = self._observed.get(key)
+            self._observed[key] = elapsed if previous is None else (
+                _EMA_ALPHA * elapsed + (1 - _EMA_ALPHA) * previous
+            )
+
+    @staticmethod
+    def _tier(job: Dict[str, Any], level: int) -> str:
+        """품질 단계 번호(0 이 가장 높음)를 작업 모델의 품질 이름으로 바꿉니다."""
+        tiers = quality_tiers(job["request"].get("model", ""))
+        return tiers[min(level, len(tiers) - 1)]
+
+    def _fits(
+        self,
+        jobs: List[Dict[str, Any]],
+        levels: List[Optional[int]],
+        budget: float,
+        concurrency: int,
+    ) -> bool:
+        """우선순위 순서대로 슬롯에 배정했을 때 모두 예산 안에 끝나는지 시뮬레이션합니다."""
+        slots = [0.0] * concurrency
+        for job, level in zip(jobs, levels):
+            if level is None:
+                continue
+            slot = min(range(concurrency), key=slots.__getitem__)
+            slots[slot] += self.estimate(job["request"], self._tier(job, level))
+            if slots[slot] > budget:
+                return False
+        return True
+
+    def plan(
+        self, jobs: List[Dict[str, Any]], budget: float, concurrency: int
+    ) -> List[Dict[str, Any]]:
+        """
+        시간 예산에 맞춰 이미지별 품질을 정하고 우선순위 순서로 정렬된 작업 목록을 반환합니다.
+
+        - 모든 이미지를 같은 품질 단계로 끝낼 수 있는 가장 높은 단계를 고릅니다
+          (품질 이름은 모델별).
+        - 남는 시간이 있으면 우선순위가 높은 이미지부터 한 단계씩 품질을 올립니다.
+        - 가장 낮은 품질로도 못 끝내는 이미지는 "placeholder_only" 로 표시합니다.
+        """
+        ordered = sorted(jobs, key=lambda job: job.get("priority", 1))
+        model_jobs = [job for job in ordered if "request" in job]
+        if not model_jobs:
+            return ordered
+
+        lowest = max(len(quality_tiers(job["request"].get("model", ""))) for job in model_jobs) - 1
+        levels: List[Optional[int]] = []
+        for level in range(lowest + 1):
+            candidate = [level] * len(model_jobs)
+            if self._fits(model_jobs, candidate, budget, concurrency):
+                levels = candidate
+                break
+
+        if not levels:
+            # 가장 낮은 품질로도 모두 끝낼 수 없으면 중요한 이미지부터 채움
+            levels = [None] * len(model_jobs)
+            for idx in range(len(model_jobs)):
+                levels[idx] = lowest
+                if not self._fits(model_jobs, levels, budget, concurrency):
+                    levels[idx] = None
+
+        # 단계가 적은 모델은 자기 가장 낮은 단계로 맞춘 뒤,
+        # 남는 시간으로 중요한 이미지부터 품질 업그레이드
+        top_levels = [len(quality_tiers(job["request"].get("model", ""))) - 1 for job in model_jobs]
+        levels = [
+            None if level is None else min(level, top)
+            for level, top in zip(levels, top_levels)
+        ]
+        for idx, level in enumerate(levels):
+            if level is None:
+                continue
+            for better in range(level - 1, -1, -1):
+                trial = levels[:idx] + [better] + levels[idx + 1:]
+                if not self._fits(model_jobs, trial, budget, concurrency):
+                    break
+                levels = trial
+
+        for job, level in zip(model_jobs, levels):
+            if level is None:
+                job["placeholder_only"] = True
+            else:
+                job["request"] = {**job["request"], "quality": self._tier(job, level)}
+        return ordered
+
+
+_image_scheduler: Optional[ImageScheduler] = None
+
+
+def get_image_scheduler() -> ImageScheduler:
+    """프로세스 공용 스케줄러를 가져옵니다 (싱글턴, 측정값 공유)."""
+    global _image_scheduler
+    if _image_scheduler is None:
+        _image_scheduler = ImageScheduler()
+    return _image_scheduler
@@ -1,95 +1,149 @@
+import asyncio
 import base64
+import hashlib
+import json
+import logging
 import os
-from typing import Dict, Any, List, Optional
-from openai import OpenAI
+import time
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
 from google.adk.tools.tool_context import ToolContext
 
-# OpenAI 클라이언트 (싱글턴)
-_client = None
+from ...content_store import (
+    CONTENT_STATE_KEY,
+    IMAGE_RESULT_ARTIFACT_NAME,
+    load_content,
+    save_json_artifact,
+)
+from ...deadline import Deadline
+from ...ledger import BudgetExceededError, get_cost_ledger, tool_scope
+from ...openai_clients import get_async_openai_client
+from ...tracing import record_usage, set_attributes, start_span
+from .cache import get_image_cache, image_cache_key
+from .charts import INFOGRAPHIC_SIZE, get_render_pool, render_infographic
+from .postprocess import build_renditions, get_postprocess_pool, preview_filename
+from .renderer import (
+    CARD_SIZE,
+    build_background_prompt,
+    has_korean_font,
+    load_background,
+    make_gradient_background,
+    pick_pool_background,
+    render_card,
+    render_placeholder,
+)
+from .scheduler import get_image_scheduler, normalize_quality, resolve_time_budget
 
-def get_openai_client():
-    """OpenAI 클라이언트를 가져옵니다."""
-    global _client
-    if _client is None:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다.")
-        _client = OpenAI(api_key=api_key)
-    return _client
+logger = logging.getLogger(__name__)
 
+# 동시에 진행할 이미지 생성 요청 수 (환경 변수로 조정 가능)
+IMAGE_GENERATION_CONCURRENCY = max(1, int(os.getenv("IMAGE_GENERATION_CONCURRENCY", "4")))
 
-async def generate_images(tool_context: ToolContext):
-    """
-    콘텐츠 정보를 바탕으로 이미지를 생성합니다.
-    
-    state에서 다음 정보를 가져옵니다:
-    - content_creator_output: 콘텐츠 생성 결과
-      - format: 콘텐츠 형식 ("카드뉴스", "인포그래픽", "뉴스레터")
-      - raw_content: 원본 콘텐츠 데이터
-        - sections: 섹션 리스트 (카드뉴스/뉴스레터)
-        - statistics: 통계 데이터 (인포그래픽)
-        - visual_elements: 시각적 요소 (인포그래픽)
-    """
-    # 1) state에서 입력 꺼내기
-    content_creator_output = tool_context.state.get("content_creator_output") or {}
-    raw_content = content_creator_output.get("raw_content") or {}
-    content_format = content_creator_output.get("format", "")
-    
-    if not content_format:
-        return {
-            "status": "error",
-            "message": "콘텐츠 형식이 지정되지 않았습니다.",
-            "total_images": 0,
-            "generated_images": [],
-        }
-    
-    # 2) 기존 artifact 목록 확인
-    existing = await tool_context.list_artifacts()
-    existing_names = set()
-    if isinstance(existing, list):
-        for item in existing:
-            if isinstance(item, str):
-                existing_names.add(item)
-            elif isinstance(item, dict) and "filename" in item:
-                existing_names.add(item["filename"])
-    elif isinstance(existing, dict):
-        existing_names = set(existing.keys())
-    
-    generated_images = []
-    errors = []
-    client = get_openai_client()
-    
-    # 3) 콘텐츠 형식에 따라 이미지 생성
-    if content_format == "카드뉴스":
-        sections = raw_content.get("sections", [])
-        if not sections:
-            return {
-                "status": "error",
-                "message": "카드뉴스 섹션이 없습니다.",
-                "total_images": 0,
-                "generated_images": [],
-            }
-        
-        for idx, section in enumerate(sections, 1):
-            card_title = section.get("title", f"카드 {idx}")
-            card_content = section.get("content", "")
-            total_cards = len(sections)
-            
-            filename = f"card_{idx:02d}.jpeg"
-            
-            # 이미 있으면 스킵
-            if filename in existing_names:
-                generated_images.append({
-                    "card_number": idx,
-                    "title": card_title,
-                    "filename": filename,
-                    "cached": True,
-                })
-                continue
-            
-            try:
-                # 이미지 생성 프롬프트 구성
-                enhanced_prompt = f"""Create a modern Korean card news image for social media:
+# 카드뉴스 렌더링 방식
+# - "model": 카드마다 이미지 모델 호출 (기본값)
+# - "local": 덱 배경 1장만 준비하고 카드 텍스트는 Pillow로 합성
+CARD_NEWS_RENDER_MODE = os.getenv("CARD_NEWS_RENDER_MODE", "model").lower()
+
+# 인포그래픽 렌더링 방식
+# - "model": 이미지 모델이 차트를 그림 (기본값)
+# - "local": statistics 를 matplotlib 차트로 직접 렌더링 (정확한 수치, API 비용 없음)
+INFOGRAPHIC_RENDER_MODE = os.getenv("INFOGRAPHIC_RENDER_MODE", "model").lower()
+
+# 요청 마감이 있을 때 artifact 저장/후처리를 위해 남겨 두는 시간 (초)
+IMAGE_DEADLINE_RESERVE_SECONDS = 3.0
+
+class _DeckBackground:
+    """카드뉴스 덱 전체가 공유하는 배경 이미지 (처음 요청될 때 1번만 준비)."""
+
+    def __init__(self, title: str):
+        self.title = title
+        self._lock = asyncio.Lock()
+        self._image = None
+
+    async def get(self, semaphore: asyncio.Semaphore, deadline: Optional[float] = None):
+        async with self._lock:
+            if self._image is None:
+                self._image = await self._load(semaphore, deadline)
+        return self._image
+
+    async def _load(self, semaphore: asyncio.Semaphore, deadline: Optional[float] = None):
+        # 1) 배경 풀에 준비된 이미지가 있으면 API 호출 없이 사용
+        pooled = await asyncio.to_thread(pick_pool_background, self.title)
+        if pooled is not None:
+            return await asyncio.to_thread(load_background, pooled)
+
+        # 2) 없으면 텍스트 없는 배경 1장만 생성
+        try:
+            image_bytes, _ = await _call_image_model(semaphore, {
+                "model": "gpt-image-1",
+                "prompt": build_background_prompt(self.title),
+                "n": 1,
+                "size": "1024x1024",
+                "output_format": "jpeg",
+                "background": "opaque",
+            }, deadline)
+            return await asyncio.to_thread(load_background, image_bytes)
+        except Exception:
+            # 배경 생성에 실패하거나 마감을 넘겨도 카드 텍스트는 그라데이션 위에 합성
+            return make_gradient_background(self.title)
+
+
+def _build_local_card_news_jobs(raw_content: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """카드뉴스 섹션마다 로컬 합성 작업을 구성합니다 (배경은 덱 단위로 공유)."""
+    sections = raw_content.get("sections", [])
+    total_cards = len(sections)
+    deck_background = _DeckBackground(raw_content.get("title", "") or "card news")
+    jobs = []
+
+    for idx, section in enumerate(sections, 1):
+        card_title = section.get("title", f"카드 {idx}")
+        card_content = section.get("content", "")
+        filename = f"card_{idx:02d}.jpeg"
+
+        async def render(
+            semaphore, deadline=None, title=card_title, content=card_content, number=idx
+        ):
+            background = await deck_background.get(semaphore, deadline)
+            return await asyncio.to_thread(
+                render_card, background, title, content, number, total_cards
+            )
+
+        card_key = (
+            f"{raw_content.get('title', '')}\n{card_title}\n{card_content}\n{idx}/{total_cards}"
+        )
+        jobs.append({
+            "filename": filename,
+            "info": {
+                "card_number": idx, "title": card_title, "filename": filename, "renderer": "local"
+            },
+            "error_info": {"card_number": idx, "filename": filename},
+            "render": render,
+            "target_size": CARD_SIZE,
+            "cache_key": image_cache_key({"model": "local-card", "prompt": card_key}),
+        })
+
+    return jobs
+
+
+def _render_card_placeholder(title: str, content: str, index: int, total: int) -> bytes:
+    """마감을 넘긴 카드 대신 쓸 로컬 합성 카드를 만듭니다."""
+    return render_card(make_gradient_background(title), title, content, index, total)
+
+
+def _build_card_news_jobs(raw_content: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """카드뉴스 섹션마다 이미지 생성 작업을 구성합니다."""
+    sections = raw_content.get("sections", [])
+    total_cards = len(sections)
+    jobs = []
+
+    for idx, section in enumerate(sections, 1):
+        card_title = section.get("title", f"카드 {idx}")
+        card_content = section.get("content", "")
+        filename = f"card_{idx:02d}.jpeg"
+
+        # 이미지 생성 프롬프트 구성
+        enhanced_prompt = f"""Create a modern Korean card news image for social media:
 
 Card {idx}/{total_cards}
 Title: {card_title}
@@ -106,63 +160,43 @@ Design requirements:
 - Eye-catching visual elements
 
 Style: Modern infographic, clean typography, vibrant colors"""
-                
-                # OpenAI 이미지 생성
-                image = client.images.generate(
-                    model="gpt-image-1",
-                    prompt=enhanced_prompt,
-                    n=1,
-                    size="1024x1024",
-                    output_format="jpeg",
-                    background="opaque",
-                )
-                
-                img_b64 = image.data[0].b64_json
-                image_bytes = base64.b64decode(img_b64)
-                
-                # 4) artifact 저장
-                await tool_context.save_artifact(
-                    filename=filename,
-                    artifact=image_bytes,
-                    mime_type="image/jpeg",
-                )
-                
-                generated_images.append({
-                    "card_number": idx,
-                    "title": card_title,
-                    "filename": filename,
-                    "cached": False,
-                })
-                
-            except Exception as e:
-                errors.append({
-                    "card_number": idx,
-                    "filename": filename,
-                    "error": str(e)
-                })
-    
-    elif content_format == "인포그래픽":
-        title = raw_content.get("title", "")
-        statistics = raw_content.get("statistics", [])
-        visual_elements = raw_content.get("visual_elements", [])
-        
-        filename = "infographic.jpeg"
-        
-        if filename in existing_names:
-            generated_images.append({
-                "title": title,
-                "filename": filename,
-                "cached": True,
-            })
-        else:
-            try:
-                # 통계 데이터 텍스트 구성
-                stats_text = "\n".join([
-                    f"- {stat.get('label', '')}: {stat.get('value', '')}"
-                    for stat in statistics[:10]
-                ])
-                
-                enhanced_prompt = f"""Create a professional infographic image:
+
+        jobs.append({
+            "filename": filename,
+            "info": {"card_number": idx, "title": card_title, "filename": filename},
+            "error_info": {"card_number": idx, "filename": filename},
+            "target_size": CARD_SIZE,
+            # 표지 카드를 가장 먼저 생성
+            "priority": 0 if idx == 1 else 1,
+            "placeholder": partial(
+                _render_card_placeholder, card_title, card_content, idx, total_cards
+            ),
+            "request": {
+                "model": "gpt-image-1",
+                "prompt": enhanced_prompt,
+                "n": 1,
+                "size": "1024x1024",
+                "output_format": "jpeg",
+                "background": "opaque",
+            },
+        })
+
+    return jobs
+
+
+def _build_infographic_jobs(raw_content: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """인포그래픽 이미지 생성 작업을 구성합니다."""
+    title = raw_content.get("title", "")
+    statistics = raw_content.get("statistics") or []
+    filename = "infographic.jpeg"
+
+    # 통계 데이터 텍스트 구성
+    stats_text = "\n".join([
+        f"- {stat.get('label', '')}: {stat.get('value', '')}"
+        for stat in statistics[:10]
+    ])
+
+    enhanced_prompt = f"""Create a professional infographic image:
 
 Title: {title}
 
@@ -178,48 +212,69 @@ Design requirements:
 - Portrait format (1080x1920)
 
 Style: Data visualization, modern infographic, professional design"""
-                
-                image = client.images.generate(
-                    model="gpt-image-1",
-                    prompt=enhanced_prompt,
-                    n=1,
-                    size="1024x1792",
-                    output_format="jpeg",
-                    background="opaque",
-                    quality="hd",
-                )
-                
-                img_b64 = image.data[0].b64_json
-                image_bytes = base64.b64decode(img_b64)
-                
-                await tool_context.save_artifact(
-                    filename=filename,
-                    artifact=image_bytes,
-                    mime_type="image/jpeg",
-                )
-                
-                generated_images.append({
-                    "title": title,
-                    "filename": filename,
-                    "cached": False,
-                })
-                
-            except Exception as e:
-                errors.append({
-                    "filename": filename,
-                    "error": str(e)
-                })
-    
-    elif content_format == "뉴스레터":
-        title = raw_content.get("title", "")
-        introduction = raw_content.get("introduction", "")
-        sections = raw_content.get("sections", [])
-        
-        # 헤더 이미지
-        header_filename = "newsletter_header.jpeg"
-        if header_filename not in existing_names:
-            try:
-                header_prompt = f"""Create a professional newsletter header image:
+
+    return [{
+        "filename": filename,
+        "info": {"title": title, "filename": filename},
+        "error_info": {"filename": filename},
+        "target_size": INFOGRAPHIC_SIZE,
+        "priority": 0,
+        "placeholder": partial(render_placeholder, title, INFOGRAPHIC_SIZE),
+        "request": {
+            "model": "gpt-image-1",
+            "prompt": enhanced_prompt,
+            "n": 1,
+            "size": "1024x1536",
+            "output_format": "jpeg",
+            "background": "opaque",
+            "quality": "high",
+        },
+    }]
+
+
+def _build_local_infographic_jobs(raw_content: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """인포그래픽 로컬 차트 렌더링 작업을 구성합니다."""
+    title = raw_content.get("title", "")
+    filename = "infographic.jpeg"
+    # 프로세스 풀로 넘기므로 필요한 필드만 담은 단순 dict 로 구성
+    payload = {
+        "title": title,
+        "statistics": raw_content.get("statistics") or [],
+        "visual_elements": raw_content.get("visual_elements") or [],
+        "key_points": raw_content.get("key_points") or [],
+    }
+
+    async def render(semaphore, deadline=None):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_render_pool(), render_infographic, payload)
+
+    return [{
+        "filename": filename,
+        "info": {"title": title, "filename": filename, "renderer": "local"},
+        "error_info": {"filename": filename},
+        "render": render,
+        "target_size": INFOGRAPHIC_SIZE,
+        "cache_key": image_cache_key({
+            "model": "local-infographic",
+            "prompt": json.dumps(payload, ensure_ascii=False, sort_keys=True),
+        }),
+    }]
+
+
+# 뉴스레터 이미지 최종 크기 (가로, 세로). 프롬프트의 Landscape format 도 이 값으로 만듦
+NEWSLETTER_HEADER_SIZE = (1200, 600)
+NEWSLETTER_SECTION_SIZE = (800, 600)
+
+
+def _build_newsletter_jobs(raw_content: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """뉴스레터 헤더/섹션 이미지 생성 작업을 구성합니다."""
+    title = raw_content.get("title", "")
+    introduction = raw_content.get("introduction", "")
+    sections = raw_content.get("sections", [])
+
+    # 헤더 이미지
+    header_filename = "newsletter_header.jpeg"
+    header_prompt = f"""Create a professional newsletter header image:
 
 Title: {title}
 Introduction: {introduction[:150]}
@@ -227,57 +282,37 @@ Introduction: {introduction[:150]}
 Design requirements:
 - Professional newsletter header design
 - Elegant and sophisticated style
-- Landscape format (1200x600)
+- Landscape format ({NEWSLETTER_HEADER_SIZE[0]}x{NEWSLETTER_HEADER_SIZE[1]})
 - Clean typography
 - Subtle, professional color scheme
 
 Style: Modern newsletter header, professional, elegant"""
-                
-                image = client.images.generate(
-                    model="gpt-image-1",
-                    prompt=header_prompt,
-                    n=1,
-                    size="1792x1024",
-                    output_format="jpeg",
-                    background="opaque",
-                )
-                
-                img_b64 = image.data[0].b64_json
-                image_bytes = base64.b64decode(img_b64)
-                
-                await tool_context.save_artifact(
-                    filename=header_filename,
-                    artifact=image_bytes,
-                    mime_type="image/jpeg",
-                )
-                
-                generated_images.append({
-                    "type": "header",
-                    "filename": header_filename,
-                    "cached": False,
-                })
-            except Exception as e:
-                errors.append({
-                    "filename": header_filename,
-                    "error": str(e)
-                })
-        else:
-            generated_images.append({
-                "type": "header",
-                "filename": header_filename,
-                "cached": True,
-            })
-        
-        # 섹션 이미지 (첫 번째 섹션만)
-        if sections:
-            section_filename = "newsletter_section.jpeg"
-            if section_filename not in existing_names:
-                main_section = sections[0]
-                section_title = main_section.get("title", "")
-                section_content = main_section.get("content", "")
-                
-                try:
-                    section_prompt = f"""Create an illustration image for newsletter content:
+
+    jobs = [{
+        "filename": header_filename,
+        "info": {"type": "header", "filename": header_filename},
+        "error_info": {"filename": header_filename},
+        "target_size": NEWSLETTER_HEADER_SIZE,
+        "priority": 0,
+        "placeholder": partial(render_placeholder, title, NEWSLETTER_HEADER_SIZE),
+        "request": {
+            "model": "gpt-image-1",
+            "prompt": header_prompt,
+            "n": 1,
+            "size": "1536x1024",
+            "output_format": "jpeg",
+            "background": "opaque",
+        },
+    }]
+
+    # 섹션 이미지 (첫 번째 섹션만)
+    if sections:
+        section_filename = "newsletter_section.jpeg"
+        main_section = sections[0]
+        section_title = main_section.get("title", "")
+        section_content = main_section.get("content", "")
+
+        section_prompt = f"""Create an illustration image for newsletter content:
 
 Section Title: {section_title}
 Content Summary: {section_content[:150]}
@@ -285,46 +320,247 @@ Content Summary: {section_content[:150]}
 Design requirements:
 - Newsletter illustration style
 - Professional and engaging
-- Landscape format (800x600)
+- Landscape format ({NEWSLETTER_SECTION_SIZE[0]}x{NEWSLETTER_SECTION_SIZE[1]})
 - Clean, modern design
 
 Style: Newsletter illustration, professional, engaging"""
-                    
-                    image = client.images.generate(
-                        model="gpt-image-1",
-                        prompt=section_prompt,
-                        n=1,
-                        size="1024x1024",
-                        output_format="jpeg",
-                        background="opaque",
-                    )
-                    
-                    img_b64 = image.data[0].b64_json
-                    image_bytes = base64.b64decode(img_b64)
-                    
-                    await tool_context.save_artifact(
-                        filename=section_filename,
-                        artifact=image_bytes,
-                        mime_type="image/jpeg",
-                    )
-                    
-                    generated_images.append({
-                        "type": "section",
-                        "filename": section_filename,
-                        "cached": False,
-                    })
-                except Exception as e:
-                    errors.append({
-                        "filename": section_filename,
-                        "error": str(e)
-                    })
-            else:
-                generated_images.append({
-                    "type": "section",
-                    "filename": section_filename,
-                    "cached": True,
-                })
-    
+
+        jobs.append({
+            "filename": section_filename,
+            "info": {"type": "section", "filename": section_filename},
+            "error_info": {"filename": section_filename},
+            "target_size": NEWSLETTER_SECTION_SIZE,
+            "priority": 1,
+            "placeholder": partial(render_placeholder, section_title, NEWSLETTER_SECTION_SIZE),
+            "request": {
+                "model": "gpt-image-1",
+                "prompt": section_prompt,
+                "n": 1,
+                "size": "1536x1024",
+                "output_format": "jpeg",
+                "background": "opaque",
+            },
+        })
+
+    return jobs
+
+
+async def _call_image_model(
+    semaphore: asyncio.Semaphore,
+    request: Dict[str, Any],
+    deadline: Optional[float] = None,
+) -> Tuple[bytes, bool]:
+    """
+    세마포어로 동시 실행 수를 제한하며 이미지 모델을 1번 호출합니다.
+    같은 요청이 디스크 캐시에 있으면 API를 호출하지 않습니다.
+
+    Args:
+        semaphore: 동시 실행 제한용 세마포어
+        request: images.generate 인자
+        deadline: 이벤트 루프 시간 기준 마감 시각 (없으면 제한 없음)
+
+    Returns:
+        (이미지 바이트, 캐시 적중 여부)
+
+    Raises:
+        asyncio.TimeoutError: 마감 안에 끝날 수 없거나 마감을 넘긴 경우
+        BudgetExceededError: 이번 호출로 요청/사용자 비용 예산을 넘기는 경우
+    """
+    model = request.get("model", "")
+    with start_span(
+        f"images.generate {model}",
+        gen_ai__operation__name="images.generate",
+        gen_ai__request__model=model,
+        image__size=request.get("size"),
+        image__quality=request.get("quality"),
+    ) as span:
+        cache = get_image_cache()
+        key = image_cache_key(request)
+        cached = await asyncio.to_thread(cache.get, key)
+        set_attributes(span, image__cache_hit=cached is not None)
+        if cached is not None:
+            return cached, True
+
+        client = get_async_openai_client()
+        scheduler = get_image_scheduler()
+        ledger = get_cost_ledger()
+        loop = asyncio.get_running_loop()
+        queued = time.monotonic()
+        async with semaphore:
+            # 세마포어 대기 시간과 실제 API 시간을 구분해서 기록
+            set_attributes(span, image__queue_ms=round((time.monotonic() - queued) * 1000, 1))
+            timeout = None
+            if deadline is not None:
+                # 차례가 왔을 때 남은 시간으로 끝낼 수 없으면 바로 포기
+                timeout = deadline - loop.time()
+                if timeout < scheduler.estimate(request) * 0.5:
+                    raise asyncio.TimeoutError()
+            # 동시에 도는 호출끼리 남은 예산을 나눠 쓰도록 추정 비용을 예약한 뒤 호출
+            estimate = ledger.estimate_image(request)
+            async with ledger.reserve_async(estimate, stage="이미지 생성"):
+                started = time.monotonic()
+                image = await asyncio.wait_for(client.images.generate(**request), timeout=timeout)
+                scheduler.record(request, time.monotonic() - started)
+                await asyncio.to_thread(ledger.charge_image, request, getattr(image, "usage", None))
+        record_usage(span, getattr(image, "usage", None))
+        image_bytes = base64.b64decode(image.data[0].b64_json)
+
+        await asyncio.to_thread(cache.put, key, image_bytes)
+        return image_bytes, False
+
+
+def _use_local_renderer(mode: str, content_format: str) -> bool:
+    """로컬 렌더링을 쓸지 결정합니다. 한글 폰트가 없으면 경고를 남기고 모델 렌더링으로 돌립니다."""
+    if mode != "local":
+        return False
+    if has_korean_font():
+        return True
+    logger.warning(
+        "%s 로컬 렌더링에 쓸 한글 폰트가 없어 이미지 모델로 대신 생성합니다 "
+        "(CARD_NEWS_FONT_PATH 를 설정하거나 Nanum/Noto CJK 폰트를 설치하세요).",
+        content_format,
+    )
+    return False
+
+
+async def _save_image_artifact(tool_context, filename: str, data: bytes, mime_type: str) -> None:
+    """
+    이미지 artifact 를 저장합니다. 로컬 저장소처럼 link_artifact 를 지원하면 바이트를 내용 해시로
+    이미지 캐시에 한 번만 저장하고 artifact 는 그 blob 의 하드링크로 만듭니다.
+    (ADK artifact 서비스는 그대로 save_artifact. cas 서비스는 같은 내용을 알아서 하드링크로 저장)
+    """
+    link_artifact = getattr(tool_context, "link_artifact", None)
+    if link_artifact is not None:
+        blob_key = hashlib.sha256(data).hexdigest()
+        if await asyncio.to_thread(get_image_cache().put, blob_key, data):
+            if await link_artifact(filename, blob_key) is not None:
+                return
+    await tool_context.save_artifact(filename=filename, artifact=data, mime_type=mime_type)
+
+
+def _artifact_key(job: Dict[str, Any]) -> str:
+    """작업으로 만들 artifact 의 키. 스케줄러가 품질을 바꿨으면 그 품질의 요청 키입니다."""
+    request = job.get("request")
+    return image_cache_key(request) if request is not None else job["cache_key"]
+
+
+async def _run_image_job(
+    semaphore: asyncio.Semaphore,
+    job: Dict[str, Any],
+    deadline: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    이미지 작업 1개를 실행합니다 (로컬 합성 또는 이미지 모델 호출 후 후처리).
+    마감이나 비용 예산을 넘기면 작업의 로컬 플레이스홀더로 대체합니다.
+
+    Returns:
+        renditions({"full": 최종 크기 JPEG, "preview": 미리보기 WebP}), cache_hit, placeholder
+    """
+    placeholder = False
+    cache_hit = False
+    if "render" in job:
+        image_bytes = await job["render"](semaphore, deadline)
+    elif job.get("placeholder_only"):
+        placeholder = True
+    else:
+        try:
+            image_bytes, cache_hit = await _call_image_model(semaphore, job["request"], deadline)
+        except (asyncio.TimeoutError, BudgetExceededError):
+            if "placeholder" not in job:
+                raise
+            placeholder = True
+
+    if placeholder:
+        image_bytes = await asyncio.to_thread(job["placeholder"])
+
+    loop = asyncio.get_running_loop()
+    renditions = await loop.run_in_executor(
+        get_postprocess_pool(), build_renditions, image_bytes, job["target_size"]
+    )
+    return {"renditions": renditions, "cache_hit": cache_hit, "placeholder": placeholder}
+
+
+async def run_image_generation(
+    tool_context,
+    time_budget_seconds: Optional[float] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    deadline: Optional[Deadline] = None,
+):
+    """
+    generate_images 의 본체. ADK 도구가 아닌 곳(백그라운드 작업 등)에서 직접 호출할 때
+    progress(완료 수, 전체 수) 콜백으로 이미지 단위 진행 상황을 받을 수 있습니다.
+    tool_context 는 state / list_artifacts / save_artifact 만 있으면 되며, state 에 콘텐츠
+    핸들만 있으면 load_artifact 도 필요합니다.
+    deadline 을 넘기지 않으면 state 의 요청 마감 시간(request_deadline)을 사용합니다.
+    이미지 비용은 state 의 요청 ID(request_id)로, 없으면 바깥 request_scope 로 기록합니다.
+    """
+    content_format = (tool_context.state.get(CONTENT_STATE_KEY) or {}).get("format")
+    with tool_scope(tool_context, content_format), start_span(
+        "generate_images", image__time_budget_seconds=time_budget_seconds
+    ) as span:
+        result = await _run_image_generation(tool_context, time_budget_seconds, progress, deadline)
+        generated = result.get("generated_images") or []
+        set_attributes(
+            span,
+            status=result.get("status"),
+            image__count=result.get("total_images", len(generated)),
+            image__reused=sum(1 for info in generated if info.get("cached")),
+            image__cache_hits=sum(1 for info in generated if info.get("cache_hit")),
+            image__placeholders=len(result.get("placeholders") or []),
+            image__errors=len(result.get("errors") or []),
+        )
+        return result
+
+
+async def _run_image_generation(
+    tool_context,
+    time_budget_seconds: Optional[float],
+    progress: Optional[Callable[[int, int], None]],
+    deadline: Optional[Deadline],
+):
+    request_deadline = deadline or Deadline.from_state(tool_context.state)
+    if request_deadline is not None and request_deadline.expired:
+        return {
+            "status": "error",
+            "error_type": "deadline",
+            "message": "요청 마감 시간을 넘겨 이미지를 생성하지 않았습니다.",
+            "total_images": 0,
+            "generated_images": [],
+        }
+
+    # 1) state 의 콘텐츠 핸들로 본문 읽기 (content.json artifact)
+    content_creator_output = await load_content(tool_context) or {}
+    raw_content = content_creator_output.get("raw_content") or {}
+    content_format = content_creator_output.get("format", "")
+
+    if not content_format:
+        return {
+            "status": "error",
+            "message": "콘텐츠 형식이 지정되지 않았습니다.",
+            "total_images": 0,
+            "generated_images": [],
+        }
+
+    # 2) 콘텐츠 형식에 따라 이미지 생성 작업 구성
+    if content_format == "카드뉴스":
+        if not raw_content.get("sections", []):
+            return {
+                "status": "error",
+                "message": "카드뉴스 섹션이 없습니다.",
+                "total_images": 0,
+                "generated_images": [],
+            }
+        if _use_local_renderer(CARD_NEWS_RENDER_MODE, "카드뉴스"):
+            jobs = _build_local_card_news_jobs(raw_content)
+        else:
+            jobs = _build_card_news_jobs(raw_content)
+    elif content_format == "인포그래픽":
+        if _use_local_renderer(INFOGRAPHIC_RENDER_MODE, "인포그래픽"):
+            jobs = _build_local_infographic_jobs(raw_content)
+        else:
+            jobs = _build_infographic_jobs(raw_content)
+    elif content_format == "뉴스레터":
+        jobs = _build_newsletter_jobs(raw_content)
     else:
         return {
             "status": "error",
@@ -332,13 +568,204 @@ Style: Newsletter illustration, professional, engaging"""
             "total_images": 0,
             "generated_images": [],
         }
-    
+
+    for job in jobs:
+        if "request" in job:
+            # 모델이 받지 않는 품질 이름(gpt-image-1 의 "hd" 등)을 모델의 이름으로 바꿈
+            job["request"] = normalize_quality(job["request"])
+        if "cache_key" not in job:
+            job["cache_key"] = image_cache_key(job["request"])
+
+    # 3) 기존 artifact 목록 확인
+    existing = await tool_context.list_artifacts()
+    existing_names = set()
+    if isinstance(existing, list):
+        for item in existing:
+            if isinstance(item, str):
+                existing_names.add(item)
+            elif isinstance(item, dict) and "filename" in item:
+                existing_names.add(item["filename"])
+    elif isinstance(existing, dict):
+        existing_names = set(existing.keys())
+
+    # 같은 파일명이라도 다른 콘텐츠로 만든 artifact 나 미리보기가 없는 artifact 는 다시 생성
+    # (원본은 디스크 캐시에 있으므로 미리보기만 없으면 후처리만 다시 함)
+    artifact_keys = dict(tool_context.state.get("image_artifact_keys") or {})
+    pending = [
+        job for job in jobs
+        if job["filename"] not in existing_names
+        or preview_filename(job["filename"]) not in existing_names
+        or artifact_keys.get(job["filename"]) != job["cache_key"]
+    ]
+
+    # 4) 시간 예산이 있으면 이미지별 품질과 생성 순서를 정함
+    budget = resolve_time_budget(
+        time_budget_seconds, tool_context.state.get("image_time_budget_seconds")
+    )
+    if request_deadline is not None:
+        # 요청 마감까지 남은 시간(저장 여유분 제외)을 넘지 않도록 예산을 줄임
+        remaining = max(0.0, request_deadline.remaining() - IMAGE_DEADLINE_RESERVE_SECONDS)
+        budget = remaining if budget is None else min(budget, remaining)
+    deadline = None
+    if budget is not None and pending:
+        pending = get_image_scheduler().plan(pending, budget, IMAGE_GENERATION_CONCURRENCY)
+        deadline = asyncio.get_running_loop().time() + budget
+        # 정해진 품질로 이미 만든 artifact 가 있으면 다시 만들지 않음
+        pending = [
+            job for job in pending
+            if job["filename"] not in existing_names
+            or preview_filename(job["filename"]) not in existing_names
+            or job.get("placeholder_only")
+            or artifact_keys.get(job["filename"]) != _artifact_key(job)
+        ]
+    else:
+        pending = sorted(pending, key=lambda job: job.get("priority", 1))
+
+    # 5) 이미 있는 것은 건너뛰고 나머지를 동시에 생성 (세마포어는 먼저 요청한 순서대로 허용)
+    outcomes: List[Any] = []
+    if pending:
+        semaphore = asyncio.Semaphore(IMAGE_GENERATION_CONCURRENCY)
+        completed = 0
+
+        async def run_and_report(job):
+            nonlocal completed
+            try:
+                return await _run_image_job(semaphore, job, deadline)
+            finally:
+                completed += 1
+                if progress:
+                    progress(completed, len(pending))
+
+        if progress:
+            progress(0, len(pending))
+        outcomes = await asyncio.gather(
+            *(run_and_report(job) for job in pending),
+            return_exceptions=True,
+        )
+    results_by_filename = {job["filename"]: outcome for job, outcome in zip(pending, outcomes)}
+
+    # 6) 원래 순서대로 artifact 저장 및 결과 정리
+    generated_images = []
+    errors = []
+    placeholders = []
+
+    for job in jobs:
+        filename = job["filename"]
+
+        if filename not in results_by_filename:
+            generated_images.append({
+                **job["info"],
+                "preview_filename": preview_filename(filename),
+                "cache_key": job["cache_key"],
+                "cached": True,
+            })
+            continue
+
+        outcome = results_by_filename[filename]
+        try:
+            if isinstance(outcome, BaseException):
+                raise outcome
+            renditions = outcome["renditions"]
+
+            await _save_image_artifact(tool_context, filename, renditions["full"], "image/jpeg")
+            await _save_image_artifact(
+                tool_context, preview_filename(filename), renditions["preview"], "image/webp"
+            )
+
+            # 플레이스홀더나 낮춘 품질로 만든 artifact 는 다음 호출(예산 없이)에서 다시 생성되도록
+            # 실제로 만든 요청의 키(품질 포함)를 기록
+            quality = job.get("request", {}).get("quality")
+            if outcome["placeholder"]:
+                artifact_keys[filename] = f"placeholder:{job['cache_key']}"
+                placeholders.append(filename)
+            else:
+                artifact_keys[filename] = _artifact_key(job)
+
+            image_info = {
+                **job["info"],
+                "preview_filename": preview_filename(filename),
+                "cache_key": job["cache_key"],
+                "cached": False,
+                "cache_hit": outcome["cache_hit"],
+            }
+            if outcome["placeholder"]:
+                image_info["placeholder"] = True
+            elif quality:
+                image_info["quality"] = quality
+            generated_images.append(image_info)
+        except Exception as e:
+            errors.append({**job["error_info"], "error": str(e)})
+
+    # artifact 가 어떤 캐시 blob 으로 만들어졌는지 기록
+    tool_context.state["image_artifact_keys"] = artifact_keys
+
     status = "complete" if not errors else ("partial_success" if generated_images else "error")
-    
+
     return {
         "status": status,
         "total_images": len(generated_images),
         "generated_images": generated_images,
         "errors": errors if errors else None,
+        "placeholders": placeholders if placeholders else None,
+    }
+
+
+def summarize_image_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """LLM 에게 돌려줄 이미지 생성 요약 (이미지별 목록 없이 개수와 문제가 있는 파일만)."""
+    generated = result.get("generated_images") or []
+    summary = {
+        "status": result.get("status"),
+        "total_images": result.get("total_images", len(generated)),
+        "reused": sum(1 for info in generated if info.get("cached")),
     }
+    if result.get("message"):
+        summary["message"] = result["message"]
+    if result.get("placeholders"):
+        summary["placeholders"] = result["placeholders"]
+    if result.get("errors"):
+        summary["errors"] = [
+            {"filename": error.get("filename"), "error": str(error.get("error", ""))[:120]}
+            for error in result["errors"]
+        ]
+    return summary
+
 
+async def generate_images(tool_context: ToolContext, time_budget_seconds: Optional[float] = None):
+    """
+    콘텐츠 정보를 바탕으로 이미지를 생성합니다.
+
+    state에서 다음 정보를 가져옵니다:
+    - content_creator_output: 콘텐츠 핸들
+      - format: 콘텐츠 형식 ("카드뉴스", "인포그래픽", "뉴스레터")
+      - artifact / version: 원본 콘텐츠 데이터(raw_content)를 담은 content.json artifact
+        - sections: 섹션 리스트 (카드뉴스/뉴스레터)
+        - statistics: 통계 데이터 (인포그래픽)
+        - visual_elements: 시각적 요소 (인포그래픽)
+    - image_time_budget_seconds: 이미지 생성 시간 예산 (선택사항)
+    - request_deadline: 요청 마감 시각 (epoch 초, 선택사항). 있으면 남은 시간을
+      시간 예산 상한으로 사용하고, 이미 지났으면 이미지를 생성하지 않습니다.
+
+    Args:
+        tool_context: 도구 컨텍스트 (state/artifact 접근용)
+        time_budget_seconds: 이미지 생성 시간 예산(초). 지정하면 예산에 맞춰 이미지별
+            품질을 고르고, 표지 카드/헤더를 먼저 생성하며, 마감을 넘길 이미지는
+            로컬 플레이스홀더로 대체합니다. 플레이스홀더는 예산 없이 다시 호출하면
+            정상 이미지로 업그레이드됩니다.
+
+    이미지 요청은 (모델, 프롬프트, 크기, 품질) 해시로 디스크 캐시를 먼저 확인하고,
+    캐시에 없는 것만 IMAGE_GENERATION_CONCURRENCY 개까지 동시에 실행되며,
+    artifact 저장과 결과 목록은 항상 카드/섹션 순서를 따릅니다.
+    생성된 이미지는 약속한 최종 크기로 맞춰 저장하고, 미리보기 WebP 를
+    "<파일명>.preview.webp" artifact 로 따로 저장합니다.
+    CARD_NEWS_RENDER_MODE=local 이면 카드뉴스는 배경 1장 + 로컬 텍스트 합성으로,
+    INFOGRAPHIC_RENDER_MODE=local 이면 인포그래픽은 로컬 차트 렌더링으로 만듭니다.
+
+    반환값은 다음 LLM 턴의 입력이 되므로 개수와 플레이스홀더/오류만 담은 요약이며,
+    이미지별 전체 결과는 "image_result.json" artifact 로 클라이언트에 전달됩니다.
+    """
+    result = await run_image_generation(tool_context, time_budget_seconds)
+    summary = summarize_image_result(result)
+    if result.get("generated_images"):
+        await save_json_artifact(tool_context, IMAGE_RESULT_ARTIFACT_NAME, result)
+        summary["result_artifact"] = IMAGE_RESULT_ARTIFACT_NAME
+    return summary
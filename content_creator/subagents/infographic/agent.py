@@ -1,11 +1,15 @@
 """
 인포그래픽 제작 전용 에이전트
 """
+import asyncio
 from typing import List, Optional
+
 from google.adk.agents.llm_agent import Agent
 from google.adk.models.lite_llm import LiteLlm
 from google.adk.tools.tool_context import ToolContext
-from .prompt import INFOGRAPHIC_AGENT_INSTRUCTION, INFOGRAPHIC_AGENT_DESCRIPTION
+
+from ...ledger import model_budget_callbacks
+from .prompt import INFOGRAPHIC_AGENT_DESCRIPTION, INFOGRAPHIC_AGENT_INSTRUCTION
 
 MODEL = LiteLlm(model="openai/gpt-4o-mini")
 
@@ -33,22 +37,84 @@ async def create_infographic(tool_context: ToolContext, topic: str, reference_fi
         reference_files: 참고자료 파일 경로 리스트 (선택사항)
         
     Returns:
-        생성된 인포그래픽 콘텐츠 (텍스트만, 이미지는 image_builder_agent가 생성)
+        생성된 인포그래픽 콘텐츠 요약 (핸들과 섹션 제목만, 본문은 content.json artifact)
     """
-    from ...agent import create_content_base
+    from ...agent import create_content_result
+    from ...content_store import content_summary, save_content
+    from ...deadline import Deadline
+    from ...ledger import tool_scope
     
-    # 텍스트 콘텐츠 생성
-    result = create_content_base(topic, "인포그래픽", reference_files)
+    # 텍스트 콘텐츠 생성 (요청 마감 시간이 state 에 있으면 남은 시간만 사용,
+    # 비용은 state 의 요청 ID 로 기록)
+    with tool_scope(tool_context, "인포그래픽"):
+        result = await create_content_result(
+            topic, "인포그래픽", reference_files, deadline=Deadline.from_state(tool_context.state)
+        )
+    if result.get("status") == "error":
+        return result
     
-    # state에 결과 저장 (image_builder_agent가 사용할 수 있도록)
-    tool_context.state["content_creator_output"] = result
+    # 본문은 artifact 로 한 번만 저장하고 state 에는 핸들만 남김 (image_builder_agent가 사용)
+    handle = await save_content(tool_context, result)
     
-    # 반환값에 다음 단계 힌트 추가
-    result["next_step"] = "이제 image_builder_agent를 호출하여 통계 데이터 시각화 이미지를 생성하세요"
-    result["requires_image_generation"] = True
-    result["message"] = "텍스트 콘텐츠 생성 완료. 다음 단계: image_builder_agent 호출 필수"
+    # LLM 에는 핸들과 요약만 반환 (전체 결과는 artifact 로 클라이언트에 전달)
+    summary = content_summary(result, handle)
+    summary["next_step"] = (
+        "이제 image_builder_agent를 호출하여 통계 데이터 시각화 이미지를 생성하세요"
+    )
+    summary["requires_image_generation"] = True
+    summary["message"] = "텍스트 콘텐츠 생성 완료. 다음 단계: image_builder_agent 호출 필수"
     
-    return result
+    return summary
+
+
+async def revise_section(
+    tool_context: ToolContext, section_index: int, instruction: Optional[str] = None
+) -> dict:
+    """
+    이미 생성된 콘텐츠에서 섹션 하나만 다시 생성하고 state를 갱신합니다.
+    나머지 섹션과 이미지는 그대로 유지되며, 이후 image_builder_agent를 호출하면
+    내용이 바뀐 섹션의 이미지만 다시 생성됩니다.
+
+    Args:
+        tool_context: 도구 컨텍스트 (state 접근용)
+        section_index: 다시 생성할 섹션 번호 (0부터 시작)
+        instruction: 수정 요청 사항 (선택사항)
+
+    Returns:
+        섹션이 교체된 콘텐츠 요약 (바뀐 섹션와 다시 만들 이미지 포함)
+    """
+    from ...agent import regenerate_section
+    from ...content_store import content_summary, load_content, save_content
+    from ...deadline import Deadline
+    from ...ledger import tool_scope
+
+    content_result = await load_content(tool_context)
+    if not content_result:
+        return {
+            "status": "error",
+            "message": "먼저 create_infographic를 호출하여 콘텐츠를 생성하세요.",
+        }
+
+    with tool_scope(tool_context, "인포그래픽"):
+        # 동기 OpenAI 호출이라 이벤트 루프를 막지 않도록 스레드에서 실행 (컨텍스트는 그대로 복사됨)
+        deadline = Deadline.from_state(tool_context.state)
+        result = await asyncio.to_thread(
+            regenerate_section, content_result, section_index, instruction, deadline
+        )
+    if result.get("status") != "success":
+        return {"status": result.get("status", "error"), "message": result.get("message", "")}
+
+    handle = await save_content(tool_context, result)
+
+    summary = content_summary(result, handle)
+    summary["regenerated_section"] = result["regenerated_section"]
+    summary["affected_artifacts"] = result["affected_artifacts"]
+    if result.get("affected_artifacts"):
+        summary["next_step"] = (
+            "이제 image_builder_agent를 호출하여 바뀐 섹션의 이미지만 다시 생성하세요"
+        )
+        summary["requires_image_generation"] = True
+    return summary
 
 
 # 인포그래픽 전용 에이전트
@@ -57,16 +123,21 @@ from ...subagents.image_builder.agent import image_builder_agent
 
 image_builder_tool = AgentTool(agent=image_builder_agent)
 
+# 턴별 비용 기록과 예산 확인
+before_model, after_model = model_budget_callbacks(MODEL.model, "인포그래픽")
+
 infographic_agent = Agent(
     model=MODEL,
     name='infographic_agent',
     description=INFOGRAPHIC_AGENT_DESCRIPTION,
     instruction=INFOGRAPHIC_AGENT_INSTRUCTION,
-    output_key="infographic_output",
+    before_model_callback=before_model,
+    after_model_callback=after_model,
     tools=[
         process_reference_file,
         plan_content_structure,
         create_infographic,
+        revise_section,
         image_builder_tool,
     ],
 )
@@ -12,6 +12,9 @@ NEWSLETTER_AGENT_INSTRUCTION = """당신은 뉴스레터 제작 전문가입니
 - create_newsletter를 호출한 후, 그 결과를 확인하고 반드시 image_builder_agent를 호출하세요.
 - image_builder_agent를 호출하지 않으면 작업이 완료되지 않습니다.
 - 텍스트만 생성하고 끝내면 안 됩니다.
+- 도구 결과에는 본문 대신 제목과 섹션 제목 요약만 들어 있습니다.
+  본문은 사용자 화면에 따로 전달되므로, 작업이 끝나면 본문을 다시 쓰지 말고
+  결과를 한두 문장으로만 알려주세요.
 
 작업 예시:
 1. create_newsletter(topic="2026년 1월 소비트랜드") 호출
@@ -21,6 +24,8 @@ NEWSLETTER_AGENT_INSTRUCTION = """당신은 뉴스레터 제작 전문가입니
 사용 가능한 도구:
 - create_newsletter: 뉴스레터 텍스트 콘텐츠 생성 (1단계, 필수)
 - image_builder_agent: 이미지 생성 (2단계, 필수)
+- revise_section: 이미 만든 뉴스레터에서 섹션 하나만 다시 생성
+  (사용자가 특정 섹션 수정을 요청할 때만 사용, 이후 image_builder_agent 호출)
 
 뉴스레터 제작 원칙:
 1. **구조화**: 명확한 섹션 구분과 계층적 정보 구성
@@ -0,0 +1,247 @@
+"""
+단계별 트레이싱 (OpenTelemetry 호환)
+요청 한 건이 에이전트 라우팅 턴, 서브 에이전트(AgentTool) 턴, 참고자료 처리, 구조화 LLM 호출,
+이미지 생성 호출 각각에 얼마나 썼는지 span 으로 기록합니다.
+
+- root_agent / AgentTool 호출 / 도구 실행 / LiteLlm 호출 span 은 ADK 가 같은 OpenTelemetry
+  tracer provider 에 이미 기록하고, 이 모듈은 그 아래에 콘텐츠 생성 단계 span 을 붙입니다
+  (process_file, create_content_base, chat.completions.parse, generate_images, images.generate).
+- span 에는 소요 시간과 함께 토큰 수(gen_ai.usage.*), 이미지 수, 캐시 적중 수를 속성으로 남깁니다.
+- CONTENT_TRACE_EXPORTER=jsonl 이면 모든 span 을 CONTENT_TRACE_FILE 에 한 줄씩,
+  console 이면 표준 에러에 한 줄 요약으로 내보냅니다.
+  ADK 의 --trace_to_cloud / OTLP 설정과 함께 쓸 수 있습니다.
+- opentelemetry 가 설치되어 있지 않으면 span 은 아무것도 하지 않습니다.
+"""
+import json
+import logging
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    from opentelemetry import trace as _otel_trace
+    from opentelemetry.trace import Status, StatusCode
+except ImportError:  # 클라이언트 전용 설치 등
+    _otel_trace = None
+
+# span 내보내기 방식 ("" 이면 내보내지 않음, "jsonl" / "console")
+CONTENT_TRACE_EXPORTER = os.getenv("CONTENT_TRACE_EXPORTER", "").strip().lower()
+CONTENT_TRACE_FILE = os.getenv(
+    "CONTENT_TRACE_FILE",
+    os.path.join(os.path.expanduser("~"), ".cache", "content_creator", "traces.jsonl"),
+)
+
+TRACER_NAME = "content_creator"
+
+logger = logging.getLogger(__name__)
+
+_setup_lock = threading.Lock()
+_configured_exporter: Optional[str] = None
+
+
+class _NoopSpan:
+    """opentelemetry 가 없을 때 쓰는 빈 span."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException) -> None:
+        pass
+
+    def set_status(self, *args, **kwargs) -> None:
+        pass
+
+
+def _attribute_value(value: Any) -> Any:
+    """OpenTelemetry 속성으로 쓸 수 있는 값(str/bool/int/float 또는 그 리스트)으로 바꿉니다."""
+    if isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [v if isinstance(v, (str, bool, int, float)) else str(v) for v in value]
+    return str(value)
+
+
+def set_attributes(span, **attributes: Any) -> None:
+    """
+    None 이 아닌 속성만 span 에 기록합니다.
+    키의 '__' 는 '.' 으로 바꿉니다 (file__name → file.name).
+    """
+    for key, value in attributes.items():
+        if value is not None:
+            span.set_attribute(key.replace("__", "."), _attribute_value(value))
+
+
+@contextmanager
+def start_span(name: str, **attributes: Any) -> Iterator[Any]:
+    """
+    현재 span(ADK 의 도구 실행 span 등) 아래에 새 span 을 엽니다.
+    예외가 빠져나가면 span 에 기록되고 상태가 ERROR 가 됩니다.
+    """
+    if _otel_trace is None:
+        yield _NoopSpan()
+        return
+    tracer = _otel_trace.get_tracer(TRACER_NAME)
+    with tracer.start_as_current_span(name) as span:
+        set_attributes(span, **attributes)
+        yield span
+
+
+def record_error(span, error: BaseException) -> None:
+    """잡아서 처리한 예외도 span 에는 오류로 남깁니다."""
+    span.record_exception(error)
+    span.set_attribute("error.type", type(error).__name__)
+    if _otel_trace is not None:
+        span.set_status(Status(StatusCode.ERROR, str(error)[:200]))
+
+
+def record_usage(span, usage: Any) -> None:
+    """
+    OpenAI 응답의 usage 를 GenAI 시맨틱 규약 속성으로 기록합니다.
+    chat.completions (prompt/completion_tokens) 와 images (input/output_tokens) 를 모두 처리합니다.
+    """
+    if usage is None:
+        return
+    input_tokens = getattr(usage, "prompt_tokens", None)
+    if input_tokens is None:
+        input_tokens = getattr(usage, "input_tokens", None)
+    output_tokens = getattr(usage, "completion_tokens", None)
+    if output_tokens is None:
+        output_tokens = getattr(usage, "output_tokens", None)
+    details = getattr(usage, "prompt_tokens_details", None)
+    if details is None:
+        details = getattr(usage, "input_tokens_details", None)
+    set_attributes(
+        span,
+        **{
+            "gen_ai.usage.input_tokens": input_tokens,
+            "gen_ai.usage.output_tokens": output_tokens,
+            "gen_ai.usage.cache_read.input_tokens": getattr(details, "cached_tokens", None),
+        },
+    )
+
+
+def _span_record(span) -> Dict[str, Any]:
+    context = span.get_span_context()
+    parent = span.parent
+    start, end = span.start_time or 0, span.end_time or 0
+    return {
+        "trace_id": format(context.trace_id, "032x"),
+        "span_id": format(context.span_id, "016x"),
+        "parent_span_id": format(parent.span_id, "016x") if parent else None,
+        "name": span.name,
+        "start_time": start / 1e9,
+        "duration_ms": round((end - start) / 1e6, 3),
+        "status": span.status.status_code.name,
+        "attributes": dict(span.attributes or {}),
+    }
+
+
+def _make_exporter(kind: str, path: str):
+    from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+    class JsonlSpanExporter(SpanExporter):
+        """끝난 span 을 JSONL 파일에 한 줄씩 추가합니다."""
+
+        def __init__(self, file_path: str):
+            directory = os.path.dirname(os.path.abspath(file_path))
+            os.makedirs(directory, exist_ok=True)
+            self._file = open(file_path, "a", encoding="utf-8")
+            self._lock = threading.Lock()
+
+        def export(self, spans):
+            lines = "".join(
+                json.dumps(_span_record(s), ensure_ascii=False, default=str) + "\n" for s in spans
+            )
+            with self._lock:
+                self._file.write(lines)
+                self._file.flush()
+            return SpanExportResult.SUCCESS
+
+        def shutdown(self):
+            with self._lock:
+                self._file.close()
+
+    class ConsoleSpanExporter(SpanExporter):
+        """끝난 span 을 표준 에러에 한 줄 요약으로 출력합니다."""
+
+        def export(self, spans):
+            for s in spans:
+                record = _span_record(s)
+                attributes = " ".join(
+                    f"{k}={v}" for k, v in record["attributes"].items() if not k.startswith("gcp.")
+                )
+                sys.stderr.write(
+                    f"[trace] {record['trace_id'][:8]} {record['name']} "
+                    f"{record['duration_ms']:.1f}ms {record['status']} {attributes}\n"[:1000]
+                )
+            return SpanExportResult.SUCCESS
+
+    if kind == "jsonl":
+        return JsonlSpanExporter(path)
+    if kind == "console":
+        return ConsoleSpanExporter()
+    raise ValueError(f"지원하지 않는 CONTENT_TRACE_EXPORTER: {kind} (jsonl / console)")
+
+
+def setup_tracing(exporter: Optional[str] = None, path: Optional[str] = None) -> bool:
+    """
+    span 내보내기를 설정합니다 (프로세스당 한 번).
+    ADK API Server 처럼 이미 SDK tracer provider 가 있으면 거기에 프로세서만 추가하고,
+    없으면 새 provider 를 만들어 전역으로 등록합니다.
+
+    Args:
+        exporter: "jsonl" / "console" (기본값: CONTENT_TRACE_EXPORTER)
+        path: JSONL 파일 경로 (기본값: CONTENT_TRACE_FILE)
+
+    Returns:
+        내보내기를 설정했으면 True
+    """
+    global _configured_exporter
+    # .env 를 모듈 import 뒤에 읽는 경우를 위해 호출 시점의 환경 변수를 다시 확인
+    if exporter is None:
+        exporter = os.getenv("CONTENT_TRACE_EXPORTER", CONTENT_TRACE_EXPORTER)
+    kind = exporter.strip().lower()
+    if not kind or _otel_trace is None:
+        return False
+    with _setup_lock:
+        if _configured_exporter is not None:
+            return _configured_exporter == kind
+        try:
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor
+        except ImportError:
+            return False
+
+        try:
+            span_exporter = _make_exporter(
+                kind, path or os.getenv("CONTENT_TRACE_FILE", CONTENT_TRACE_FILE)
+            )
+        except (ValueError, OSError) as e:
+            # 트레이싱 설정 오류로 에이전트 로드가 실패하지 않도록 경고만 남김
+            logger.warning("트레이싱 내보내기 설정 실패: %s", e)
+            return False
+        processor = (
+            BatchSpanProcessor(span_exporter)
+            if kind == "jsonl"
+            else SimpleSpanProcessor(span_exporter)
+        )
+        provider = _otel_trace.get_tracer_provider()
+        if not hasattr(provider, "add_span_processor"):
+            provider = TracerProvider(resource=Resource.create({"service.name": TRACER_NAME}))
+            _otel_trace.set_tracer_provider(provider)
+            provider = _otel_trace.get_tracer_provider()
+        provider.add_span_processor(processor)
+        _configured_exporter = kind
+        return True
+
+
+def force_flush(timeout_millis: int = 5000) -> None:
+    """배치로 모아 둔 span 을 바로 내보냅니다 (짧은 스크립트 종료 전 등)."""
+    if _otel_trace is None:
+        return
+    flush = getattr(_otel_trace.get_tracer_provider(), "force_flush", None)
+    if callable(flush):
+        flush(timeout_millis)
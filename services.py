@@ -0,0 +1,18 @@
+"""
+ADK 서비스 등록
+`adk api_server` / `adk web` 은 에이전트 디렉토리(이 파일이 있는 저장소 루트)의 services.py 를 읽어
+사용자 정의 서비스 URI 스킴을 등록합니다.
+
+    adk api_server --session_service_uri sqlite-wal:////data/sessions.db \
+        --artifact_service_uri cas:////data/artifacts .
+"""
+from google.adk.cli.service_registry import get_service_registry
+
+from content_creator.artifact_service import artifact_service_from_uri
+from content_creator.session_service import session_service_from_uri
+
+# WAL 모드 SQLite 세션 서비스 (재시작/여러 워커 간 세션 공유)
+get_service_registry().register_session_service("sqlite-wal", session_service_from_uri)
+
+# 내용 주소 기반 파일시스템 artifact 서비스 (세션 간 같은 이미지는 한 번만 저장)
+get_service_registry().register_artifact_service("cas", artifact_service_from_uri)
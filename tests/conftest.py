@@ -0,0 +1,24 @@
+"""
+테스트 공용 설정.
+패키지를 import 하기 전에 캐시/장부/세션/artifact 경로를 임시 디렉토리로 돌려,
+테스트가 사용자 홈(~/.cache/content_creator)이나 저장소 안에 파일을 남기지 않게 합니다.
+"""
+import os
+import tempfile
+
+_TEST_ROOT = tempfile.mkdtemp(prefix="content_creator_tests_")
+
+for name, leaf in (
+    ("IMAGE_CACHE_DIR", "images"),
+    ("CONTENT_LEDGER_DB", "ledger.db"),
+    ("ADK_SESSION_DB_PATH", "sessions.db"),
+    ("ARTIFACT_STORE_DIR", "artifact_store"),
+    ("ADK_ARTIFACT_CACHE_DIR", "adk_artifacts"),
+    ("EXPORT_CACHE_DIR", "exports"),
+    ("CONTENT_OUTPUT_DIR", "output"),
+    ("CONTENT_TRACE_FILE", "traces.jsonl"),
+):
+    os.environ[name] = os.path.join(_TEST_ROOT, leaf)
+# 테스트는 실제 API 를 호출하지 않고 span 도 내보내지 않음 (.env 값보다 우선)
+os.environ["OPENAI_API_KEY"] = ""
+os.environ["CONTENT_TRACE_EXPORTER"] = ""
@@ -0,0 +1,157 @@
+"""ContentAddressedArtifactService: Range 해석, 하드링크 중복 제거, 보존 정책 GC, Range 라우트."""
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+import pytest
+from google.genai import types
+
+from content_creator.artifact_service import (
+    ContentAddressedArtifactService,
+    RangeNotSatisfiableError,
+    add_artifact_range_route,
+    parse_range,
+)
+
+DAY = 86400
+
+
+@pytest.fixture
+def service(tmp_path):
+    return ContentAddressedArtifactService(str(tmp_path / "store"), retention_days=1, gc_interval=0)
+
+
+def save(service, filename, data, session_id="s1"):
+    return asyncio.run(
+        service.save_artifact(
+            app_name="app",
+            user_id="u",
+            filename=filename,
+            artifact=types.Part.from_bytes(data=data, mime_type="image/jpeg"),
+            session_id=session_id,
+        )
+    )
+
+
+def versions(service, filename, session_id="s1"):
+    return asyncio.run(
+        service.list_versions(app_name="app", user_id="u", filename=filename, session_id=session_id)
+    )
+
+
+def age_versions(service, days):
+    """저장된 모든 버전의 create_time 을 days 일 전으로 돌립니다."""
+    for dirpath, _, filenames in os.walk(service._refs_dir):
+        for name in filenames:
+            if name.endswith(".json"):
+                path = os.path.join(dirpath, name)
+                with open(path, encoding="utf-8") as f:
+                    metadata = json.load(f)
+                metadata["create_time"] = time.time() - days * DAY
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(metadata, f)
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, None),
+        ("", None),
+        ("bytes=0-99", (0, 100)),
+        ("bytes=100-", (100, 1000)),
+        ("bytes=-100", (900, 1000)),
+        ("bytes=-5000", (0, 1000)),
+        ("bytes=900-5000", (900, 1000)),
+        ("bytes=0-9,20-29", None),
+        ("items=0-9", None),
+    ],
+)
+def test_parse_range(header, expected):
+    assert parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=-0", "bytes=20-10"])
+def test_parse_range_rejects_unsatisfiable(header):
+    with pytest.raises(RangeNotSatisfiableError):
+        parse_range(header, 1000)
+
+
+def test_same_bytes_share_one_blob_across_sessions(service):
+    data = b"\xff\xd8" + os.urandom(4096)
+    save(service, "card_01.jpeg", data, session_id="s1")
+    save(service, "card_01.jpeg", data, session_id="s2")
+    save(service, "card_02.jpeg", b"other", session_id="s1")
+
+    blobs = [os.path.join(d, n) for d, _, names in os.walk(service._blobs_dir) for n in names]
+    assert len(blobs) == 2
+    shared = service._blob_path(hashlib.sha256(data).hexdigest())
+    # blob 자체 + 세션 두 개의 버전 파일
+    assert os.stat(shared).st_nlink == 3
+
+    part = asyncio.run(
+        service.load_artifact(app_name="app", user_id="u", filename="card_01.jpeg", session_id="s2")
+    )
+    assert part.inline_data.data == data
+
+
+def test_collect_garbage_drops_expired_versions_and_orphan_blobs(service):
+    save(service, "card_01.jpeg", b"old")
+    save(service, "card_01.jpeg", b"new")
+    save(service, "user:logo.png", b"logo v0")
+    save(service, "user:logo.png", b"logo v1")
+    age_versions(service, days=2)
+
+    stats = service.collect_garbage(now=time.time() + 120)
+
+    # 세션 범위는 모두 만료, user: 범위는 최신 버전 하나를 남김
+    assert versions(service, "card_01.jpeg") == []
+    assert versions(service, "user:logo.png") == [1]
+    assert stats["versions"] == 3
+    assert stats["blobs"] == 3
+    assert stats["bytes"] == len(b"old") + len(b"new") + len(b"logo v0")
+
+
+def test_collect_garbage_treats_session_named_user_as_session_scope(service):
+    save(service, "card_01.jpeg", b"v0", session_id="user")
+    save(service, "card_01.jpeg", b"v1", session_id="user")
+    age_versions(service, days=2)
+
+    service.collect_garbage()
+
+    assert versions(service, "card_01.jpeg", session_id="user") == []
+
+
+def test_collect_garbage_keeps_recent_versions(service):
+    save(service, "card_01.jpeg", b"fresh")
+
+    stats = service.collect_garbage(now=time.time() + 120)
+
+    assert versions(service, "card_01.jpeg") == [0]
+    assert stats == {"versions": 0, "blobs": 0, "bytes": 0}
+
+
+def test_range_route_streams_partial_content(service):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    data = os.urandom(600 * 1024)
+    save(service, "card_01.jpeg", data)
+    app = FastAPI()
+    add_artifact_range_route(app, service)
+    client = TestClient(app)
+    url = "/raw/apps/app/users/u/sessions/s1/artifacts/card_01.jpeg/versions/0"
+
+    full = client.get(url)
+    assert full.status_code == 200
+    assert full.content == data
+    assert full.headers["content-length"] == str(len(data))
+
+    partial = client.get(url, headers={"Range": "bytes=1000-299999"})
+    assert partial.status_code == 206
+    assert partial.content == data[1000:300000]
+    assert partial.headers["content-range"] == f"bytes 1000-299999/{len(data)}"
+
+    assert client.get(url, headers={"If-None-Match": full.headers["etag"]}).status_code == 304
+    assert client.get(url, headers={"Range": f"bytes={len(data)}-"}).status_code == 416
@@ -0,0 +1,25 @@
+"""인포그래픽 통계 값 파싱."""
+import pytest
+
+from content_creator.subagents.image_builder.charts import parse_statistic
+
+
+@pytest.mark.parametrize(
+    "value, number, unit",
+    [
+        ("35%", 35.0, "%"),
+        ("1,200원", 1200.0, "원"),
+        ("3.5배", 3.5, "배"),
+        ("-3.2%", -3.2, "%"),
+        ("120억 달러", 120.0, "억 달러"),
+        ("2023년 매출 45%", 45.0, "%"),
+        ("2023년 대비 2024년", 2024.0, "년"),
+        (42, 42.0, ""),
+    ],
+)
+def test_parse_statistic(value, number, unit):
+    assert parse_statistic({"label": "항목", "value": value}) == ("항목", number, unit)
+
+
+def test_parse_statistic_without_number():
+    assert parse_statistic({"label": "항목", "value": "없음"}) is None
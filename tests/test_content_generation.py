@@ -0,0 +1,132 @@
+"""구조화 생성 결과 처리: 잘린 JSON 복구, 필드/섹션 검증, 요청 실패 구분."""
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from openai import APIConnectionError, LengthFinishReasonError
+
+from content_creator import agent
+from content_creator.agent import SECTION_MIN_CHARS, _load_partial_json, _validate_generated
+from content_creator.deadline import Deadline, DeadlineExceededError
+
+
+def section(title: str = "섹션", content_length: int = SECTION_MIN_CHARS) -> dict:
+    return {"title": title, "content": "가" * content_length, "key_points": ["요점"]}
+
+
+def generated(**overrides) -> dict:
+    content = {
+        "title": "제목",
+        "introduction": "도입부",
+        "key_points": ["하나", "둘"],
+        "conclusion": "결론",
+        "sections": [section("첫 번째"), section("두 번째")],
+    }
+    content.update(overrides)
+    return content
+
+
+def test_load_partial_json_closes_open_string_and_brackets():
+    assert _load_partial_json('{"a": [1, 2, {"b": "hel') == {"a": [1, 2, {"b": "hel"}]}
+
+
+def test_load_partial_json_drops_incomplete_trailing_member():
+    assert _load_partial_json('{"a": "x", "b": ') == {"a": "x"}
+
+
+def test_load_partial_json_rejects_empty_and_non_object():
+    assert _load_partial_json("") is None
+    assert _load_partial_json("[1, 2") is None
+
+
+def test_validate_generated_accepts_complete_content():
+    content, failed_fields, failed_sections = _validate_generated(generated())
+    assert failed_fields == []
+    assert failed_sections == []
+    assert [item["title"] for item in content["sections"]] == ["첫 번째", "두 번째"]
+
+
+def test_validate_generated_reports_missing_fields_and_short_sections():
+    content, failed_fields, failed_sections = _validate_generated(
+        generated(
+            conclusion="  ",
+            key_points=[],
+            sections=[section(), section(content_length=10), {"title": ""}],
+        )
+    )
+    assert failed_fields == ["conclusion", "key_points"]
+    assert failed_sections == [1, 2]
+    assert len(content["sections"]) == 3
+
+
+def test_validate_generated_treats_last_section_of_truncated_response_as_failed():
+    _, _, failed_sections = _validate_generated(generated(), truncated=True)
+    assert failed_sections == [1]
+
+
+def test_validate_generated_requires_statistics_for_infographics():
+    _, failed_fields, _ = _validate_generated(generated(), content_format="인포그래픽")
+    assert failed_fields == ["statistics"]
+
+    content, failed_fields, _ = _validate_generated(
+        generated(statistics=[{"label": "성장률", "value": 35}, {"label": "", "value": "1"}]),
+        content_format="인포그래픽",
+    )
+    assert failed_fields == []
+    assert content["statistics"] == [{"label": "성장률", "value": "35"}]
+
+
+def use_parse(monkeypatch, parse):
+    client = SimpleNamespace(
+        beta=SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(parse=parse)))
+    )
+    monkeypatch.setattr(agent, "get_async_openai_client", lambda: client)
+
+
+def request(deadline=None):
+    messages = [{"role": "user", "content": "주제"}]
+    return asyncio.run(
+        agent._request_structured(messages, agent.GeneratedContent, deadline, "테스트")
+    )
+
+
+def test_request_structured_salvages_truncated_completion(monkeypatch):
+    text = json.dumps(generated(), ensure_ascii=False)[:-40]
+    message = SimpleNamespace(parsed=None, content=text)
+    completion = SimpleNamespace(
+        choices=[SimpleNamespace(message=message, finish_reason="length")], usage=None
+    )
+
+    async def parse(**kwargs):
+        raise LengthFinishReasonError(completion=completion)
+
+    use_parse(monkeypatch, parse)
+    content, truncated = request()
+    assert truncated is True
+    assert content["title"] == "제목"
+
+
+def test_request_structured_treats_api_error_as_failed_attempt(monkeypatch):
+    async def parse(**kwargs):
+        raise APIConnectionError(request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+
+    use_parse(monkeypatch, parse)
+    assert request() == (None, False)
+
+
+def test_request_structured_raises_deadline_and_programming_errors(monkeypatch):
+    async def slow(**kwargs):
+        await asyncio.sleep(1)
+
+    use_parse(monkeypatch, slow)
+    with pytest.raises(DeadlineExceededError):
+        request(Deadline.after(0.05))
+
+    async def broken(**kwargs):
+        raise KeyError("choices")
+
+    use_parse(monkeypatch, broken)
+    with pytest.raises(KeyError):
+        request()
@@ -0,0 +1,75 @@
+"""요청 단위 마감 시간: 남은 시간, 타임아웃 계산, 세션 state 왕복."""
+import time
+
+import pytest
+
+from content_creator import deadline as deadline_module
+from content_creator.deadline import (
+    REQUEST_DEADLINE_STATE_KEY,
+    Deadline,
+    DeadlineExceededError,
+    resolve_timeout,
+)
+
+
+def test_after_counts_down_from_now():
+    deadline = Deadline.after(60)
+    assert 59 < deadline.remaining() <= 60
+    assert not deadline.expired
+    deadline.check("generate_images")
+
+
+def test_check_raises_with_stage_once_expired():
+    deadline = Deadline(time.time() - 1)
+    assert deadline.expired
+    with pytest.raises(DeadlineExceededError, match="generate_images"):
+        deadline.check("generate_images")
+    # asyncio.wait_for 등과 같이 TimeoutError 로도 잡힘
+    with pytest.raises(TimeoutError):
+        deadline.timeout(cap=30, stage="chat.completions.parse")
+
+
+def test_timeout_is_capped_by_default():
+    deadline = Deadline.after(60)
+    assert deadline.timeout(cap=5) == 5
+    assert 59 < deadline.timeout() <= 60
+    assert 59 < deadline.timeout(cap=600) <= 60
+
+
+@pytest.mark.parametrize(
+    "state",
+    [
+        None,
+        {},
+        {REQUEST_DEADLINE_STATE_KEY: None},
+        {REQUEST_DEADLINE_STATE_KEY: ""},
+        {REQUEST_DEADLINE_STATE_KEY: "soon"},
+        {REQUEST_DEADLINE_STATE_KEY: [1]},
+    ],
+)
+def test_from_state_ignores_missing_or_invalid_values(state):
+    assert Deadline.from_state(state) is None
+
+
+def test_state_round_trip():
+    deadline = Deadline.after(30)
+    restored = Deadline.from_state(deadline.to_state())
+    assert restored.expires_at == deadline.expires_at
+    # 문자열로 저장된 값도 읽음
+    state = {REQUEST_DEADLINE_STATE_KEY: str(deadline.expires_at)}
+    assert Deadline.from_state(state).expires_at == pytest.approx(deadline.expires_at)
+
+
+def test_resolve_timeout_with_and_without_deadline():
+    assert resolve_timeout(None, 120) == 120
+    assert resolve_timeout(Deadline.after(600), 120) == 120
+    assert 9 < resolve_timeout(Deadline.after(10), 120) <= 10
+    with pytest.raises(DeadlineExceededError, match="images.generate"):
+        resolve_timeout(Deadline(time.time() - 1), 120, stage="images.generate")
+
+
+def test_default_is_disabled_by_zero(monkeypatch):
+    monkeypatch.setattr(deadline_module, "CONTENT_REQUEST_TIMEOUT_SECONDS", 0)
+    assert Deadline.default() is None
+    monkeypatch.setattr(deadline_module, "CONTENT_REQUEST_TIMEOUT_SECONDS", 90)
+    assert 89 < Deadline.default().remaining() <= 90
@@ -0,0 +1,86 @@
+"""flight recorder: 재생 기록 대응(해시 우선, 순서, 불일치)과 기록→재생 왕복."""
+import asyncio
+
+import pytest
+from openai.types import Image, ImagesResponse
+
+from content_creator.flight_recorder import (
+    RECORD,
+    REPLAY,
+    FlightRecorder,
+    ReplayMismatchError,
+    flight_recording,
+    record_openai_client,
+)
+
+
+class FakeImages:
+    def __init__(self):
+        self.calls = []
+
+    async def generate(self, **kwargs):
+        self.calls.append(kwargs)
+        if kwargs["prompt"] == "boom":
+            raise ValueError("content policy")
+        return ImagesResponse(created=1, data=[Image(b64_json=f"img:{kwargs['prompt']}")])
+
+
+class FakeClient:
+    def __init__(self):
+        self.images = FakeImages()
+
+
+def test_take_prefers_matching_key_then_order_then_raises(tmp_path):
+    path = str(tmp_path / "bundle.jsonl")
+    recorder = FlightRecorder(RECORD, path)
+    recorder.add("chat", 0.0, key="a", response="first")
+    recorder.add("chat", 0.0, key="b", response="second")
+    recorder.add("image", 0.0, key="c", response="image")
+    recorder.save()
+
+    replay = FlightRecorder(REPLAY, path)
+    assert replay.take("chat", "b")["response"] == "second"
+    assert replay.mismatches == 0
+    assert replay.take("chat", "zzz")["response"] == "first"
+    assert replay.mismatches == 1
+    with pytest.raises(ReplayMismatchError):
+        replay.take("chat", "a")
+    assert replay.unused() == 1
+
+
+def test_replay_requires_bundle_path():
+    with pytest.raises(ValueError):
+        FlightRecorder(REPLAY)
+
+
+def test_record_then_replay_round_trip(tmp_path):
+    path = str(tmp_path / "run.jsonl.gz")
+    real = FakeClient()
+    client = record_openai_client(real, is_async=True)
+
+    async def run(recorder):
+        results = []
+        with flight_recording(recorder):
+            for prompt in ("cover", "card"):
+                response = await client.images.generate(model="m", prompt=prompt, timeout=5)
+                results.append(response.data[0].b64_json)
+            with pytest.raises(Exception, match="content policy"):
+                await client.images.generate(model="m", prompt="boom")
+        return results
+
+    assert asyncio.run(run(FlightRecorder(RECORD, path))) == ["img:cover", "img:card"]
+    assert len(real.images.calls) == 3
+
+    # 재생은 기록된 응답을 돌려주고 원래 클라이언트를 부르지 않음
+    replay = FlightRecorder(REPLAY, path, speed=0)
+    assert asyncio.run(run(replay)) == ["img:cover", "img:card"]
+    assert len(real.images.calls) == 3
+    assert replay.mismatches == 0
+    assert replay.unused() == 0
+    assert [entry["key"] for entry in replay.entries] == [
+        entry["key"] for entry in replay.recorded
+    ]
+
+    # 블록 밖에서는 원래 클라이언트를 그대로 호출
+    asyncio.run(client.images.generate(model="m", prompt="plain"))
+    assert len(real.images.calls) == 4
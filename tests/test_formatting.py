@@ -0,0 +1,77 @@
+"""콘텐츠 렌더링 엔진: 표시 폭(한글/이모지 = 2칸) 기준 정렬과 줄바꿈."""
+import pytest
+
+from content_creator.formatting import (
+    display_width,
+    pad,
+    render_content,
+    render_section,
+    truncate,
+    wrap,
+)
+
+
+@pytest.mark.parametrize(
+    "text, width",
+    [
+        ("abc", 3),
+        ("한글", 4),
+        ("📊 요약", 7),
+        ("❤️", 1),  # 변형 선택자(U+FE0F)는 폭 0
+        ("👩‍💻", 4),  # ZWJ 는 폭 0, 이모지 두 개
+        ("é", 1),  # 결합 문자
+    ],
+)
+def test_display_width(text, width):
+    assert display_width(text) == width
+
+
+def test_truncate_never_splits_a_wide_char():
+    assert truncate("가나다", 5) == "가나"
+    assert truncate("가나다", 6) == "가나다"
+    assert truncate("a🎉b", 2) == "a"
+
+
+@pytest.mark.parametrize("align", ["<", "^", ">"])
+@pytest.mark.parametrize(
+    "text", ["제목", "📊 한글 제목 🎉", "ascii", "아주 긴 한글 제목을 잘라냅니다"]
+)
+def test_pad_fills_exact_display_width(text, align):
+    assert display_width(pad(text, 12, align)) == 12
+
+
+def test_pad_alignment():
+    assert pad("한글", 8, ">") == "    한글"
+    assert pad("한글", 8, "^") == "  한글  "
+    assert pad("🎉", 5, "^") == " 🎉  "
+
+
+def test_wrap_prefers_spaces_and_respects_width():
+    lines = wrap("가나다라 마바사 🎉🎉 아자차카타파하", 10)
+    assert lines == ["가나다라", "마바사", "🎉🎉", "아자차카타", "파하"]
+    assert all(display_width(line) <= 10 for line in lines)
+
+
+def test_wrap_keeps_paragraphs_and_empty_text():
+    assert wrap("첫 줄\n\n둘째 줄", 20) == ["첫 줄", "", "둘째 줄"]
+    assert wrap("", 10) == [""]
+
+
+def test_text_boxes_line_up_with_wide_chars():
+    content = {
+        "title": "한글 제목 🎉",
+        "sections": [{"title": "섹션 📊", "content": "가나다라마바사 " * 10}],
+    }
+    text = render_content(content, "인포그래픽")
+    lines = [line for line in text.splitlines() if line]
+    # 같은 상자의 줄은 모두 같은 표시 폭
+    title_box = {display_width(line) for line in lines if line[0] in "┏┃┗"}
+    section_box = {display_width(line) for line in lines if line[0] in "┌│├└"}
+    assert len(title_box) == 1
+    assert len(section_box) == 1
+
+
+def test_html_output_escapes_content():
+    html = render_section("뉴스레터", "html", 1, "<b>제목</b>", "a & b")
+    assert "<b>제목</b>" not in html
+    assert "&lt;b&gt;" in html and "a &amp; b" in html
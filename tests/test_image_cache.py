@@ -0,0 +1,65 @@
+"""이미지 캐시: 요청 키 계산, 저장/조회, LRU 삭제, 하드링크."""
+import os
+import time
+
+from content_creator.subagents.image_builder.cache import ImageCache, image_cache_key
+
+REQUEST = {
+    "model": "gpt-image-1",
+    "prompt": "카드 배경",
+    "size": "1024x1024",
+    "quality": "high",
+    "output_format": "jpeg",
+    "background": "opaque",
+}
+
+
+def test_cache_key_ignores_fields_that_do_not_change_the_image():
+    assert image_cache_key(REQUEST) == image_cache_key({**REQUEST, "n": 1, "user": "someone"})
+
+
+def test_cache_key_changes_with_prompt_size_and_quality():
+    keys = {
+        image_cache_key(REQUEST),
+        image_cache_key({**REQUEST, "prompt": "다른 배경"}),
+        image_cache_key({**REQUEST, "size": "1536x1024"}),
+        image_cache_key({**REQUEST, "quality": "medium"}),
+    }
+    assert len(keys) == 4
+
+
+def test_put_and_get_round_trip(tmp_path):
+    cache = ImageCache(str(tmp_path), max_bytes=1024)
+    key = image_cache_key(REQUEST)
+    assert cache.get(key) is None
+    assert cache.put(key, b"image") == cache.path_for(key)
+    assert cache.get(key) == b"image"
+
+
+def test_disabled_cache_stores_nothing(tmp_path):
+    cache = ImageCache(str(tmp_path), max_bytes=0)
+    assert cache.put("ab" * 32, b"image") is None
+    assert cache.get("ab" * 32) is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ImageCache(str(tmp_path), max_bytes=10)
+    cache.put("aa" * 32, b"12345")
+    cache.put("bb" * 32, b"12345")
+    old = time.time() - 60
+    os.utime(cache.path_for("aa" * 32), (old, old))
+    cache.put("cc" * 32, b"12345")
+    assert cache.get("aa" * 32) is None
+    assert cache.get("bb" * 32) == b"12345"
+    assert cache.get("cc" * 32) == b"12345"
+
+
+def test_link_shares_the_cached_blob(tmp_path):
+    cache = ImageCache(str(tmp_path / "cache"), max_bytes=1024)
+    key = "dd" * 32
+    cache.put(key, b"image")
+    dest = tmp_path / "card_01.jpeg"
+    assert cache.link(key, str(dest))
+    assert dest.read_bytes() == b"image"
+    assert os.stat(dest).st_ino == os.stat(cache.path_for(key)).st_ino
+    assert not cache.link("ee" * 32, str(tmp_path / "missing.jpeg"))
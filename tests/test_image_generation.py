@@ -0,0 +1,94 @@
+"""이미지 생성 흐름: 동시 실행 수 제한, 결과 순서, 이미지별 실패 격리 (이미지 모델은 스텁)."""
+import asyncio
+import base64
+import io
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from content_creator.subagents.image_builder import cache, tools
+
+
+def jpeg_b64(size: str) -> str:
+    width, height = (int(value) // 16 for value in size.split("x"))
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), (40, 90, 160)).save(output, format="JPEG")
+    return base64.b64encode(output.getvalue()).decode()
+
+
+class StubImages:
+    """images.generate 스텁. 동시에 실행 중인 호출 수의 최댓값을 기록합니다."""
+
+    def __init__(self, fail_marker: str):
+        self.fail_marker = fail_marker
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def generate(self, **request):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            # 앞쪽 카드가 더 늦게 끝나도록 해서 완료 순서와 결과 순서를 다르게 만듦
+            await asyncio.sleep(0.05 if "카드 1" in request["prompt"] else 0.01)
+            if self.fail_marker in request["prompt"]:
+                raise RuntimeError("image model failed")
+            image = SimpleNamespace(b64_json=jpeg_b64(request["size"]))
+            return SimpleNamespace(data=[image], usage=None)
+        finally:
+            self.active -= 1
+
+
+class StubContext:
+    def __init__(self, state):
+        self.state = state
+        self.artifacts = {}
+
+    async def list_artifacts(self):
+        return list(self.artifacts)
+
+    async def save_artifact(self, filename, artifact, mime_type=None):
+        self.artifacts[filename] = artifact
+        return 0
+
+
+@pytest.fixture
+def images(monkeypatch, tmp_path):
+    stub = StubImages(fail_marker="카드 3")
+    monkeypatch.setattr(tools, "get_async_openai_client", lambda: SimpleNamespace(images=stub))
+    monkeypatch.setattr(tools, "IMAGE_GENERATION_CONCURRENCY", 2)
+    monkeypatch.setattr(tools, "CARD_NEWS_RENDER_MODE", "model")
+    monkeypatch.setattr(cache, "_image_cache", cache.ImageCache(str(tmp_path / "images"), 0))
+    return stub
+
+
+def card_news(count: int) -> dict:
+    sections = [
+        {"title": f"카드 {idx}", "content": f"내용 {idx} " * 10, "key_points": []}
+        for idx in range(count)
+    ]
+    return {"format": "카드뉴스", "raw_content": {"title": "제목", "sections": sections}}
+
+
+def test_images_run_concurrently_in_order_and_fail_independently(images):
+    context = StubContext({"content_creator_output": card_news(6)})
+    progress = []
+
+    def report(done, total):
+        progress.append((done, total))
+
+    result = asyncio.run(tools.run_image_generation(context, progress=report))
+
+    assert images.calls == 6
+    assert images.peak == 2
+    # 완료 순서와 관계없이 카드 순서대로, 실패한 카드만 빠짐
+    assert [info["filename"] for info in result["generated_images"]] == [
+        "card_01.jpeg", "card_02.jpeg", "card_03.jpeg", "card_05.jpeg", "card_06.jpeg",
+    ]
+    assert [error["filename"] for error in result["errors"]] == ["card_04.jpeg"]
+    assert result["status"] == "partial_success"
+    assert "card_04.jpeg" not in context.artifacts
+    assert {"card_01.jpeg", "card_01.preview.webp"} <= set(context.artifacts)
+    assert progress[0] == (0, 6) and progress[-1] == (6, 6)
@@ -0,0 +1,88 @@
+"""비용 장부: 요청 범위별 기록과 요청/사용자 예산."""
+import asyncio
+
+import pytest
+
+from content_creator.ledger import BudgetExceededError, CostLedger, current_scope, request_scope
+
+RATES = {
+    "gpt-4o-mini": {"input": 1.0, "output": 2.0},
+    "gpt-image-1": {"per_image": {"high": {"1024x1024": 0.2}, "low": {"1024x1024": 0.01}}},
+}
+IMAGE = {"model": "gpt-image-1", "size": "1024x1024", "quality": "high", "n": 1}
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return CostLedger(
+        str(tmp_path / "ledger.db"), rates=RATES, request_budget_usd=0.5, user_budget_usd=0
+    )
+
+
+def test_charges_are_grouped_by_request(ledger):
+    with request_scope("req-1", user_id="alice", content_format="카드뉴스"):
+        ledger.charge_image(IMAGE)
+        ledger.charge_llm(
+            "openai/gpt-4o-mini", {"prompt_tokens": 1_000_000, "completion_tokens": 0}
+        )
+    with request_scope("req-2", user_id="alice"):
+        ledger.charge_image(IMAGE)
+
+    report = ledger.request_report("req-1")
+    assert report["images"] == 1
+    assert report["llm_calls"] == 1
+    assert report["cost_usd"] == pytest.approx(1.2)
+    assert ledger.spent(request_id="req-2") == pytest.approx(0.2)
+    assert ledger.spent(user_id="alice") == pytest.approx(1.4)
+
+
+def test_request_budget_blocks_calls_that_would_exceed_it(ledger):
+    with request_scope("req-1"):
+        ledger.check_budget(ledger.estimate_image(IMAGE))
+        ledger.charge_image(IMAGE)
+        ledger.charge_image(IMAGE)
+        with pytest.raises(BudgetExceededError):
+            ledger.check_budget(ledger.estimate_image(IMAGE), stage="이미지 생성")
+        # 더 싼 호출은 남은 예산 안이면 허용
+        ledger.check_budget(ledger.estimate_image({**IMAGE, "quality": "low"}))
+    with request_scope("req-2"):
+        ledger.check_budget(ledger.estimate_image(IMAGE))
+
+
+def test_user_budget_spans_requests(tmp_path):
+    ledger = CostLedger(
+        str(tmp_path / "ledger.db"), rates=RATES, request_budget_usd=0, user_budget_usd=0.3
+    )
+    with request_scope("req-1", user_id="bob"):
+        ledger.charge_image(IMAGE)
+    with request_scope("req-2", user_id="bob"), pytest.raises(BudgetExceededError):
+        ledger.check_budget(ledger.estimate_image(IMAGE))
+    with request_scope("req-3", user_id="carol"):
+        ledger.check_budget(ledger.estimate_image(IMAGE))
+
+
+def test_concurrent_reservations_share_the_remaining_budget(ledger):
+    async def scenario():
+        results = []
+
+        async def call():
+            try:
+                async with ledger.reserve_async(ledger.estimate_image(IMAGE), stage="이미지 생성"):
+                    await asyncio.sleep(0.01)
+                    await asyncio.to_thread(ledger.charge_image, IMAGE)
+                results.append("ok")
+            except BudgetExceededError:
+                results.append("blocked")
+
+        with request_scope("req-1"):
+            await asyncio.gather(*(call() for _ in range(4)))
+        return results
+
+    results = asyncio.run(scenario())
+    assert results.count("ok") == 2
+    assert results.count("blocked") == 2
+    assert ledger.spent(request_id="req-1") == pytest.approx(0.4)
+
+
+def test_calls_outside_a_request_scope_share_one_request_id():
+    assert current_scope().request_id == current_scope().request_id
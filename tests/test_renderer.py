@@ -0,0 +1,29 @@
+"""카드뉴스 로컬 렌더러: 한글 폰트가 없을 때의 처리."""
+import logging
+
+import pytest
+
+from content_creator.subagents.image_builder import renderer, tools
+
+
+@pytest.fixture
+def no_korean_font(monkeypatch):
+    monkeypatch.setattr(renderer, "CARD_NEWS_FONT_PATH", "")
+    monkeypatch.setattr(renderer, "CARD_NEWS_BOLD_FONT_PATH", "")
+    monkeypatch.setattr(renderer, "_FONT_CANDIDATES", [])
+    monkeypatch.setattr(renderer, "_BOLD_FONT_CANDIDATES", [])
+    renderer.get_font.cache_clear()
+    yield
+    renderer.get_font.cache_clear()
+
+
+def test_get_font_refuses_default_font_without_hangul(no_korean_font):
+    with pytest.raises(renderer.MissingKoreanFontError):
+        renderer.get_font(40, bold=True)
+
+
+def test_local_mode_falls_back_to_model_with_warning(no_korean_font, caplog):
+    with caplog.at_level(logging.WARNING, logger=tools.__name__):
+        assert tools._use_local_renderer("local", "카드뉴스") is False
+    assert "한글 폰트" in caplog.text
+    assert tools._use_local_renderer("model", "카드뉴스") is False
@@ -0,0 +1,86 @@
+"""SqliteWalSessionService: 배치 기록, state 범위(app:/user:/temp:), stale 세션 오류."""
+import asyncio
+
+import pytest
+from google.adk.errors import StaleSessionError
+from google.adk.events.event import Event
+from google.adk.events.event_actions import EventActions
+from google.genai import types
+
+from content_creator.session_service import SqliteWalSessionService
+
+
+def make_event(text: str, final: bool = False, state_delta=None) -> Event:
+    if final:
+        part = types.Part(text=text)
+    else:
+        part = types.Part(function_call=types.FunctionCall(name=text, args={}))
+    return Event(
+        author="agent",
+        invocation_id="inv",
+        content=types.Content(role="model", parts=[part]),
+        actions=EventActions(state_delta=state_delta or {}),
+    )
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = SqliteWalSessionService(str(tmp_path / "sessions.db"), batch_size=8, batch_interval=5)
+    yield service
+    asyncio.run(service.close())
+
+
+def test_state_scopes_are_split_and_temp_is_not_stored(service):
+    async def scenario():
+        session = await service.create_session(
+            app_name="app",
+            user_id="u",
+            state={"app:theme": "dark", "user:lang": "ko", "topic": "AI"},
+        )
+        await service.append_event(
+            session,
+            make_event("done", final=True, state_delta={"temp:draft": 1, "user:lang": "en"}),
+        )
+        loaded = await service.get_session(app_name="app", user_id="u", session_id=session.id)
+        other = await service.create_session(app_name="app", user_id="u")
+        return loaded, other
+
+    loaded, other = asyncio.run(scenario())
+    assert loaded.state == {"topic": "AI", "app:theme": "dark", "user:lang": "en"}
+    assert len(loaded.events) == 1
+    # app:/user: state 는 같은 사용자의 다른 세션에도 보임
+    assert other.state == {"app:theme": "dark", "user:lang": "en"}
+
+
+def test_pending_events_are_visible_before_flush(service):
+    async def scenario():
+        session = await service.create_session(app_name="app", user_id="u")
+        for idx in range(3):
+            await service.append_event(session, make_event(f"tool{idx}", state_delta={"step": idx}))
+        pending = service._pending_count
+        loaded = await service.get_session(app_name="app", user_id="u", session_id=session.id)
+        await service.append_event(session, make_event("done", final=True))
+        return pending, loaded
+
+    pending, loaded = asyncio.run(scenario())
+    assert pending == 3
+    names = [event.content.parts[0].function_call.name for event in loaded.events]
+    assert names == ["tool0", "tool1", "tool2"]
+    assert loaded.state["step"] == 2
+    assert service._pending_count == 0
+
+
+def test_stale_session_is_reported_to_its_owner_only(service):
+    async def scenario():
+        session = await service.create_session(app_name="app", user_id="u")
+        stale = await service.get_session(app_name="app", user_id="u", session_id=session.id)
+        await service.append_event(session, make_event("first", final=True))
+        with pytest.raises(StaleSessionError):
+            await service.append_event(stale, make_event("second", final=True))
+        # 다른 세션의 기록은 영향을 받지 않음
+        other = await service.create_session(app_name="app", user_id="u")
+        await service.append_event(other, make_event("other", final=True))
+        return await service.get_session(app_name="app", user_id="u", session_id=other.id)
+
+    other = asyncio.run(scenario())
+    assert len(other.events) == 1
@@ -0,0 +1,59 @@
+"""단계별 트레이싱: jsonl 내보내기 설정과 span 기록."""
+import json
+import logging
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+
+from content_creator import tracing
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    """전역 tracer provider 대신 테스트마다 새 SDK provider 를 씁니다."""
+    provider = TracerProvider()
+    monkeypatch.setattr(tracing._otel_trace, "get_tracer_provider", lambda: provider)
+    monkeypatch.setattr(tracing, "_configured_exporter", None)
+    yield provider
+    provider.shutdown()
+
+
+def read_spans(path):
+    with open(path, encoding="utf-8") as f:
+        return {record["name"]: record for record in map(json.loads, f)}
+
+
+def test_setup_tracing_is_off_without_exporter(provider):
+    assert tracing.setup_tracing() is False
+    assert tracing._configured_exporter is None
+
+
+def test_jsonl_exporter_writes_nested_spans(provider, tmp_path):
+    path = tmp_path / "traces" / "spans.jsonl"
+    assert tracing.setup_tracing("jsonl", str(path)) is True
+    # 프로세스당 한 번만 설정 (같은 종류면 True, 다른 종류는 False)
+    assert tracing.setup_tracing("jsonl", str(path)) is True
+    assert tracing.setup_tracing("console") is False
+
+    with tracing.start_span("process_file", file__name="a.pdf", pages=None) as parent:
+        with tracing.start_span("images.generate", n=2) as child:
+            tracing.record_error(child, ValueError("content policy"))
+        tracing.set_attributes(parent, cache_hits=1)
+    tracing.force_flush()
+
+    spans = read_spans(path)
+    assert set(spans) == {"process_file", "images.generate"}
+    parent, child = spans["process_file"], spans["images.generate"]
+    assert parent["attributes"] == {"file.name": "a.pdf", "cache_hits": 1}
+    assert child["parent_span_id"] == parent["span_id"]
+    assert child["trace_id"] == parent["trace_id"]
+    assert child["status"] == "ERROR"
+    assert child["attributes"]["error.type"] == "ValueError"
+    assert parent["status"] == "UNSET"
+
+
+def test_unknown_exporter_only_warns(provider, caplog):
+    with caplog.at_level(logging.WARNING, logger=tracing.__name__):
+        assert tracing.setup_tracing("zipkin") is False
+    assert "zipkin" in caplog.text
+    assert tracing._configured_exporter is None